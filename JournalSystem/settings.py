@@ -120,6 +120,25 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Cache shared by all worker processes (record XML, page fragments, ...)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }
+}
+
+# Cross-process locks for single-flight cache recomputation
+SINGLE_FLIGHT_LOCK_DIR = os.path.join(BASE_DIR, 'cache', 'locks')
+
+# "Did you mean" trigram index, written by the rebuild_spelling_index command
+SPELLING_INDEX_PATH = os.path.join(BASE_DIR, 'cache', 'spelling_index.pickle')
+
+# TF-IDF matrix of the related-articles job (build_related_articles command)
+RELATED_INDEX_PATH = os.path.join(BASE_DIR, 'cache', 'related_index.npz')
+
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
@@ -14,3 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'JournalSystem.settings')
 
 application = get_wsgi_application()
+
+# Build the in-process autocomplete index before the first request
+from django.db import DatabaseError  # noqa: E402
+from main.autocomplete import warm_up  # noqa: E402
+
+try:
+    warm_up()
+except DatabaseError:
+    pass  # Built on first use instead
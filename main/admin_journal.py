@@ -5,66 +5,17 @@ from django.utils import timezone
 from django.utils.text import slugify
 from django.views.decorators.csrf import csrf_protect
 from django.db import transaction
-from django.core.exceptions import ValidationError
 from .models import *
 import logging
 
-from main.admin_views import require_admin_login
+from main.admin_views import _create_or_update_author, require_admin_login
+from .crossref import deposit_issues, write_deposit
+from .journal_analytics import analytics_workbook, journal_analytics
 from .utils import send_diploma_email
 
 logger = logging.getLogger(__name__)
 
 
-def _create_or_update_author(first_name, last_name, middle_name, affiliation, email, orcid):
-    """
-    Helper function to create or update author by email.
-    Only updates fields if new value is provided and different.
-    """
-    if not first_name or not last_name:
-        raise ValidationError("Muallifning ismi va familiyasi majburiy.")
-
-    author = None
-    updated = False
-
-    if email:
-        try:
-            author = Author.objects.get(email=email)
-            # Only update fields if new data is provided and different
-            if first_name and author.first_name != first_name:
-                author.first_name = first_name
-                updated = True
-            if last_name and author.last_name != last_name:
-                author.last_name = last_name
-                updated = True
-            if middle_name and author.middle_name != middle_name:
-                author.middle_name = middle_name
-                updated = True
-            if affiliation and author.affiliation != affiliation:
-                author.affiliation = affiliation
-                updated = True
-            if orcid and author.orcid != orcid:
-                author.orcid = orcid
-                updated = True
-            if updated:
-                author.save()
-        except Author.DoesNotExist:
-            pass
-
-    if not author:
-        # If email not given, generate a fake one to satisfy unique constraint
-        email = email or f"{slugify(first_name)}.{slugify(last_name)}@example.com"
-        author = Author.objects.create(
-            first_name=first_name,
-            middle_name=middle_name,
-            last_name=last_name,
-            email=email,
-            affiliation=affiliation,
-            orcid=orcid,
-            is_active=True
-        )
-    return author
-
-
 @require_admin_login
 @csrf_protect
 @transaction.atomic
@@ -933,6 +884,25 @@ def export_journal_editors_csv(request, journal_id):
         return JsonResponse({'success': False, 'error': str(e)})
 
 
+@require_admin_login
+def journal_analytics_ajax(request, journal_id):
+    """Per-year, per-language publication analytics of a journal (main.journal_analytics)"""
+    journal = get_object_or_404(Journal, id=journal_id)
+    return JsonResponse({'success': True, 'analytics': journal_analytics(journal)})
+
+
+@require_admin_login
+def export_journal_analytics_xlsx(request, journal_id):
+    """Download the journal analytics report as an Excel workbook"""
+    journal = get_object_or_404(Journal, id=journal_id)
+    response = HttpResponse(
+        analytics_workbook(journal_analytics(journal)),
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{journal.url_slug}_analytics.xlsx"'
+    return response
+
+
 @require_admin_login
 def export_journal_policies_csv(request, journal_id):
     try:
@@ -970,3 +940,37 @@ def export_journal_policies_csv(request, journal_id):
     except Exception as e:
         logger.error(f"Error exporting policies: {e}")
         return JsonResponse({'success': False, 'error': str(e)})
+
+
+@require_admin_login
+def export_issue_crossref_xml(request, issue_id):
+    """Download Crossref deposit XML for a single issue"""
+    try:
+        issue = get_object_or_404(Issue.objects.select_related('journal'), id=issue_id)
+
+        response = HttpResponse(content_type='application/xml; charset=utf-8')
+        response['Content-Disposition'] = (
+            f'attachment; filename="{issue.journal.url_slug}_{issue.issue_identifier}_crossref.xml"'
+        )
+        write_deposit(response, deposit_issues(issue_ids=[issue.id]))
+        return response
+
+    except Exception as e:
+        logger.error(f"Error exporting Crossref deposit for issue {issue_id}: {e}")
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@require_admin_login
+def export_journal_crossref_xml(request, journal_id):
+    """Download Crossref deposit XML for all published issues of a journal"""
+    try:
+        journal = get_object_or_404(Journal, id=journal_id)
+
+        response = HttpResponse(content_type='application/xml; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{journal.url_slug}_crossref.xml"'
+        write_deposit(response, deposit_issues(journal_ids=[journal.id]))
+        return response
+
+    except Exception as e:
+        logger.error(f"Error exporting Crossref deposit for journal {journal_id}: {e}")
+        return JsonResponse({'success': False, 'error': str(e)})
@@ -22,6 +22,8 @@ urlpatterns = [
     path('admin/journals/<int:journal_id>/articles/add/', admin_journal.journal_add_article_ajax,
          name='journal_add_article_ajax'),
     path('admin/journals/<int:journal_id>/settings/', admin_views.journal_settings_ajax, name='journal_settings_ajax'),
+    path('admin/journals/<int:journal_id>/analytics/', admin_journal.journal_analytics_ajax,
+         name='journal_analytics_ajax'),
 
     # Article Management
     path('admin/articles/delete/<int:article_id>/', admin_views.delete_article_ajax, name='admin_delete_article'),
@@ -64,6 +66,12 @@ urlpatterns = [
          name='export_journal_editors'),
     path('admin/journals/<int:journal_id>/export/policies/', admin_journal.export_journal_policies_csv,
          name='export_journal_policies'),
+    path('admin/journals/<int:journal_id>/export/crossref/', admin_journal.export_journal_crossref_xml,
+         name='export_journal_crossref'),
+    path('admin/journals/<int:journal_id>/export/analytics/', admin_journal.export_journal_analytics_xlsx,
+         name='export_journal_analytics'),
+    path('admin/issues/<int:issue_id>/export/crossref/', admin_journal.export_issue_crossref_xml,
+         name='export_issue_crossref'),
 
     # Issue Management
     path('admin/issues/add/', admin_views.add_issue_ajax, name='admin_add_issue'),
@@ -78,6 +86,8 @@ urlpatterns = [
     path('admin/authors/update/<int:author_id>/', admin_views.update_author_ajax, name='admin_update_author'),
     path('admin/authors/delete/<int:author_id>/', admin_views.delete_author_ajax, name='admin_delete_author'),
     path('admin/authors/details/<int:author_id>/', admin_views.author_details_ajax, name='admin_author_details'),
+    path('admin/authors/candidates/', admin_views.author_candidates_ajax, name='admin_author_candidates'),
+    path('admin/authors/merge/', admin_views.merge_authors_ajax, name='admin_merge_authors'),
     path('admin/export/authors/', admin_views.export_authors_csv, name='admin_export_authors'),
 
     # FanTarmoq & IlmiyNashr Management
@@ -99,6 +109,7 @@ urlpatterns = [
     path('admin/seo/status/', admin_views.get_seo_status, name='admin_load_seo_status'),
     path('admin/seo/save/', admin_views.save_seo_settings, name='admin_save_seo'),
     path('admin/export/articles/', admin_views.export_articles_csv, name='admin_export_articles'),
+    path('admin/search-cache/stats/', admin_views.search_cache_stats_ajax, name='admin_search_cache_stats'),
 
     # Navigation for Publishers Management
     path('admin/navigation-publishers/', admin_views.navigation_publishers_page,
@@ -3,7 +3,6 @@ import csv
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse, HttpResponse
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.db.models import Q, Count
 from django.template.loader import render_to_string
 from django.views.decorators.csrf import csrf_protect
@@ -12,10 +11,18 @@ from django.core.exceptions import ValidationError
 import logging
 import os
 
+from .author_dedup import AUTO_MATCH_THRESHOLD, find_candidates, is_placeholder_email, merge_authors, placeholder_email
 from .config import ADMIN_USERNAME, ADMIN_PASSWORD
+from .page_cache import SITE_SCOPE, current_versions
+from .pagination import AUTHOR_ORDERING, ISSUE_ORDERING, paginate_request
+from .search_cache import reset_search_cache_stats, search_cache_stats
+from .singleflight import single_flight
+from .summaries import SUMMARY_ORDERING
 
 logger = logging.getLogger(__name__)
 
+SITEMAP_CACHE_TIMEOUT = 60 * 60
+
 from .models import *
 
 
@@ -62,52 +69,53 @@ def require_admin_login(view_func):
 
 def _create_or_update_author(first_name, last_name, middle_name, affiliation, email, orcid):
     """
-    Helper function to create or update author by email.
-    Only updates fields if new value is provided and different.
+    Helper function to find or create an author for article entry.
+    An author with the same email is updated with the provided values;
+    otherwise an existing author matching by ORCID or name (see
+    main.author_dedup) and without a different real email is reused and
+    only its blank fields are filled, so the same person isn't stored twice.
     """
     if not first_name or not last_name:
         raise ValidationError("Muallifning ismi va familiyasi majburiy.")
 
-    author = None
-    updated = False
-
-    if email:
-        try:
-            author = Author.objects.get(email=email)
-            # Only update fields if new data is provided and different
-            if first_name and author.first_name != first_name:
-                author.first_name = first_name
-                updated = True
-            if last_name and author.last_name != last_name:
-                author.last_name = last_name
-                updated = True
-            if middle_name and author.middle_name != middle_name:
-                author.middle_name = middle_name
-                updated = True
-            if affiliation and author.affiliation != affiliation:
-                author.affiliation = affiliation
-                updated = True
-            if orcid and author.orcid != orcid:
-                author.orcid = orcid
-                updated = True
-            if updated:
-                author.save()
-        except Author.DoesNotExist:
-            pass
-
-    if not author:
-        # If email not given, generate a fake one to satisfy unique constraint
-        email = email or f"{slugify(first_name)}.{slugify(last_name)}@example.com"
-        author = Author.objects.create(
-            first_name=first_name,
-            middle_name=middle_name,
-            last_name=last_name,
-            email=email,
-            affiliation=affiliation,
-            orcid=orcid,
-            is_active=True
-        )
-    return author
+    author = Author.objects.filter(email=email).first() if email else None
+    if author:
+        # Only update fields if new data is provided and different
+        values = {'first_name': first_name, 'last_name': last_name, 'middle_name': middle_name,
+                  'affiliation': affiliation, 'orcid': orcid}
+    else:
+        candidates = [
+            candidate for _, candidate in find_candidates(first_name, last_name, middle_name, affiliation, email,
+                                                          orcid, threshold=AUTO_MATCH_THRESHOLD)
+            # Two different real addresses mean two different people
+            if is_placeholder_email(email) or is_placeholder_email(candidate.email)
+        ]
+        if candidates:
+            author = candidates[0]
+            values = {field: value for field, value in
+                      {'middle_name': middle_name, 'affiliation': affiliation, 'orcid': orcid}.items()
+                      if not getattr(author, field)}
+            if email and is_placeholder_email(author.email):
+                values['email'] = email
+
+    if author:
+        updated = [field for field, value in values.items() if value and getattr(author, field) != value]
+        for field in updated:
+            setattr(author, field, values[field])
+        if updated:
+            author.save()
+        return author
+
+    return Author.objects.create(
+        first_name=first_name,
+        middle_name=middle_name,
+        last_name=last_name,
+        # If email not given, generate a placeholder one to satisfy unique constraint
+        email=email or placeholder_email(first_name, last_name),
+        affiliation=affiliation,
+        orcid=orcid,
+        is_active=True
+    )
 
 
 def _get_base_stats():
@@ -205,15 +213,13 @@ def journal_management_page(request, journal_id):
 def journal_issues_ajax(request, journal_id):
     """Get issues for specific journal"""
     try:
-        page = int(request.GET.get('page', 1))
         journal = get_object_or_404(Journal, id=journal_id)
 
         issues = Issue.objects.filter(journal=journal).annotate(
-            article_count=Count('articles')
-        ).order_by('-year', '-volume', '-number')
+            total_articles=Count('articles')
+        )
 
-        paginator = Paginator(issues, 20)
-        page_obj = paginator.get_page(page)
+        page_obj = paginate_request(request, issues, 20, ordering=ISSUE_ORDERING)
 
         issues_data = []
         for issue in page_obj:
@@ -225,7 +231,7 @@ def journal_issues_ajax(request, journal_id):
                 'title': issue.title or '',
                 'date_published': issue.date_published.strftime('%d.%m.%Y') if issue.date_published else '',
                 'is_published': issue.is_published,
-                'article_count': issue.article_count,
+                'article_count': issue.total_articles,
                 'has_cover': bool(issue.cover_image),
                 'is_active': issue.is_active,
             })
@@ -233,12 +239,7 @@ def journal_issues_ajax(request, journal_id):
         return JsonResponse({
             'success': True,
             'issues': issues_data,
-            'pagination': {
-                'current': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous(),
-            }
+            'pagination': page_obj.pagination_data(),
         })
 
     except Exception as e:
@@ -249,20 +250,19 @@ def journal_issues_ajax(request, journal_id):
 def journal_articles_ajax(request, journal_id):
     """Get articles for specific journal"""
     try:
-        page = int(request.GET.get('page', 1))
         search = request.GET.get('search', '')
         issue_filter = request.GET.get('issue', '')
         status_filter = request.GET.get('status', '')
 
         journal = get_object_or_404(Journal, id=journal_id)
-        articles = Article.objects.filter(issue__journal=journal).select_related('issue').prefetch_related('authors')
+        articles = ArticleSummary.objects.filter(journal_id=journal.id)
 
         if search:
-            articles = articles.filter(
+            articles = articles.filter(article__in=Article.objects.filter(
                 Q(title__icontains=search) |
                 Q(keywords__icontains=search) |
                 Q(abstract__icontains=search)
-            )
+            ).values('id'))
 
         if issue_filter:
             articles = articles.filter(issue_id=issue_filter)
@@ -275,36 +275,26 @@ def journal_articles_ajax(request, journal_id):
             elif status_filter == 'featured':
                 articles = articles.filter(featured=True)
 
-        articles = articles.order_by('-date_published', '-id')
-
-        paginator = Paginator(articles, 20)
-        page_obj = paginator.get_page(page)
+        page_obj = paginate_request(request, articles, 20, ordering=SUMMARY_ORDERING)
 
         articles_data = []
         for article in page_obj:
-            authors_list = [f"{author.first_name} {author.last_name}" for author in article.authors.all()]
-
             articles_data.append({
-                'id': article.id,
+                'id': article.article_id,
                 'title': article.title,
-                'subtitle': getattr(article, 'subtitle', '') or '',
-                'authors': authors_list,
-                'issue_info': f"Vol.{article.issue.volume} No.{article.issue.number}" if article.issue else 'N/A',
+                'subtitle': article.subtitle,
+                'authors': [author['name'] for author in article.author_list],
+                'issue_info': article.issue_citation or 'N/A',
                 'date_published': article.date_published.strftime('%d.%m.%Y'),
-                'views': getattr(article, 'views', 0),
+                'views': article.views,
                 'is_published': article.is_published,
-                'featured': getattr(article, 'featured', False),
+                'featured': article.featured,
             })
 
         return JsonResponse({
             'success': True,
             'articles': articles_data,
-            'pagination': {
-                'current': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous(),
-            }
+            'pagination': page_obj.pagination_data(),
         })
 
     except Exception as e:
@@ -651,7 +641,7 @@ def issues_list_ajax(request):
     try:
         journal_id = request.GET.get('journal')
         issues = Issue.objects.select_related('journal').annotate(
-            article_count=Count('articles')
+            total_articles=Count('articles')
         )
 
         if journal_id:
@@ -671,7 +661,7 @@ def issues_list_ajax(request):
                 'title': issue.title or '',
                 'date_published': issue.date_published.strftime('%d.%m.%Y') if issue.date_published else '',
                 'is_published': issue.is_published,
-                'article_count': issue.article_count,
+                'article_count': issue.total_articles,
                 'is_active': issue.is_active,
                 'full_citation': f"Jild {issue.volume}, Son {issue.number} ({issue.year})"
             })
@@ -829,10 +819,9 @@ def delete_issue_ajax(request, issue_id):
 def authors_list_ajax(request):
     """Get paginated list of authors for AJAX requests"""
     try:
-        page = int(request.GET.get('page', 1))
         search = request.GET.get('search', '')
 
-        authors = Author.objects.annotate(article_count=Count('articleauthor'))
+        authors = Author.objects.annotate(total_articles=Count('articleauthor'))
 
         if search:
             authors = authors.filter(
@@ -843,9 +832,7 @@ def authors_list_ajax(request):
                 Q(orcid__icontains=search)
             )
 
-        authors = authors.order_by('last_name', 'first_name')
-        paginator = Paginator(authors, 20)
-        page_obj = paginator.get_page(page)
+        page_obj = paginate_request(request, authors, 20, ordering=AUTHOR_ORDERING, with_count=True)
 
         authors_data = []
         for author in page_obj:
@@ -861,20 +848,14 @@ def authors_list_ajax(request):
                 'academic_degree': author.academic_degree or '',
                 'orcid': author.orcid or '',
                 'google_scholar_id': author.google_scholar_id or '',
-                'article_count': author.article_count,
+                'article_count': author.total_articles,
                 'is_active': author.is_active
             })
 
         return JsonResponse({
             'success': True,
             'authors': authors_data,
-            'pagination': {
-                'current': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous(),
-                'total_count': paginator.count
-            }
+            'pagination': page_obj.pagination_data()
         })
 
     except Exception as e:
@@ -918,7 +899,7 @@ def add_author_ajax(request):
             first_name=first_name,
             middle_name=middle_name,
             last_name=last_name,
-            email=email or f"{slugify(first_name)}.{slugify(last_name)}@example.com",
+            email=email or placeholder_email(first_name, last_name),
             affiliation=affiliation,
             department=department,
             position=position,
@@ -1104,6 +1085,70 @@ def author_details_ajax(request, author_id):
         return JsonResponse({'success': False, 'error': str(e)})
 
 
+@require_admin_login
+def author_candidates_ajax(request):
+    """Existing authors that are probably the same person as the given one (or the entered name)"""
+    try:
+        author_id = request.GET.get('author_id')
+        if author_id:
+            author = get_object_or_404(Author, id=author_id)
+            fields = [author.first_name, author.last_name, author.middle_name, author.affiliation, author.email,
+                      author.orcid]
+        else:
+            fields = [request.GET.get(field, '').strip() for field in
+                      ['first_name', 'last_name', 'middle_name', 'affiliation', 'email', 'orcid']]
+            if not fields[0] or not fields[1]:
+                return JsonResponse({'success': False, 'error': "Ism va familiya majburiy"})
+
+        candidates = [
+            {
+                'id': candidate.id,
+                'full_name': candidate.full_name,
+                'email': '' if is_placeholder_email(candidate.email) else candidate.email,
+                'affiliation': candidate.affiliation or '',
+                'orcid': candidate.orcid or '',
+                'article_count': candidate.article_count,
+                'score': score,
+            }
+            for score, candidate in find_candidates(*fields, limit=10)
+            if str(candidate.id) != author_id
+        ]
+        return JsonResponse({'success': True, 'candidates': candidates})
+
+    except Exception as e:
+        logger.error(f"Error finding author candidates: {e}")
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@require_admin_login
+@csrf_protect
+def merge_authors_ajax(request):
+    """Merge duplicate authors into one, moving their articles to it"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': "Noto'g'ri so'rov"})
+
+    try:
+        target = get_object_or_404(Author, id=request.POST.get('target_id'))
+        duplicate_ids = {int(author_id) for author_id in request.POST.getlist('duplicate_ids') if author_id.isdigit()}
+        duplicate_ids.discard(target.id)
+        duplicates = list(Author.objects.filter(id__in=duplicate_ids))
+        if not duplicates:
+            return JsonResponse({'success': False, 'error': "Birlashtiriladigan mualliflar tanlanmagan"})
+
+        moved = merge_authors(target, duplicates)
+        logger.info(f"Authors {sorted(duplicate_ids)} merged into '{target.full_name}' ({moved} articles moved)")
+
+        return JsonResponse({
+            'success': True,
+            'message': f"{len(duplicates)} ta muallif birlashtirildi, {moved} ta maqola ko'chirildi",
+            'author_id': target.id
+        })
+
+    except Exception as e:
+        logger.error(f"Error merging authors: {e}")
+        return JsonResponse({'success': False, 'error': f'Xatolik: {str(e)}'})
+
+
 # UTILITY FUNCTIONS
 @require_admin_login
 def get_journal_issues(request, journal_id):
@@ -1287,7 +1332,7 @@ def export_authors_csv(request):
         'ORCID', 'Google Scholar ID', 'Website', 'Articles Count', 'Active'
     ])
 
-    authors = Author.objects.annotate(article_count=Count('articleauthor'))
+    authors = Author.objects.annotate(total_articles=Count('articleauthor'))
     for author in authors:
         writer.writerow([
             author.id,
@@ -1299,7 +1344,7 @@ def export_authors_csv(request):
             author.orcid or '',
             author.google_scholar_id or '',
             author.website or '',
-            author.article_count,
+            author.total_articles,
             'Yes' if author.is_active else 'No'
         ])
 
@@ -1347,24 +1392,34 @@ def generate_sitemap(request):
     if request.method == "GET":
         # Handle GET request - return actual sitemap XML
         try:
-            articles = Article.objects.filter(
-                is_published=True,
-                issue__isnull=False
-            ).select_related('issue__journal').order_by('-date_published')
-
-            journals = Journal.objects.filter(is_active=True)
-            issues = Issue.objects.filter(is_published=True).select_related('journal')
-            authors = Author.objects.filter(is_active=True)
-
-            sitemap_content = render_to_string('sitemap.xml', {
-                'articles': articles,
-                'journals': journals,
-                'issues': issues,
-                'authors': authors,
-                'domain': request.get_host(),
-                'protocol': 'https' if request.is_secure() else 'http',
-                'enable_google_scholar': SiteSEO.objects.first().enable_google_scholar if SiteSEO.objects.first() else False,
-            })
+            def render_sitemap():
+                articles = Article.objects.filter(
+                    is_published=True,
+                    issue__isnull=False
+                ).select_related('issue__journal').order_by('-date_published')
+
+                journals = Journal.objects.filter(is_active=True)
+                issues = Issue.objects.filter(is_published=True).select_related('journal')
+                authors = Author.objects.filter(is_active=True)
+
+                return render_to_string('sitemap.xml', {
+                    'articles': articles,
+                    'journals': journals,
+                    'issues': issues,
+                    'authors': authors,
+                    'domain': request.get_host(),
+                    'protocol': 'https' if request.is_secure() else 'http',
+                    'enable_google_scholar': SiteSEO.objects.first().enable_google_scholar if SiteSEO.objects.first() else False,
+                })
+
+            # One worker rebuilds after a content change; the rest serve the previous sitemap meanwhile
+            protocol = 'https' if request.is_secure() else 'http'
+            sitemap_content = single_flight(
+                f"sitemap:{protocol}:{request.get_host()}",
+                render_sitemap,
+                SITEMAP_CACHE_TIMEOUT,
+                version=current_versions([SITE_SCOPE])[SITE_SCOPE],
+            )
 
             return HttpResponse(sitemap_content, content_type='application/xml')
 
@@ -2070,3 +2125,11 @@ def toggle_article_featured(request, article_id):
 
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
+
+
+@require_admin_login
+def search_cache_stats_ajax(request):
+    """Hit rate of the search result cache (main.search_cache); POST resets the totals"""
+    if request.method == 'POST':
+        reset_search_cache_stats()
+    return JsonResponse({'success': True, 'stats': search_cache_stats()})
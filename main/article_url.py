@@ -1,6 +1,6 @@
 # article_urls.py - COMPLETE FIXED VERSION
 from django.urls import path
-from main import article_views
+from main import article_views, feeds
 
 urlpatterns = [
     # Article URLs (public)
@@ -8,6 +8,8 @@ urlpatterns = [
     path('articles/<int:article_id>/', article_views.article_detail, name='article_detail'),
     path('articles/<int:article_id>/view/', article_views.increment_article_views, name='increment_views'),
     path('articles/<int:article_id>/download/', article_views.download_article_pdf, name='download_pdf'),
+    path('articles/<int:article_id>/cite/<str:fmt>/', article_views.article_citation_export,
+         name='article_citation_export'),
 
     # Article filtering URLs
     path('articles/featured/', article_views.featured_articles, name='featured_articles'),
@@ -15,18 +17,32 @@ urlpatterns = [
     path('articles/latest/', article_views.latest_articles, name='latest_articles'),
     path('articles/year/<int:year>/', article_views.articles_by_year, name='articles_by_year'),
 
+    # Keyword URLs (public)
+    path('keywords/', article_views.keywords_list, name='keywords_list'),
+    path('keywords/<str:slug>/', article_views.keyword_detail, name='keyword_detail'),
+
+    # Institution URLs (public)
+    path('institutions/', article_views.institutions_list, name='institutions_list'),
+    path('institutions/<slug:slug>/', article_views.institution_detail, name='institution_detail'),
+
     # Article view url
     path('articles/<int:article_id>/pdf/', article_views.ViewPDFView.as_view(), name='view_pdf'),
 
     # Journal URLs (public)
     path('journals/<slug:journal_slug>/', article_views.journal_detail, name='journal_detail'),
+    path('journals/<slug:journal_slug>/feed/<str:fmt>/', feeds.journal_feed, name='journal_feed'),
 
     # Issue URLs (public) - This was missing!
     path('journals/<slug:journal_slug>/<int:year>/<int:volume>/<int:number>/',
          article_views.issue_detail, name='issue_detail'),
+    path('journals/<slug:journal_slug>/<int:year>/<int:volume>/<int:number>/cite/<str:fmt>/',
+         article_views.issue_citations_export, name='issue_citations_export'),
+    path('journals/<slug:journal_slug>/<int:year>/<int:volume>/<int:number>/feed/<str:fmt>/',
+         feeds.issue_feed, name='issue_feed'),
 
     # Author URLs (public)
     path('authors/<int:author_id>/', article_views.author_detail, name='author_detail'),
+    path('authors/graph.json', article_views.coauthor_graph, name='coauthor_graph'),
 
     # Search URLs (public)
     path('search/articles/', article_views.search_articles, name='search_articles'),
@@ -7,7 +7,26 @@ from django.views.decorators.http import require_POST
 from django.db.models import F
 from django.core.paginator import Paginator
 from django.db.models import Q
-from .models import Article, Author, Journal, Issue, JournalPolicy, JournalEditor
+from .models import (
+    Article, ArticleAuthor, ArticleKeyword, ArticleSummary, Author, Institution, Journal, Issue, JournalPolicy,
+    JournalEditor, Keyword,
+)
+from .citations import EXPORT_FORMATS, export_citations
+from .coauthors import graph_json, top_collaborators
+from .facets import article_facets
+from .keywords import keyword_cloud
+from .page_cache import (
+    SITE_SCOPE, author_scope, cache_public_page, count_cached_view, journal_scope, page_depends_on,
+)
+from .pagination import INSTITUTION_ORDERING, paginate_request
+from .summaries import SUMMARY_ORDERING
+from .transliteration import fold
+from .trending import journal_trending_scope, trending_articles
+
+AUTHOR_ARTICLES_PER_PAGE = 10
+INSTITUTIONS_PER_PAGE = 30
+INSTITUTION_AUTHORS_PER_PAGE = 24
+INSTITUTION_LATEST_ARTICLES = 6
 
 
 class ViewPDFView(View):
@@ -59,39 +78,44 @@ def view_pdf(request, article_id):
         raise Http404("PDF file not found")
 
 
+@cache_public_page(on_hit=count_cached_view)
 def article_detail(request, article_id):
     """Display individual article with SEO optimization"""
     try:
         article = get_object_or_404(
-            Article.objects.select_related('issue__journal', 'main_pdf')
+            Article.objects.select_related('issue__journal', 'main_pdf', 'rendered_citation')
             .prefetch_related('authors'),
             id=article_id,
             is_published=True
         )
+        page_depends_on(
+            request,
+            journal_scope(article.issue.journal_id) if article.issue else SITE_SCOPE,
+            *(author_scope(author.id) for author in article.authors.all())
+        )
 
         # Increment view count
         article.increment_views()
 
-        # Get related articles from same journal
-        related_articles = Article.objects.filter(
-            issue__journal=article.issue.journal,
-            is_published=True
-        ).exclude(id=article.id).order_by('-date_published')[:5] if article.issue else []
-
-        # Get other articles by same authors
-        author_articles = Article.objects.filter(
-            authors__in=article.authors.all(),
+        # Precomputed TF-IDF neighbours (main.related), read through the (article, rank) index
+        related_articles = list(ArticleSummary.objects.filter(
+            article__neighbor_of__article=article,
             is_published=True
-        ).exclude(id=article.id).distinct().order_by('-date_published')[:3]
+        ).order_by('article__neighbor_of__rank')[:5])
+        if not related_articles and article.issue:
+            # Not in the neighbour table yet (published after the last build): latest of the same journal
+            related_articles = list(ArticleSummary.objects.filter(
+                journal_id=article.issue.journal_id,
+                is_published=True
+            ).exclude(article_id=article.id).order_by(*SUMMARY_ORDERING)[:5])
 
         context = {
             'article': article,
             'related_articles': related_articles,
             'references': article.references or '',
-            'author_articles': author_articles,
             'page_title': f'{article.title} - Imfaktor',
             'meta_description': article.meta_description or article.abstract[:160] if article.abstract else '',
-            'keywords': [k.strip() for k in (article.keywords or '').split(',') if k.strip()],
+            'keywords': [link.keyword for link in article.keyword_links.select_related('keyword')],
         }
 
         return render(request, 'article_detail.html', context)
@@ -100,57 +124,86 @@ def article_detail(request, article_id):
         raise Http404("Maqola topilmadi")
 
 
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 def articles_list(request):
-    """Display all articles with pagination and search"""
+    """Display all articles with pagination, search and facet filters"""
     search_query = request.GET.get('search', '')
     journal_filter = request.GET.get('journal', '')
     year_filter = request.GET.get('year', '')
+    language_filter = request.GET.get('language', '')
+    open_access_filter = request.GET.get('open_access') == '1'
+    featured_filter = request.GET.get('featured') == '1'
 
-    articles = Article.objects.filter(is_published=True).select_related('issue__journal').prefetch_related('authors')
+    articles = ArticleSummary.objects.filter(is_published=True)
 
     # Apply filters
     if search_query:
-        articles = articles.filter(
+        articles = articles.filter(article__in=Article.objects.filter(
             Q(title__icontains=search_query) |
             Q(abstract__icontains=search_query) |
             Q(keywords__icontains=search_query) |
             Q(authors__first_name__icontains=search_query) |
             Q(authors__last_name__icontains=search_query)
-        ).distinct()
+        ).values('id'))
+
+    # Facet counts for the current filter state; without a text search they come from the facet table
+    selected = {
+        'journal': _int_or_none(journal_filter),
+        'year': _int_or_none(year_filter),
+        'language': language_filter,
+        'open_access': True if open_access_filter else None,
+        'featured': True if featured_filter else None,
+    }
+    facets = article_facets(selected, queryset=articles if search_query else None)
 
-    if journal_filter:
-        articles = articles.filter(issue__journal__id=journal_filter)
+    if selected['journal'] is not None:
+        articles = articles.filter(journal_id=selected['journal'])
 
-    if year_filter:
-        articles = articles.filter(date_published__year=year_filter)
+    if selected['year'] is not None:
+        articles = articles.filter(date_published__year=selected['year'])
 
-    articles = articles.order_by('-date_published')
+    if language_filter:
+        articles = articles.filter(language=language_filter)
 
-    # Pagination
-    paginator = Paginator(articles, 12)  # 12 articles per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    if open_access_filter:
+        articles = articles.filter(open_access=True)
+
+    if featured_filter:
+        articles = articles.filter(featured=True)
 
-    # Get filters for template
-    journals = Journal.objects.filter(is_active=True)
-    years = Article.objects.filter(is_published=True).dates('date_published', 'year', order='DESC')
+    page_obj = paginate_request(request, articles, 12, ordering=SUMMARY_ORDERING)
+
+    # Current filters for the pagination links
+    filter_params = request.GET.copy()
+    filter_params.pop('cursor', None)
 
     context = {
         'articles': page_obj,
-        'journals': journals,
-        'years': years,
+        'facets': facets,
+        'filter_query': filter_params.urlencode(),
         'search_query': search_query,
         'journal_filter': journal_filter,
         'year_filter': year_filter,
+        'language_filter': language_filter,
+        'open_access_filter': open_access_filter,
+        'featured_filter': featured_filter,
         'page_title': 'Barcha Maqolalar - Imfaktor',
     }
 
     return render(request, 'articles_list.html', context)
 
 
+@cache_public_page()
 def journal_detail(request, journal_slug):
     """Display journal with current active issue and organized sections"""
     journal = get_object_or_404(Journal, url_slug=journal_slug, is_active=True)
+    page_depends_on(request, journal_scope(journal.id), journal_trending_scope(journal.id))
 
     # Get current active issue
     current_issue = Issue.objects.filter(
@@ -160,21 +213,21 @@ def journal_detail(request, journal_slug):
     ).first()
 
     # Get articles for current issue
-    current_articles = []
+    current_articles = ArticleSummary.objects.none()
     if current_issue:
-        current_articles = Article.objects.filter(
-            issue=current_issue,
+        current_articles = ArticleSummary.objects.filter(
+            issue_id=current_issue.id,
             is_published=True
-        ).select_related('issue').prefetch_related('authors').order_by('-date_published')
+        ).order_by('-date_published', '-article_id')
 
     # Get all issues for statistics
     all_issues = Issue.objects.filter(journal=journal, is_published=True)
 
     # Get all articles for statistics
-    all_articles = Article.objects.filter(
-        issue__journal=journal,
+    all_articles = ArticleSummary.objects.filter(
+        journal_id=journal.id,
         is_published=True
-    ).select_related('issue').prefetch_related('authors')
+    )
 
     # Get archived issues (inactive)
     archived_issues = Issue.objects.filter(
@@ -206,6 +259,8 @@ def journal_detail(request, journal_slug):
 
     # Pagination for current articles
     paginator = Paginator(current_articles, 10)
+    if current_issue:
+        paginator.count = current_issue.article_count
     page_number = request.GET.get('page')
     current_articles_page = paginator.get_page(page_number)
 
@@ -219,6 +274,7 @@ def journal_detail(request, journal_slug):
         'editors': editors,
         'editors_by_type': editors_by_type,
         'policies': policies,
+        'trending_articles': trending_articles(journal.id),
         'page_title': f'{journal.title} - Imfaktor',
         'meta_description': journal.meta_description or journal.description[:160] if journal.description else '',
     }
@@ -226,9 +282,11 @@ def journal_detail(request, journal_slug):
     return render(request, 'journal_detail.html', context)
 
 
+@cache_public_page()
 def issue_detail(request, journal_slug, year, volume, number):
     """Display issue with its articles"""
     journal = get_object_or_404(Journal, url_slug=journal_slug, is_active=True)
+    page_depends_on(request, journal_scope(journal.id))
     issue = get_object_or_404(
         Issue,
         journal=journal,
@@ -239,10 +297,10 @@ def issue_detail(request, journal_slug, year, volume, number):
     )
 
     # Get issue articles
-    articles = Article.objects.filter(
-        issue=issue,
+    articles = ArticleSummary.objects.filter(
+        issue_id=issue.id,
         is_published=True
-    ).prefetch_related('authors').order_by('first_page', 'created_at')
+    ).order_by('first_page', 'article_id')
 
     context = {
         'journal': journal,
@@ -255,27 +313,37 @@ def issue_detail(request, journal_slug, year, volume, number):
     return render(request, 'issue_detail.html', context)
 
 
+@cache_public_page()
 def author_detail(request, author_id):
     """Display author profile with their articles"""
-    author = get_object_or_404(Author, id=author_id, is_active=True)
+    author = get_object_or_404(Author.objects.select_related('institution', 'stats'), id=author_id, is_active=True)
+    page_depends_on(request, author_scope(author.id))
 
-    # Get author's articles
+    # Get author's articles, one page at a time
     articles = Article.objects.filter(
         authors=author,
         is_published=True
-    ).select_related('issue__journal').order_by('-date_published')
+    ).select_related('issue__journal').prefetch_related('authors').order_by('-date_published', '-id')
 
-    # Get statistics
-    total_articles = articles.count()
-    total_views = sum(article.views for article in articles)
-    total_citations = 0  # You can implement citation counting
+    # Statistics come from the counters on Author (main.counters)
+    # and its AuthorStats row (main.author_metrics)
+    stats = getattr(author, 'stats', None)
+    paginator = Paginator(articles, AUTHOR_ARTICLES_PER_PAGE)
+    paginator.count = author.article_count
+    page_obj = paginator.get_page(request.GET.get('page'))
+    page_depends_on(request, *(journal_scope(article.issue.journal_id) for article in page_obj if article.issue))
+
+    collaborators = list(top_collaborators(author.id))
+    page_depends_on(request, *(author_scope(collaboration.coauthor_id) for collaboration in collaborators))
 
     context = {
         'author': author,
-        'articles': articles,
-        'total_articles': total_articles,
-        'total_views': total_views,
-        'total_citations': total_citations,
+        'articles': page_obj,
+        'total_articles': author.article_count,
+        'total_views': author.total_views,
+        'total_citations': stats.total_citations if stats else 0,
+        'stats': stats,
+        'collaborators': collaborators,
         'page_title': f'{author.full_name} - Imfaktor',
         'meta_description': author.bio[
                             :160] if author.bio else f'{author.full_name} - Imfaktor portalidagi muallif profili',
@@ -284,6 +352,11 @@ def author_detail(request, author_id):
     return render(request, 'author_detail.html', context)
 
 
+def coauthor_graph(request):
+    """Co-authorship graph as {nodes, links} JSON for visualization"""
+    return HttpResponse(graph_json(), content_type='application/json')
+
+
 @require_POST
 def increment_article_views(request, article_id):
     """AJAX endpoint to increment article view count"""
@@ -303,28 +376,68 @@ def search_articles(request):
     if len(query) < 3:
         return JsonResponse({'results': []})
 
-    articles = Article.objects.filter(
-        Q(title__icontains=query) |
-        Q(abstract__icontains=query) |
-        Q(keywords__icontains=query),
+    articles = ArticleSummary.objects.filter(
+        article__in=Article.objects.filter(
+            Q(title__icontains=query) |
+            Q(abstract__icontains=query) |
+            Q(keywords__icontains=query)
+        ).values('id'),
         is_published=True
-    ).select_related('issue__journal').prefetch_related('authors')[:10]
+    ).values('article_id', 'title', 'authors_display', 'journal_title', 'date_published')[:10]
 
     results = []
     for article in articles:
-        authors = [author.full_name for author in article.authors.all()]
         results.append({
-            'id': article.id,
-            'title': article.title,
-            'authors': ', '.join(authors),
-            'journal': article.issue.journal.title if article.issue else '',
-            'date': article.date_published.strftime('%Y'),
-            'url': f'/articles/{article.id}/'
+            'id': article['article_id'],
+            'title': article['title'],
+            'authors': article['authors_display'],
+            'journal': article['journal_title'],
+            'date': article['date_published'].strftime('%Y'),
+            'url': f"/articles/{article['article_id']}/"
         })
 
     return JsonResponse({'results': results})
 
 
+def _citation_response(content, fmt, filename):
+    content_type, extension = EXPORT_FORMATS[fmt]
+    response = HttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    return response
+
+
+def article_citation_export(request, article_id, fmt):
+    """Download a single article citation as BibTeX or RIS"""
+    if fmt not in EXPORT_FORMATS:
+        raise Http404("Noma'lum format")
+
+    article = get_object_or_404(Article.objects.only('id', 'slug'), id=article_id, is_published=True)
+    return _citation_response(export_citations([article.id], fmt), fmt, article.slug or f"article-{article.id}")
+
+
+def issue_citations_export(request, journal_slug, year, volume, number, fmt):
+    """Download citations of every article in an issue as BibTeX or RIS"""
+    if fmt not in EXPORT_FORMATS:
+        raise Http404("Noma'lum format")
+
+    issue = get_object_or_404(
+        Issue.objects.select_related('journal'),
+        journal__url_slug=journal_slug,
+        journal__is_active=True,
+        year=year,
+        volume=volume,
+        number=number,
+        is_published=True
+    )
+    article_ids = list(Article.objects.filter(
+        issue=issue,
+        is_published=True
+    ).order_by('first_page', 'created_at').values_list('id', flat=True))
+
+    filename = f"{issue.journal.url_slug}_{issue.issue_identifier}"
+    return _citation_response(export_citations(article_ids, fmt), fmt, filename)
+
+
 def download_article_pdf(request, article_id):
     """Handle PDF download with tracking"""
     article = get_object_or_404(Article, id=article_id, is_published=True)
@@ -343,17 +456,110 @@ def download_article_pdf(request, article_id):
     )
 
 
+@cache_public_page()
+def keywords_list(request):
+    """Display the most used keywords sized by frequency"""
+    page_depends_on(request, SITE_SCOPE)
+
+    context = {
+        'keywords': keyword_cloud(),
+        'page_title': "Kalit So'zlar - Imfaktor",
+        'meta_description': "Imfaktor portalidagi maqolalarning eng ko'p uchraydigan kalit so'zlari",
+    }
+
+    return render(request, 'keywords.html', context)
+
+
+@cache_public_page()
+def keyword_detail(request, slug):
+    """Display articles tagged with a keyword"""
+    page_depends_on(request, SITE_SCOPE)
+    keyword = get_object_or_404(Keyword, slug=slug)
+
+    articles = ArticleSummary.objects.filter(
+        is_published=True,
+        article_id__in=ArticleKeyword.objects.filter(keyword=keyword).values('article_id')
+    )
+
+    page_obj = paginate_request(request, articles, 12, ordering=SUMMARY_ORDERING)
+
+    context = {
+        'articles': page_obj,
+        'keyword': keyword,
+        'page_title': f"{keyword.name} - Kalit So'z - Imfaktor",
+        'meta_description': f"Imfaktor portalida \"{keyword.name}\" kalit so'zi bilan belgilangan ilmiy maqolalar",
+    }
+
+    return render(request, 'articles_list.html', context)
+
+
+@cache_public_page()
+def institutions_list(request):
+    """Browse institutions alphabetically, searchable in either script"""
+    page_depends_on(request, SITE_SCOPE)
+
+    institutions = Institution.objects.filter(author_count__gt=0)
+    search_query = request.GET.get('q', '').strip()
+    if search_query:
+        # Prefix lookup on the unique folded-key index
+        institutions = institutions.filter(key__startswith=fold(search_query))
+
+    page_obj = paginate_request(request, institutions, INSTITUTIONS_PER_PAGE,
+                                ordering=INSTITUTION_ORDERING, with_count=True)
+
+    context = {
+        'institutions': page_obj,
+        'search_query': search_query,
+        'page_title': "Tashkilotlar - Imfaktor",
+        'meta_description': "Imfaktor portalida maqola chop etgan mualliflarning tashkilotlari",
+    }
+
+    return render(request, 'institutions.html', context)
+
+
+@cache_public_page()
+def institution_detail(request, slug):
+    """Display an institution with its authors, editors and latest articles"""
+    page_depends_on(request, SITE_SCOPE)
+    institution = get_object_or_404(Institution, slug=slug)
+
+    authors = Author.objects.filter(institution=institution, is_active=True).order_by('last_name', 'first_name', 'id')
+    paginator = Paginator(authors, INSTITUTION_AUTHORS_PER_PAGE)
+    paginator.count = institution.author_count
+    page_obj = paginator.get_page(request.GET.get('page'))
+
+    editors = list(JournalEditor.objects.filter(institution=institution, is_active=True))
+    journal_titles = dict(Journal.objects.filter(
+        id__in={editor.journal_id for editor in editors}
+    ).values_list('id', 'title'))
+    for editor in editors:
+        editor.journal_title = journal_titles.get(editor.journal_id, '')
+
+    articles = ArticleSummary.objects.filter(
+        is_published=True,
+        article_id__in=ArticleAuthor.objects.filter(author__institution=institution).values('article_id')
+    ).order_by(*SUMMARY_ORDERING)[:INSTITUTION_LATEST_ARTICLES]
+
+    context = {
+        'institution': institution,
+        'authors': page_obj,
+        'editors': editors,
+        'articles': articles,
+        'page_title': f"{institution.name} - Imfaktor",
+        'meta_description': f"{institution.name}: Imfaktor portalidagi mualliflar va ilmiy maqolalar",
+    }
+
+    return render(request, 'institution_detail.html', context)
+
+
 def featured_articles(request):
     """Display featured articles"""
-    articles = Article.objects.filter(
+    articles = ArticleSummary.objects.filter(
         is_published=True,
         featured=True
-    ).select_related('issue__journal').prefetch_related('authors').order_by('-date_published')
+    )
 
-    # Pagination
-    paginator = Paginator(articles, 9)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate_request(request, articles, 9, ordering=SUMMARY_ORDERING)
 
     context = {
         'articles': page_obj,
@@ -366,15 +572,12 @@ def featured_articles(request):
 
 def open_access_articles(request):
     """Display open access articles"""
-    articles = Article.objects.filter(
+    articles = ArticleSummary.objects.filter(
         is_published=True,
         open_access=True
-    ).select_related('issue__journal').prefetch_related('authors').order_by('-date_published')
+    )
 
-    # Pagination
-    paginator = Paginator(articles, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate_request(request, articles, 12, ordering=SUMMARY_ORDERING)
 
     context = {
         'articles': page_obj,
@@ -387,14 +590,11 @@ def open_access_articles(request):
 
 def latest_articles(request):
     """Display latest articles"""
-    articles = Article.objects.filter(
+    articles = ArticleSummary.objects.filter(
         is_published=True
-    ).select_related('issue__journal').prefetch_related('authors').order_by('-date_published')
+    )
 
-    # Pagination
-    paginator = Paginator(articles, 15)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate_request(request, articles, 15, ordering=SUMMARY_ORDERING)
 
     context = {
         'articles': page_obj,
@@ -412,19 +612,15 @@ def articles_by_year(request, year):
     except ValueError:
         raise Http404("Noto'g'ri yil")
 
-    articles = Article.objects.filter(
+    articles = ArticleSummary.objects.filter(
         is_published=True,
         date_published__year=year
-    ).select_related('issue__journal').prefetch_related('authors').order_by('-date_published')
+    )
 
-    if not articles.exists():
+    page_obj = paginate_request(request, articles, 12, ordering=SUMMARY_ORDERING)
+    if not page_obj:
         raise Http404(f"{year} yilda nashr etilgan maqolalar topilmadi")
 
-    # Pagination
-    paginator = Paginator(articles, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-
     context = {
         'articles': page_obj,
         'year': year,
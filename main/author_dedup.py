@@ -0,0 +1,229 @@
+"""
+Duplicate author detection and merging.
+
+Every author gets blocking keys in AuthorBlockKey: the script-folded
+surname with the first initial ("name:karimov:a") and the normalized ORCID
+("orcid:0000000212345678"). Only authors sharing a key are ever compared, so
+candidate pairs come from the (usually tiny) key groups instead of all n²
+pairs. A pair is scored from ORCID, real e-mail, name and affiliation
+agreement; merge_authors folds duplicates into one author, moving their
+ArticleAuthor rows in a single transaction.
+
+find_candidates does the same lookup for a name being typed in, so article
+entry reuses an existing author instead of creating another copy.
+"""
+import re
+from difflib import SequenceMatcher
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from .models import ArticleAuthor, Author, AuthorBlockKey
+from .transliteration import fold, to_latin
+
+# Pairs scoring at least this are reported as probable duplicates
+CANDIDATE_THRESHOLD = 0.75
+# Article entry silently reuses an author scoring at least this
+AUTO_MATCH_THRESHOLD = 0.92
+# Larger key groups (very common surname and initial) are only compared by ORCID
+MAX_BLOCK_SIZE = 200
+PLACEHOLDER_DOMAIN = 'example.com'
+BATCH_SIZE = 1000
+
+_ORCID_CHARACTERS = re.compile(r'[^0-9X]')
+# Fields copied from a duplicate when the kept author has them blank
+MERGED_FIELDS = [
+    'middle_name', 'affiliation', 'department', 'position', 'academic_title', 'academic_degree', 'website',
+    'orcid', 'google_scholar_id', 'researchgate_profile', 'bio', 'photo',
+]
+
+
+def normalize_orcid(orcid):
+    """The 16 ORCID characters ('https://orcid.org/0000-0002-1825-0097' -> '0000000218250097'), or ''"""
+    characters = _ORCID_CHARACTERS.sub('', (orcid or '').upper().rsplit('/', 1)[-1])
+    return characters if len(characters) == 16 else ''
+
+
+def is_placeholder_email(email):
+    return not email or email.lower().endswith(f"@{PLACEHOLDER_DOMAIN}")
+
+
+def placeholder_email(first_name, last_name):
+    """Unused first.last[.n]@example.com address for an author entered without e-mail"""
+    # Cyrillic names are transliterated, slugify would drop them
+    local = f"{slugify(to_latin(first_name))}.{slugify(to_latin(last_name))}".strip('.') or 'author'
+    email, number = f"{local}@{PLACEHOLDER_DOMAIN}", 1
+    while Author.objects.filter(email=email).exists():
+        number += 1
+        email = f"{local}.{number}@{PLACEHOLDER_DOMAIN}"
+    return email
+
+
+def blocking_keys(first_name, last_name, orcid=''):
+    keys = set()
+    surname, first = ''.join(fold(last_name).split()), fold(first_name)
+    if surname and first:
+        keys.add(f"name:{surname}:{first[0]}")
+    orcid = normalize_orcid(orcid)
+    if orcid:
+        keys.add(f"orcid:{orcid}")
+    return keys
+
+
+def index_author_keys(author_ids):
+    """Replace the blocking keys of the given authors"""
+    author_ids = list(author_ids)
+    AuthorBlockKey.objects.filter(author_id__in=author_ids).delete()
+    AuthorBlockKey.objects.bulk_create([
+        AuthorBlockKey(author_id=author_id, key=key)
+        for author_id, first_name, last_name, orcid in Author.objects.filter(id__in=author_ids)
+        .values_list('id', 'first_name', 'last_name', 'orcid')
+        for key in sorted(blocking_keys(first_name, last_name, orcid))
+    ], batch_size=BATCH_SIZE)
+
+
+def rebuild_author_keys():
+    """Re-key every author; returns the number of keys"""
+    with transaction.atomic():
+        AuthorBlockKey.objects.all().delete()
+        ids = list(Author.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, len(ids), BATCH_SIZE):
+            index_author_keys(ids[start:start + BATCH_SIZE])
+    return AuthorBlockKey.objects.count()
+
+
+# Scoring
+
+_PROFILE_FIELDS = ['id', 'first_name', 'middle_name', 'last_name', 'email', 'orcid', 'affiliation', 'institution_id']
+
+
+def _profile(first_name, last_name, middle_name='', affiliation='', email='', orcid='', institution_id=None, id=None):
+    return {
+        'id': id,
+        'first': fold(first_name),
+        'middle': fold(middle_name or ''),
+        'last': ''.join(fold(last_name).split()),
+        'email': '' if is_placeholder_email(email) else email.strip().lower(),
+        'orcid': normalize_orcid(orcid),
+        'affiliation': fold(affiliation or ''),
+        'institution_id': institution_id,
+    }
+
+
+def _given_name_similarity(first, second):
+    if not first or not second:
+        return 0.8
+    if first == second:
+        return 1.0
+    # "A." against "Alisher"
+    if (len(first) == 1 or len(second) == 1) and first[0] == second[0]:
+        return 0.85
+    # Squared, so similar but different names ("Aziz", "Aziza") stay below AUTO_MATCH_THRESHOLD
+    return SequenceMatcher(None, first, second).ratio() ** 2
+
+
+def similarity(first, second):
+    """Probability-like score (0..1) that two author profiles are the same person"""
+    if first['orcid'] and second['orcid']:
+        return 1.0 if first['orcid'] == second['orcid'] else 0.0
+    if first['email'] and first['email'] == second['email']:
+        return 1.0
+
+    name = SequenceMatcher(None, first['last'], second['last']).ratio()
+    name *= _given_name_similarity(first['first'], second['first'])
+    if first['middle'] and second['middle'] and first['middle'][0] != second['middle'][0]:
+        name *= 0.7
+
+    if first['institution_id'] and first['institution_id'] == second['institution_id']:
+        affiliation = 1.0
+    elif first['affiliation'] and second['affiliation']:
+        affiliation = SequenceMatcher(None, first['affiliation'], second['affiliation']).ratio()
+    else:
+        affiliation = 0.5
+    return round(0.75 * name + 0.25 * affiliation, 4)
+
+
+def _profiles(author_ids):
+    return {row['id']: _profile(**row) for row in Author.objects.filter(id__in=author_ids).values(*_PROFILE_FIELDS)}
+
+
+def candidate_pairs(threshold=CANDIDATE_THRESHOLD):
+    """[(score, author id, author id)] of probable duplicates, best first"""
+    blocks = {}
+    for key, author_id in AuthorBlockKey.objects.order_by('key', 'author_id').values_list('key', 'author_id'):
+        blocks.setdefault(key, []).append(author_id)
+
+    pairs = set()
+    for key, members in blocks.items():
+        if len(members) < 2 or (len(members) > MAX_BLOCK_SIZE and not key.startswith('orcid:')):
+            continue
+        pairs.update((first, second) for index, first in enumerate(members) for second in members[index + 1:])
+
+    profiles = _profiles({author_id for pair in pairs for author_id in pair})
+    scored = [(similarity(profiles[first], profiles[second]), first, second) for first, second in pairs]
+    return sorted((pair for pair in scored if pair[0] >= threshold), key=lambda pair: (-pair[0], pair[1], pair[2]))
+
+
+def find_candidates(first_name, last_name, middle_name='', affiliation='', email='', orcid='', limit=5,
+                    threshold=CANDIDATE_THRESHOLD):
+    """[(score, Author)] of existing authors that probably are the person being entered, best first"""
+    keys = blocking_keys(first_name, last_name, orcid)
+    if not keys:
+        return []
+    author_ids = set(AuthorBlockKey.objects.filter(key__in=keys).values_list('author_id', flat=True)[:MAX_BLOCK_SIZE])
+    entered = _profile(first_name, last_name, middle_name, affiliation, email, orcid)
+    scored = sorted(
+        ((similarity(entered, profile), author_id) for author_id, profile in _profiles(author_ids).items()),
+        key=lambda pair: (-pair[0], pair[1]),
+    )
+    scored = [(score, author_id) for score, author_id in scored if score >= threshold][:limit]
+    authors = Author.objects.in_bulk([author_id for _, author_id in scored])
+    return [(score, authors[author_id]) for score, author_id in scored]
+
+
+# Merging
+
+def merge_authors(target, duplicates):
+    """
+    Fold the duplicate authors into ``target``: their article links move to
+    it (or are dropped where it already is an author), blank profile fields
+    are filled from them, and they are deleted. Returns the moved link count.
+    """
+    # main.signals imports this module to keep the blocking keys current
+    from .signals import articles_changed, author_links_changed
+
+    duplicates = [author for author in duplicates if author.pk != target.pk]
+    if not duplicates:
+        return 0
+    duplicate_ids = [author.pk for author in duplicates]
+
+    with transaction.atomic():
+        taken = set(ArticleAuthor.objects.filter(author=target).values_list('article_id', flat=True))
+        moved, dropped, article_ids = [], [], set()
+        for link_id, article_id in (ArticleAuthor.objects.filter(author_id__in=duplicate_ids)
+                                    .order_by('article_id', 'order').values_list('id', 'article_id')):
+            (dropped if article_id in taken else moved).append(link_id)
+            taken.add(article_id)
+            article_ids.add(article_id)
+        ArticleAuthor.objects.filter(id__in=moved).update(author=target)
+        ArticleAuthor.objects.filter(id__in=dropped).delete()
+
+        changed = False
+        for field in MERGED_FIELDS:
+            if not getattr(target, field):
+                value = next((getattr(author, field) for author in duplicates if getattr(author, field)), None)
+                if value:
+                    setattr(target, field, value)
+                    changed = True
+        real_email = next((author.email for author in duplicates if not is_placeholder_email(author.email)), None)
+        # E-mails are unique: the duplicates go before their address moves over
+        Author.objects.filter(id__in=duplicate_ids).delete()
+        if real_email and is_placeholder_email(target.email):
+            target.email = real_email
+            changed = True
+        if changed:
+            target.save()
+
+        author_links_changed([target.pk])
+        articles_changed(article_ids)
+    return len(moved)
@@ -0,0 +1,110 @@
+"""
+Author citation metrics.
+
+AuthorStats holds, per author, the citations of their published articles
+(Article.citation_count, see main.references), the h-index (the largest h
+with h articles cited at least h times each), the i10-index (articles cited
+at least 10 times) and the citations received per year of the citing
+article. Author link and citation-graph changes recompute the row of just the
+authors they touch; rebuild_author_metrics recomputes every author at once
+with one sort of the (author, citations) pairs.
+"""
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import ExtractYear
+
+from .models import ArticleAuthor, Author, AuthorStats, CitationEdge
+
+I10_THRESHOLD = 10
+BATCH_SIZE = 1000
+
+
+def h_index(citation_counts):
+    ranked = sorted(citation_counts, reverse=True)
+    return sum(1 for rank, count in enumerate(ranked, 1) if count >= rank)
+
+
+def _citation_counts(author_ids=None):
+    """(author id, citation count) of every published article of the given authors"""
+    links = ArticleAuthor.objects.filter(article__is_published=True)
+    if author_ids is not None:
+        links = links.filter(author_id__in=author_ids)
+    return links.values_list('author_id', 'article__citation_count')
+
+
+def _citations_per_year(author_ids=None):
+    """{author id: [[year, citations], ...]} counted by the citing article's year"""
+    edges = CitationEdge.objects.filter(citing__is_published=True, cited__is_published=True)
+    if author_ids is not None:
+        edges = edges.filter(cited__articleauthor__author_id__in=author_ids)
+    rows = (edges.values(author=F('cited__articleauthor__author_id'), year=ExtractYear('citing__date_published'))
+            .annotate(citations=Count('id')).order_by('author', 'year'))
+    per_year = {}
+    for row in rows:
+        per_year.setdefault(row['author'], []).append([row['year'], row['citations']])
+    return per_year
+
+
+def _store(rows):
+    AuthorStats.objects.bulk_create(
+        rows,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['author'],
+        update_fields=['total_citations', 'h_index', 'i10_index', 'citations_per_year', 'updated_at'],
+    )
+
+
+def refresh_author_metrics(author_ids):
+    """Recompute the stats rows of the given authors"""
+    author_ids = {author_id for author_id in author_ids if author_id}
+    if not author_ids:
+        return
+    counts = {author_id: [] for author_id in author_ids}
+    for author_id, citations in _citation_counts(author_ids):
+        counts[author_id].append(citations)
+    per_year = _citations_per_year(author_ids)
+    _store([
+        AuthorStats(
+            author_id=author_id,
+            total_citations=sum(citations),
+            h_index=h_index(citations),
+            i10_index=sum(1 for count in citations if count >= I10_THRESHOLD),
+            citations_per_year=per_year.get(author_id, []),
+        )
+        for author_id, citations in counts.items()
+    ])
+
+
+def rebuild_author_metrics():
+    """Recompute every author's stats row; returns the number of authors"""
+    author_ids = np.array(list(Author.objects.order_by('id').values_list('id', flat=True)), dtype=np.int64)
+    pairs = np.array(list(_citation_counts()), dtype=np.int64).reshape(-1, 2)
+    positions = np.searchsorted(author_ids, pairs[:, 0])
+    citations = pairs[:, 1]
+
+    # Each author's articles by descending citations; rank = place within the author's run
+    order = np.lexsort((-citations, positions))
+    positions, citations = positions[order], citations[order]
+    starts = np.searchsorted(positions, np.arange(len(author_ids)))
+    ranks = np.arange(len(positions)) - starts[positions] + 1
+
+    size = len(author_ids)
+    total = np.bincount(positions, weights=citations, minlength=size).astype(np.int64)
+    h = np.bincount(positions, weights=citations >= ranks, minlength=size).astype(np.int64)
+    i10 = np.bincount(positions, weights=citations >= I10_THRESHOLD, minlength=size).astype(np.int64)
+
+    per_year = _citations_per_year()
+    with transaction.atomic():
+        _store([
+            AuthorStats(
+                author_id=int(author_id),
+                total_citations=int(total[position]),
+                h_index=int(h[position]),
+                i10_index=int(i10[position]),
+                citations_per_year=per_year.get(int(author_id), []),
+            )
+            for position, author_id in enumerate(author_ids)
+        ])
+    return size
@@ -0,0 +1,190 @@
+"""
+In-process prefix index for search-as-you-type.
+
+Every worker keeps a sorted list of folded keys (see main.transliteration)
+for published article titles, active author names, journal titles and used
+keywords - one key per word position, so "tosh" finds "Journal Toshkent" -
+next to the entry each key belongs to. A lookup is a bisect into that list
+and never touches the database.
+
+Signals append the (kind, ids) of changed records to a numbered change log
+in the shared cache (record_changes). Before answering, a worker compares
+the log's sequence number with the one it has applied and reloads just the
+listed records; when the log has gaps (evicted entries) or reaches back
+further than CHANGE_LOG_SIZE it rebuilds the whole index instead.
+"""
+import bisect
+import threading
+
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+
+from .models import Article, Author, Journal, Keyword
+from .transliteration import fold
+
+ARTICLE = 'article'
+AUTHOR = 'author'
+JOURNAL = 'journal'
+KEYWORD = 'keyword'
+
+SUGGESTION_LIMIT = 10
+# Matches ranked by weight per lookup; short prefixes stop here
+SCAN_LIMIT = 300
+KEY_WORDS = 12
+CHANGE_LOG_SIZE = 500
+# Larger change batches are cheaper to apply with a full rebuild
+APPLY_LIMIT = 200
+CHANGE_TIMEOUT = 60 * 60 * 24
+
+_SEQUENCE_KEY = 'autocomplete:sequence'
+
+
+def _change_key(sequence):
+    return f"autocomplete:change:{sequence}"
+
+
+def record_changes(kind, ids=None):
+    """Queue records of ``kind`` for reloading by every worker once the transaction commits (all of them when None)"""
+    ids = None if ids is None else sorted({object_id for object_id in ids if object_id})
+    if ids == []:
+        return
+
+    def append():
+        while True:
+            cache.add(_SEQUENCE_KEY, 0, None)
+            try:
+                sequence = cache.incr(_SEQUENCE_KEY)
+            except ValueError:
+                continue  # Evicted between add() and incr(); seed it again
+            # add() refuses a number another process took between incr() and add()
+            if cache.add(_change_key(sequence), (kind, ids), CHANGE_TIMEOUT):
+                return
+
+    transaction.on_commit(append)
+
+
+def _suffix_keys(text):
+    """Folded text from each of its first KEY_WORDS word positions"""
+    words = fold(text).split()
+    return [' '.join(words[start:]) for start in range(min(len(words), KEY_WORDS))]
+
+
+def _load(kind, ids=None):
+    """{(kind, id): (label, weight, target)} for the indexable records of ``kind``"""
+    def only(queryset, field='id'):
+        return queryset if ids is None else queryset.filter(**{f"{field}__in": ids})
+
+    if kind == ARTICLE:
+        rows = only(Article.objects.filter(is_published=True)).values_list('id', 'title', 'views', 'id')
+    elif kind == AUTHOR:
+        rows = [
+            (author_id, ' '.join(part for part in [first_name, middle_name, last_name] if part), count, author_id)
+            for author_id, first_name, middle_name, last_name, count in only(Author.objects.filter(is_active=True))
+            .values_list('id', 'first_name', 'middle_name', 'last_name', 'article_count')
+        ]
+    elif kind == JOURNAL:
+        rows = only(Journal.objects.filter(is_active=True)).values_list(
+            'id', 'title', 'published_article_count', 'url_slug'
+        )
+    else:
+        rows = only(Keyword.objects.filter(article_count__gt=0)).values_list('id', 'name', 'article_count', 'slug')
+    return {(kind, object_id): (label, weight or 0, target) for object_id, label, weight, target in rows}
+
+
+class PrefixIndex:
+    """Sorted folded keys with the entry each one points to"""
+
+    def __init__(self):
+        # (keys, refs, entries), replaced as a whole so lookups never see a half-applied change
+        self.table = ([], [], {})
+        self.sequence = None
+        self.lock = threading.Lock()
+
+    def build(self, sequence):
+        entries = {}
+        for kind in (ARTICLE, AUTHOR, JOURNAL, KEYWORD):
+            entries.update(_load(kind))
+        pairs = sorted((key, ref) for ref, (label, _, _) in entries.items() for key in _suffix_keys(label))
+        self.table = ([key for key, _ in pairs], [ref for _, ref in pairs], entries)
+        self.sequence = sequence
+
+    def apply(self, changes, sequence):
+        keys, refs, entries = self.table
+        keys, refs, entries = list(keys), list(refs), dict(entries)
+        for kind, ids in changes:
+            fresh = _load(kind, ids)
+            for ref in [(kind, object_id) for object_id in ids]:
+                if ref in entries:
+                    for key in _suffix_keys(entries.pop(ref)[0]):
+                        position = bisect.bisect_left(keys, key)
+                        while refs[position] != ref:
+                            position += 1
+                        del keys[position], refs[position]
+                if ref in fresh:
+                    entries[ref] = fresh[ref]
+                    for key in _suffix_keys(fresh[ref][0]):
+                        position = bisect.bisect_right(keys, key)
+                        keys.insert(position, key)
+                        refs.insert(position, ref)
+        self.table = (keys, refs, entries)
+        self.sequence = sequence
+
+    def refresh(self):
+        """Catch up with the shared change log"""
+        sequence = cache.get(_SEQUENCE_KEY, 0)
+        if sequence == self.sequence:
+            return
+        with self.lock:
+            if sequence == self.sequence:
+                return
+            if self.sequence is None or not self.sequence < sequence <= self.sequence + CHANGE_LOG_SIZE:
+                self.build(sequence)
+                return
+            pending = range(self.sequence + 1, sequence + 1)
+            found = cache.get_many([_change_key(number) for number in pending])
+            changes = [found.get(_change_key(number)) for number in pending]
+            if (None in changes or any(ids is None for _, ids in changes)
+                    or sum(len(ids) for _, ids in changes) > APPLY_LIMIT):
+                self.build(sequence)
+            else:
+                self.apply(changes, sequence)
+
+    def lookup(self, prefix, limit=SUGGESTION_LIMIT):
+        """Best-weighted distinct entries having a key that starts with ``prefix``"""
+        prefix = fold(prefix)
+        if not prefix:
+            return []
+        keys, refs, entries = self.table
+        found = {}
+        position = bisect.bisect_left(keys, prefix)
+        while position < len(keys) and len(found) < SCAN_LIMIT and keys[position].startswith(prefix):
+            found.setdefault(refs[position], entries[refs[position]])
+            position += 1
+        ranked = sorted(found.items(), key=lambda item: (-item[1][1], item[1][0]))[:limit]
+        return [(kind, object_id, label, target) for (kind, object_id), (label, _, target) in ranked]
+
+
+_index = PrefixIndex()
+
+
+def warm_up():
+    """Build the index in a worker process before its first request"""
+    _index.refresh()
+
+
+def suggest(query, limit=SUGGESTION_LIMIT):
+    """Autocomplete suggestions as {type, label, url} dicts"""
+    _index.refresh()
+    suggestions = []
+    for kind, object_id, label, target in _index.lookup(query, limit):
+        if kind == ARTICLE:
+            url = reverse('article_detail', kwargs={'article_id': target})
+        elif kind == AUTHOR:
+            url = reverse('author_detail', kwargs={'author_id': target})
+        elif kind == JOURNAL:
+            url = reverse('journal_detail', kwargs={'journal_slug': target})
+        else:
+            url = reverse('keyword_detail', kwargs={'slug': target})
+        suggestions.append({'type': kind, 'label': label, 'url': url})
+    return suggestions
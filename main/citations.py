@@ -0,0 +1,319 @@
+"""
+Citation engine.
+
+Every format is rendered from one plain-data bundle built off a prefetched
+article (journal, issue and ordered authors already loaded), and the results
+are stored in ArticleCitation so pages read a single row instead of walking
+the author list per format.
+"""
+import re
+
+from django.db.models import Prefetch
+from django.utils.text import slugify
+from lxml import etree
+
+from .crossref import article_resource_url
+from .models import Article, ArticleAuthor, ArticleCitation
+
+FORMATS = ('plain', 'apa', 'mla', 'chicago', 'bibtex', 'ris', 'jats')
+
+EXPORT_FORMATS = {
+    'bibtex': ('application/x-bibtex; charset=utf-8', 'bib'),
+    'ris': ('application/x-research-info-systems; charset=utf-8', 'ris'),
+}
+
+_BIBTEX_ESCAPES = str.maketrans({
+    '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_',
+    '{': r'\{', '}': r'\}',
+})
+
+
+def with_citation_data(queryset=None):
+    """Select everything the renderers need in two queries"""
+    queryset = Article.objects.all() if queryset is None else queryset
+    return queryset.select_related('issue__journal').prefetch_related(
+        Prefetch(
+            'articleauthor_set',
+            queryset=ArticleAuthor.objects.select_related('author').order_by('order'),
+            to_attr='ordered_authors'
+        )
+    )
+
+
+def build_bundle(article):
+    """Flatten an article into the plain data every renderer works from"""
+    article_authors = getattr(article, 'ordered_authors', None)
+    if article_authors is None:
+        article_authors = article.author_list.select_related('author')
+
+    issue = article.issue
+    return {
+        'id': article.id,
+        'title': article.title,
+        'subtitle': article.subtitle or '',
+        'year': article.date_published.year,
+        'date': article.date_published,
+        'journal': issue.journal.title if issue else '',
+        'volume': issue.volume if issue else None,
+        'number': issue.number if issue else None,
+        'first_page': article.first_page,
+        'last_page': article.last_page,
+        'page_range': article.page_range,
+        'doi': article.doi or '',
+        'url': article_resource_url(article),
+        'language': article.language,
+        'keywords': article.get_keywords_list(),
+        'authors': [
+            {
+                'first': aa.author.first_name,
+                'middle': aa.author.middle_name or '',
+                'last': aa.author.last_name,
+            }
+            for aa in article_authors
+        ],
+    }
+
+
+def _initials(author):
+    parts = [author['first'], author['middle']]
+    return ' '.join(f"{p[0]}." for p in parts if p)
+
+
+def _full(author):
+    return ' '.join(p for p in [author['first'], author['middle'], author['last']] if p)
+
+
+def _inverted(author):
+    given = ' '.join(p for p in [author['first'], author['middle']] if p)
+    return f"{author['last']}, {given}" if given else author['last']
+
+
+def render_plain(b):
+    authors = [f"{a['last']}, {_initials(a)}" for a in b['authors'][:6]]
+    if len(b['authors']) > 6:
+        authors.append("et al.")
+    author_string = ", ".join(authors)
+
+    if b['journal']:
+        journal_info = f"{b['journal']}, Vol.{b['volume']}, No.{b['number']} ({b['year']})"
+    else:
+        journal_info = "Unpublished"
+
+    page_info = f", pp. {b['page_range']}" if b['page_range'] else ""
+    doi_info = f". DOI: {b['doi']}" if b['doi'] else ""
+    return f"{author_string} ({b['year']}). {b['title']}. {journal_info}{page_info}{doi_info}"
+
+
+def render_apa(b):
+    authors = [f"{a['last']}, {_initials(a)}" for a in b['authors']]
+    if len(authors) > 1:
+        author_string = ", ".join(authors[:-1]) + f", & {authors[-1]}"
+    else:
+        author_string = authors[0] if authors else "Unknown Author"
+
+    journal_title = b['journal'] or "Unknown Journal"
+    volume_issue = f"{b['volume']}({b['number']})" if b['journal'] else ""
+    page_info = f", {b['page_range']}" if b['page_range'] else ""
+    doi_info = f" https://doi.org/{b['doi']}" if b['doi'] else ""
+    return f"{author_string} ({b['year']}). {b['title']}. {journal_title}, {volume_issue}{page_info}.{doi_info}"
+
+
+def render_mla(b):
+    authors = b['authors']
+    if not authors:
+        author_string = ""
+    elif len(authors) == 1:
+        author_string = f"{_inverted(authors[0])}. "
+    elif len(authors) == 2:
+        author_string = f"{_inverted(authors[0])}, and {_full(authors[1])}. "
+    else:
+        author_string = f"{_inverted(authors[0])}, et al. "
+
+    parts = []
+    if b['journal']:
+        parts.append(b['journal'])
+        parts.append(f"vol. {b['volume']}")
+        parts.append(f"no. {b['number']}")
+    parts.append(str(b['year']))
+    if b['page_range']:
+        parts.append(f"pp. {b['page_range']}")
+    doi_info = f" https://doi.org/{b['doi']}." if b['doi'] else ""
+    return f"{author_string}\"{b['title']}.\" {', '.join(parts)}.{doi_info}"
+
+
+def render_chicago(b):
+    authors = b['authors']
+    if not authors:
+        author_string = ""
+    elif len(authors) == 1:
+        author_string = f"{_inverted(authors[0])}. "
+    else:
+        names = [_inverted(authors[0])] + [_full(a) for a in authors[1:]]
+        author_string = ", ".join(names[:-1]) + f", and {names[-1]}. "
+
+    source = ""
+    if b['journal']:
+        source = f" {b['journal']} {b['volume']} ({b['number']})"
+        if b['page_range']:
+            source += f": {b['page_range']}"
+        source += "."
+    doi_info = f" https://doi.org/{b['doi']}." if b['doi'] else ""
+    return f"{author_string}{b['year']}. \"{b['title']}.\"{source}{doi_info}"
+
+
+def _bibtex_escape(value):
+    return str(value).translate(_BIBTEX_ESCAPES)
+
+
+def bibtex_key(b):
+    surname = slugify(b['authors'][0]['last']) if b['authors'] else 'anon'
+    first_word = next((w for w in re.findall(r'\w+', b['title'].lower()) if len(w) > 3), 'article')
+    return re.sub(r'[^a-z0-9]', '', f"{surname}{b['year']}{slugify(first_word)}") + str(b['id'])
+
+
+def render_bibtex(b):
+    fields = [
+        ('author', ' and '.join(_inverted(a) for a in b['authors'])),
+        ('title', f"{{{_bibtex_escape(b['title'])}}}"),
+        ('journal', b['journal']),
+        ('year', b['year']),
+        ('volume', b['volume']),
+        ('number', b['number']),
+        ('pages', b['page_range'].replace('-', '--') if b['page_range'] else ''),
+        ('doi', b['doi']),
+        ('url', b['url']),
+        ('keywords', ', '.join(b['keywords'])),
+        ('language', b['language']),
+    ]
+    lines = [f"@article{{{bibtex_key(b)},"]
+    for name, value in fields:
+        if value in (None, ''):
+            continue
+        if name != 'title':
+            value = _bibtex_escape(value)
+        lines.append(f"  {name} = {{{value}}},")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def render_ris(b):
+    lines = ["TY  - JOUR"]
+    lines += [f"AU  - {_inverted(a)}" for a in b['authors']]
+    lines.append(f"TI  - {b['title']}")
+    if b['journal']:
+        lines.append(f"T2  - {b['journal']}")
+        lines.append(f"VL  - {b['volume']}")
+        lines.append(f"IS  - {b['number']}")
+    lines.append(f"PY  - {b['year']}")
+    lines.append(f"DA  - {b['date'].strftime('%Y/%m/%d')}")
+    if b['first_page']:
+        lines.append(f"SP  - {b['first_page']}")
+    if b['last_page']:
+        lines.append(f"EP  - {b['last_page']}")
+    if b['doi']:
+        lines.append(f"DO  - {b['doi']}")
+    if b['url']:
+        lines.append(f"UR  - {b['url']}")
+    lines += [f"KW  - {k}" for k in b['keywords'] if k]
+    lines.append(f"LA  - {b['language']}")
+    lines.append("ER  - ")
+    return "\n".join(lines)
+
+
+def _sub(parent, tag, text=None, **attrib):
+    el = etree.SubElement(parent, tag, {k.replace('_', '-'): v for k, v in attrib.items()})
+    if text not in (None, ''):
+        el.text = str(text)
+    return el
+
+
+def render_jats(b):
+    root = etree.Element('element-citation', {'publication-type': 'journal'})
+    if b['authors']:
+        group = _sub(root, 'person-group', person_group_type='author')
+        for a in b['authors']:
+            name = _sub(group, 'name')
+            _sub(name, 'surname', a['last'])
+            _sub(name, 'given-names', ' '.join(p for p in [a['first'], a['middle']] if p))
+    _sub(root, 'article-title', b['title'])
+    if b['journal']:
+        _sub(root, 'source', b['journal'])
+    _sub(root, 'year', b['year'])
+    if b['journal']:
+        _sub(root, 'volume', b['volume'])
+        _sub(root, 'issue', b['number'])
+    if b['first_page']:
+        _sub(root, 'fpage', b['first_page'])
+    if b['last_page']:
+        _sub(root, 'lpage', b['last_page'])
+    if b['doi']:
+        _sub(root, 'pub-id', b['doi'], pub_id_type='doi')
+    return etree.tostring(root, encoding='unicode')
+
+
+RENDERERS = {
+    'plain': render_plain,
+    'apa': render_apa,
+    'mla': render_mla,
+    'chicago': render_chicago,
+    'bibtex': render_bibtex,
+    'ris': render_ris,
+    'jats': render_jats,
+}
+
+
+def render_all(bundle):
+    return {fmt: RENDERERS[fmt](bundle) for fmt in FORMATS}
+
+
+def refresh_citations(article_ids):
+    """Re-render and store citations for the given articles in one batch"""
+    articles = with_citation_data(Article.objects.filter(id__in=list(article_ids)))
+    rows = [ArticleCitation(article_id=article.id, **render_all(build_bundle(article))) for article in articles]
+    if rows:
+        ArticleCitation.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['article'],
+            update_fields=list(FORMATS) + ['rendered_at'],
+            batch_size=500,
+        )
+    return {row.article_id: {fmt: getattr(row, fmt) for fmt in FORMATS} for row in rows}
+
+
+def invalidate_citations(article_ids):
+    """Drop stored renderings; they are rebuilt lazily on next read"""
+    ArticleCitation.objects.filter(article_id__in=article_ids).delete()
+
+
+def citations_for(article_ids):
+    """Stored citations for many articles, rendering any missing ones in one batch"""
+    article_ids = list(article_ids)
+    result = {
+        row['article_id']: row
+        for row in ArticleCitation.objects.filter(article_id__in=article_ids).values('article_id', *FORMATS)
+    }
+    missing = [article_id for article_id in article_ids if article_id not in result]
+    if missing:
+        result.update(refresh_citations(missing))
+    return result
+
+
+def get_citations(article):
+    """Stored citations for one article, memoized on the instance"""
+    citations = getattr(article, '_citations', None)
+    if citations is None:
+        try:
+            row = article.rendered_citation
+            citations = {fmt: getattr(row, fmt) for fmt in FORMATS}
+        except ArticleCitation.DoesNotExist:
+            citations = refresh_citations([article.id]).get(article.id) or render_all(build_bundle(article))
+        article._citations = citations
+    return citations
+
+
+def export_citations(article_ids, fmt):
+    """Join stored citations of one export format in the given article order"""
+    citations = citations_for(article_ids)
+    separator = "\n\n" if fmt == 'bibtex' else "\n"
+    return separator.join(citations[article_id][fmt] for article_id in article_ids if article_id in citations) + "\n"
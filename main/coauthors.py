@@ -0,0 +1,111 @@
+"""
+Co-authorship graph.
+
+CoAuthorship holds, for every pair of authors who share a published
+article, how many they share and the latest year, in both directions, so an
+author's collaborators are one indexed range read. Signals recompute the
+pairs of just the authors whose article links change, which covers
+ArticleAuthor writes and article publish/date changes;
+rebuild_coauthorships backfills everything with one grouped self-join.
+
+The whole graph is also served as JSON for visualization, built once per
+site content version by a single worker.
+"""
+import json
+import zlib
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+from django.db.models.functions import ExtractYear
+
+from .models import ArticleAuthor, Author, CoAuthorship
+from .page_cache import SITE_SCOPE, current_versions
+from .singleflight import single_flight
+
+TOP_COLLABORATORS = 8
+GRAPH_KEY = 'coauthors:graph'
+GRAPH_TIMEOUT = 60 * 60 * 6
+BATCH_SIZE = 1000
+
+
+def _pairs(author_ids=None):
+    """{(author, coauthor): (papers, last year)} over published articles"""
+    links = ArticleAuthor.objects.filter(article__is_published=True)
+    if author_ids is not None:
+        links = links.filter(author_id__in=author_ids)
+    rows = (links.values('author_id', coauthor=F('article__articleauthor__author_id'))
+            .exclude(coauthor=F('author_id'))
+            .annotate(papers=Count('article_id', distinct=True),
+                      last_year=Max(ExtractYear('article__date_published')))
+            .order_by())
+    pairs = {}
+    for row in rows:
+        value = (row['papers'], row['last_year'])
+        pairs[row['author_id'], row['coauthor']] = value
+        pairs[row['coauthor'], row['author_id']] = value
+    return pairs
+
+
+def _rows(pairs):
+    return [
+        CoAuthorship(author_id=author_id, coauthor_id=coauthor_id, paper_count=papers, last_year=last_year)
+        for (author_id, coauthor_id), (papers, last_year) in pairs.items()
+    ]
+
+
+def refresh_coauthorships(author_ids):
+    """Recompute every pair involving the given authors"""
+    author_ids = {author_id for author_id in author_ids if author_id}
+    if not author_ids:
+        return
+    pairs = _pairs(author_ids)
+    with transaction.atomic():
+        CoAuthorship.objects.filter(Q(author_id__in=author_ids) | Q(coauthor_id__in=author_ids)).delete()
+        CoAuthorship.objects.bulk_create(_rows(pairs), batch_size=BATCH_SIZE)
+
+
+def rebuild_coauthorships():
+    """Recompute the whole table; returns the number of collaborating pairs"""
+    pairs = _pairs()
+    with transaction.atomic():
+        CoAuthorship.objects.all().delete()
+        CoAuthorship.objects.bulk_create(_rows(pairs), batch_size=BATCH_SIZE)
+    return len(pairs) // 2
+
+
+def top_collaborators(author_id, limit=TOP_COLLABORATORS):
+    return (CoAuthorship.objects.filter(author_id=author_id, coauthor__is_active=True)
+            .select_related('coauthor').order_by('-paper_count', '-last_year')[:limit])
+
+
+def build_graph():
+    """{nodes, links} of every active author with a collaborator"""
+    links = [
+        {'source': author_id, 'target': coauthor_id, 'papers': papers, 'last_year': last_year}
+        for author_id, coauthor_id, papers, last_year in (
+            CoAuthorship.objects.filter(author_id__lt=F('coauthor_id'), author__is_active=True, coauthor__is_active=True)
+            .order_by('author_id', 'coauthor_id')
+            .values_list('author_id', 'coauthor_id', 'paper_count', 'last_year')
+        )
+    ]
+    ids = {link['source'] for link in links} | {link['target'] for link in links}
+    nodes = [
+        {'id': author_id, 'name': ' '.join(part for part in [first_name, middle_name, last_name] if part),
+         'articles': article_count}
+        for author_id, first_name, middle_name, last_name, article_count in (
+            Author.objects.filter(id__in=ids).order_by('id')
+            .values_list('id', 'first_name', 'middle_name', 'last_name', 'article_count')
+        )
+    ]
+    return {'nodes': nodes, 'links': links}
+
+
+def graph_json():
+    """The graph as JSON bytes, rebuilt by a single worker after content changes"""
+    blob = single_flight(
+        GRAPH_KEY,
+        lambda: zlib.compress(json.dumps(build_graph(), separators=(',', ':')).encode()),
+        GRAPH_TIMEOUT,
+        version=current_versions([SITE_SCOPE])[SITE_SCOPE],
+    )
+    return zlib.decompress(blob)
@@ -8,3 +8,9 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 SITE_DOMAIN = os.getenv("SITE_DOMAIN")
+
+# Crossref DOI deposit
+CROSSREF_DOI_PREFIX = os.getenv("CROSSREF_DOI_PREFIX")
+CROSSREF_DEPOSITOR_NAME = os.getenv("CROSSREF_DEPOSITOR_NAME", "Imfaktor")
+CROSSREF_DEPOSITOR_EMAIL = os.getenv("CROSSREF_DEPOSITOR_EMAIL")
+CROSSREF_REGISTRANT = os.getenv("CROSSREF_REGISTRANT", "Imfaktor")
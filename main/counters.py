@@ -0,0 +1,117 @@
+"""
+Denormalized publication counters.
+
+Issue.article_count, the Journal published_* / *_year fields and the Author
+statistics are recomputed with one correlated UPDATE per table for just the
+touched rows, inside the caller's transaction, so list pages can read them
+straight off the table. View and download totals (on authors and article
+summaries) are bumped incrementally.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, ExtractYear
+
+from .models import Article, ArticleAuthor, ArticleSummary, Author, Issue, Journal
+
+
+def _issue_article_count():
+    return Coalesce(Subquery(
+        Article.objects.filter(issue=OuterRef('pk'), is_published=True)
+        .order_by().values('issue').annotate(n=Count('id')).values('n')
+    ), 0)
+
+
+def _published_issues(aggregate):
+    return Subquery(
+        Issue.objects.filter(journal=OuterRef('pk'), is_published=True)
+        .order_by().values('journal').annotate(value=aggregate).values('value')
+    )
+
+
+def refresh_issue_counts(issue_ids=None):
+    issues = Issue.objects.all() if issue_ids is None else Issue.objects.filter(id__in=issue_ids)
+    issues.update(article_count=_issue_article_count())
+
+
+def refresh_journal_counts(journal_ids=None):
+    journals = Journal.objects.all() if journal_ids is None else Journal.objects.filter(id__in=journal_ids)
+    journals.update(
+        published_issue_count=Coalesce(_published_issues(Count('id')), 0),
+        published_article_count=Coalesce(_published_issues(Sum('article_count')), 0),
+        first_year=_published_issues(Min('year')),
+        latest_year=_published_issues(Max('year')),
+    )
+
+
+def _author_articles(aggregate):
+    return Subquery(
+        Article.objects.filter(articleauthor__author=OuterRef('pk'), is_published=True)
+        .order_by().values('articleauthor__author').annotate(value=aggregate).values('value')
+    )
+
+
+def refresh_author_counts(author_ids=None):
+    authors = Author.objects.all() if author_ids is None else Author.objects.filter(id__in=author_ids)
+    authors.update(
+        article_count=Coalesce(_author_articles(Count('id')), 0),
+        total_views=Coalesce(_author_articles(Sum('views')), 0),
+        total_downloads=Coalesce(_author_articles(Sum('downloads')), 0),
+        first_year=_author_articles(Min(ExtractYear('date_published'))),
+        last_year=_author_articles(Max(ExtractYear('date_published'))),
+    )
+
+
+def add_view_totals(article_ids, views=0, downloads=0):
+    """Add view/download deltas of each of the given articles to its summary and its authors' totals"""
+    article_ids = list(article_ids)
+    ArticleSummary.objects.filter(article_id__in=article_ids).update(
+        views=F('views') + views,
+        downloads=F('downloads') + downloads,
+    )
+    # An author of several of the articles gets the deltas once per article
+    links = Subquery(
+        ArticleAuthor.objects.filter(author=OuterRef('pk'), article_id__in=article_ids)
+        .order_by().values('author').annotate(n=Count('id')).values('n')
+    )
+    Author.objects.filter(articleauthor__article_id__in=article_ids).update(
+        total_views=F('total_views') + views * links,
+        total_downloads=F('total_downloads') + downloads * links,
+    )
+
+
+def refresh_counts(issue_ids=(), journal_ids=(), author_ids=()):
+    """Recompute counters for the given issues and their journals (plus any extra journals and authors)"""
+    issue_ids = {issue_id for issue_id in issue_ids if issue_id}
+    journal_ids = {journal_id for journal_id in journal_ids if journal_id}
+    author_ids = {author_id for author_id in author_ids if author_id}
+    with transaction.atomic():
+        if issue_ids:
+            refresh_issue_counts(issue_ids)
+            journal_ids.update(Issue.objects.filter(id__in=issue_ids).values_list('journal_id', flat=True))
+        if journal_ids:
+            refresh_journal_counts(journal_ids)
+        if author_ids:
+            refresh_author_counts(author_ids)
+
+
+def _snapshot(model, fields):
+    return {row[0]: row[1:] for row in model.objects.values_list('id', *fields)}
+
+
+def reconcile_counts():
+    """Recompute every counter; returns how many issues, journals and authors were out of date"""
+    tables = [
+        (Issue, ['article_count'], refresh_issue_counts),
+        (Journal, ['published_issue_count', 'published_article_count', 'first_year', 'latest_year'],
+         refresh_journal_counts),
+        (Author, ['article_count', 'total_views', 'total_downloads', 'first_year', 'last_year'],
+         refresh_author_counts),
+    ]
+    fixed = []
+    with transaction.atomic():
+        for model, fields, refresh in tables:
+            before = _snapshot(model, fields)
+            refresh()
+            after = _snapshot(model, fields)
+            fixed.append(sum(1 for pk, values in after.items() if before.get(pk) != values))
+    return tuple(fixed)
@@ -0,0 +1,118 @@
+"""
+Facet counts for filtered article browsing.
+
+ArticleFacetCount holds the number of published articles for every
+(journal, year, language, open access, featured) combination that occurs -
+a few hundred rows even for a large archive. Counts for any filter state
+come from one read of that table: each facet is summed over the rows that
+match all the *other* active filters, so every option shows how many
+results choosing it would give. After an edit only the (journal, year)
+cells it touched are recounted from ArticleSummary.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractYear
+
+from .models import ArticleFacetCount, ArticleSummary, Journal
+
+FACETS = ('journal', 'year', 'language', 'open_access', 'featured')
+
+LANGUAGE_LABELS = {
+    'uz': "O'zbekcha",
+    'ru': 'Ruscha',
+    'en': 'Inglizcha',
+}
+
+
+def _published_summaries():
+    return ArticleSummary.objects.filter(is_published=True).annotate(year=ExtractYear('date_published'))
+
+
+def facet_cells(article_ids):
+    """(journal_id, year) cells the given articles are currently counted in"""
+    return set(
+        ArticleSummary.objects.filter(article_id__in=list(article_ids))
+        .annotate(year=ExtractYear('date_published'))
+        .values_list('journal_id', 'year').distinct()
+    )
+
+
+def _cells_q(cells, journal_field):
+    condition = Q(pk__in=[])
+    for journal_id, year in cells:
+        journal = Q(**{f"{journal_field}__isnull": True}) if journal_id is None else Q(**{journal_field: journal_id})
+        condition |= journal & Q(year=year)
+    return condition
+
+
+def refresh_facets(cells=None):
+    """Recount the given (journal_id, year) cells from the summaries (everything when None)"""
+    if cells is not None and not cells:
+        return
+    stored = ArticleFacetCount.objects.all()
+    source = _published_summaries()
+    if cells is not None:
+        stored = stored.filter(_cells_q(cells, 'journal_id'))
+        source = source.filter(_cells_q(cells, 'journal_id'))
+    rows = (source.order_by()
+            .values('journal_id', 'year', 'language', 'open_access', 'featured')
+            .annotate(count=Count('article_id')))
+    with transaction.atomic():
+        stored.delete()
+        ArticleFacetCount.objects.bulk_create([ArticleFacetCount(**row) for row in rows])
+
+
+def _facet_rows(queryset):
+    """(journal_id, journal_title, year, language, open_access, featured, count) tuples"""
+    if queryset is None:
+        return ArticleFacetCount.objects.values_list(
+            'journal_id', 'journal__title', 'year', 'language', 'open_access', 'featured', 'count'
+        )
+    return (queryset.filter(is_published=True).order_by()
+            .annotate(year=ExtractYear('date_published'))
+            .values('journal_id', 'journal_title', 'year', 'language', 'open_access', 'featured')
+            .annotate(count=Count('article_id'))
+            .values_list('journal_id', 'journal_title', 'year', 'language', 'open_access', 'featured', 'count'))
+
+
+def article_facets(selected, queryset=None):
+    """
+    Facet counts for the filter state ``selected`` ({facet: value}, empty
+    values ignored). Counts come from the facet table, or are grouped from
+    ``queryset`` (summaries matching a text search) when one is given.
+    """
+    active = {facet: value for facet, value in selected.items() if value not in (None, '')}
+    counts = {facet: Counter() for facet in FACETS}
+    journal_titles = {}
+    total = 0
+
+    for journal_id, journal_title, *values, count in _facet_rows(queryset):
+        values = dict(zip(FACETS, [journal_id] + values))
+        journal_titles[journal_id] = journal_title
+        misses = [facet for facet, value in active.items() if values[facet] != value]
+        if not misses:
+            total += count
+            for facet in FACETS:
+                counts[facet][values[facet]] += count
+        elif len(misses) == 1:
+            counts[misses[0]][values[misses[0]]] += count
+
+    # Inactive journals are not offered as an option (their articles still count)
+    active_journals = set(Journal.objects.filter(id__in=[journal_id for journal_id in journal_titles if journal_id],
+                                                 is_active=True).values_list('id', flat=True))
+    return {
+        'total': total,
+        'journals': sorted(
+            ({'id': journal_id, 'title': journal_titles[journal_id], 'count': count}
+             for journal_id, count in counts['journal'].items() if journal_id in active_journals and count),
+            key=lambda item: item['title']
+        ),
+        'years': [{'year': year, 'count': count}
+                  for year, count in sorted(counts['year'].items(), reverse=True) if count],
+        'languages': [{'code': code, 'label': LANGUAGE_LABELS.get(code, code), 'count': count}
+                      for code, count in counts['language'].most_common() if count],
+        'open_access': counts['open_access'][True],
+        'featured': counts['featured'][True],
+    }
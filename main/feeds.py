@@ -0,0 +1,171 @@
+"""
+Atom/RSS feeds of newly published articles per journal and per issue.
+
+Feeds are built from narrow values() queries and cached under a per-journal
+publish stamp. Signals bump the stamp whenever anything in the journal
+changes; it doubles as ETag/Last-Modified, so most polls end in a 304
+without touching the database.
+"""
+import hashlib
+import time
+from datetime import datetime, time as dt_time, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.views.decorators.http import condition
+
+from .config import SITE_DOMAIN
+from .models import Article, ArticleAuthor, Issue, Journal
+
+FEED_SIZE = 50
+FEED_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+
+FEED_GENERATORS = {
+    'atom': Atom1Feed,
+    'rss': Rss201rev2Feed,
+}
+
+
+def _stamp_key(journal_slug):
+    return f"feeds:stamp:{journal_slug}"
+
+
+def feed_stamp(journal_slug):
+    """Unix time of the journal's last publish event"""
+    stamp = cache.get(_stamp_key(journal_slug))
+    if stamp is None:
+        if not Journal.objects.filter(url_slug=journal_slug, is_active=True).exists():
+            # Never store stamps for slugs nobody can publish to; the view answers 404
+            return 0
+        # Unknown after a cache flush: start a new epoch so clients refetch once
+        cache.add(_stamp_key(journal_slug), int(time.time()), FEED_CACHE_TIMEOUT)
+        stamp = cache.get(_stamp_key(journal_slug), int(time.time()))
+    return stamp
+
+
+def bump_feed_stamps(journal_slugs):
+    """Mark the journals' feeds stale; always moves the stamp forward by at least a second"""
+    now = int(time.time())
+    keys = [_stamp_key(slug) for slug in set(journal_slugs) if slug]
+    if not keys:
+        return
+    current = cache.get_many(keys)
+    cache.set_many({key: max(now, current.get(key, 0) + 1) for key in keys}, FEED_CACHE_TIMEOUT)
+
+
+def _feed_etag(request, journal_slug, fmt, **issue):
+    parts = [journal_slug, fmt, *(str(issue[k]) for k in sorted(issue)), str(feed_stamp(journal_slug))]
+    return hashlib.md5(':'.join(parts).encode()).hexdigest()
+
+
+def _feed_last_modified(request, journal_slug, **kwargs):
+    return datetime.fromtimestamp(feed_stamp(journal_slug), tz=dt_timezone.utc)
+
+
+def _absolute(request, path):
+    if SITE_DOMAIN:
+        return f"{SITE_DOMAIN.rstrip('/')}{path}"
+    return request.build_absolute_uri(path)
+
+
+def _author_names(article_ids):
+    names = {}
+    rows = (ArticleAuthor.objects.filter(article_id__in=article_ids)
+            .order_by('article_id', 'order')
+            .values_list('article_id', 'author__first_name', 'author__last_name'))
+    for article_id, first_name, last_name in rows:
+        names.setdefault(article_id, []).append(f"{first_name} {last_name}")
+    return names
+
+
+def build_feed(request, fmt, journal, issue=None):
+    """Render a feed document for a journal (or one of its issues)"""
+    articles = Article.objects.filter(is_published=True, issue__is_published=True)
+    if issue:
+        articles = articles.filter(issue_id=issue['id'])
+        link = reverse('issue_detail', kwargs={
+            'journal_slug': journal['url_slug'], 'year': issue['year'],
+            'volume': issue['volume'], 'number': issue['number'],
+        })
+        title = f"{journal['title']} - Vol.{issue['volume']}, No.{issue['number']} ({issue['year']})"
+        feed_path = reverse('issue_feed', kwargs={
+            'journal_slug': journal['url_slug'], 'year': issue['year'],
+            'volume': issue['volume'], 'number': issue['number'], 'fmt': fmt,
+        })
+    else:
+        articles = articles.filter(issue__journal_id=journal['id'])
+        link = reverse('journal_detail', kwargs={'journal_slug': journal['url_slug']})
+        title = journal['title']
+        feed_path = reverse('journal_feed', kwargs={'journal_slug': journal['url_slug'], 'fmt': fmt})
+
+    rows = list(articles.order_by('-date_published', '-id').values(
+        'id', 'title', 'abstract', 'date_published', 'updated_at', 'doi', 'keywords',
+        'issue__volume', 'issue__number', 'issue__year',
+    )[:FEED_SIZE])
+    authors = _author_names([row['id'] for row in rows])
+
+    feed = FEED_GENERATORS[fmt](
+        title=title,
+        link=_absolute(request, link),
+        description=journal['meta_description'] or journal['title'],
+        language=journal['primary_locale'],
+        feed_url=_absolute(request, feed_path),
+        feed_guid=_absolute(request, feed_path),
+    )
+    for row in rows:
+        url = _absolute(request, reverse('article_detail', kwargs={'article_id': row['id']}))
+        names = authors.get(row['id'], [])
+        feed.add_item(
+            title=row['title'],
+            link=url,
+            description=row['abstract'],
+            unique_id=url,
+            unique_id_is_permalink=True,
+            author_name=', '.join(names) or None,
+            pubdate=datetime.combine(row['date_published'], dt_time.min, tzinfo=dt_timezone.utc),
+            updateddate=row['updated_at'],
+            categories=[k.strip() for k in (row['keywords'] or '').split(',') if k.strip()],
+            comments=f"https://doi.org/{row['doi']}" if row['doi'] else None,
+        )
+    return feed.writeString('utf-8'), feed.content_type
+
+
+def _cached_feed(request, fmt, journal_slug, issue_key=None):
+    if fmt not in FEED_GENERATORS:
+        raise Http404("Noma'lum format")
+
+    scope = '-'.join(str(part) for part in issue_key) if issue_key else 'all'
+    cache_key = f"feeds:{journal_slug}:{scope}:{fmt}:{feed_stamp(journal_slug)}"
+    cached = cache.get(cache_key)
+    if cached is None:
+        journal = (Journal.objects.filter(url_slug=journal_slug, is_active=True)
+                   .values('id', 'title', 'url_slug', 'meta_description', 'primary_locale').first())
+        if not journal:
+            raise Http404("Jurnal topilmadi")
+        issue = None
+        if issue_key:
+            year, volume, number = issue_key
+            issue = (Issue.objects.filter(journal_id=journal['id'], year=year, volume=volume,
+                                          number=number, is_published=True)
+                     .values('id', 'year', 'volume', 'number').first())
+            if not issue:
+                raise Http404("Son topilmadi")
+        cached = build_feed(request, fmt, journal, issue)
+        cache.set(cache_key, cached, FEED_CACHE_TIMEOUT)
+
+    content, content_type = cached
+    return HttpResponse(content, content_type=content_type)
+
+
+@condition(etag_func=_feed_etag, last_modified_func=_feed_last_modified)
+def journal_feed(request, journal_slug, fmt):
+    """Latest published articles of a journal as Atom or RSS"""
+    return _cached_feed(request, fmt, journal_slug)
+
+
+@condition(etag_func=_feed_etag, last_modified_func=_feed_last_modified)
+def issue_feed(request, journal_slug, year, volume, number, fmt):
+    """Articles of one published issue as Atom or RSS"""
+    return _cached_feed(request, fmt, journal_slug, (year, volume, number))
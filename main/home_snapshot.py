@@ -0,0 +1,94 @@
+"""
+Home page snapshot.
+
+Everything the home page shows is gathered in one batch of queries and
+stored as a compressed JSON blob under the site content version, so the
+view itself is a cache read plus a template render.
+"""
+import json
+import zlib
+
+from django.db.models import F
+
+from .models import Article, ArticleAuthor, Author, Journal
+from .page_cache import SITE_SCOPE, current_versions
+from .singleflight import single_flight
+
+HOME_SNAPSHOT_KEY = 'home:snapshot'
+HOME_SNAPSHOT_TIMEOUT = 60 * 60 * 6
+RECENT_ARTICLES = 6
+HOME_JOURNALS = 6
+
+
+def _full_name(first_name, middle_name, last_name):
+    return ' '.join(part for part in [first_name, middle_name, last_name] if part)
+
+
+def build_home_snapshot():
+    """Collect the home page data in four queries"""
+    journals = list(Journal.objects.filter(is_active=True).annotate(
+        issues_count=F('published_issue_count'),
+        articles_count=F('published_article_count'),
+    ).order_by('-created_at').values(
+        'id', 'title', 'url_slug', 'initials', 'issues_count', 'articles_count', 'latest_year'
+    ))
+
+    articles = list(Article.objects.filter(is_published=True).order_by('-date_published').values(
+        'id', 'title', 'date_published', 'first_page', 'last_page',
+        'issue_id', 'issue__volume', 'issue__number', 'issue__journal__title',
+    )[:RECENT_ARTICLES])
+
+    authors = {}
+    for row in (ArticleAuthor.objects.filter(article_id__in=[a['id'] for a in articles])
+                .order_by('article_id', 'order')
+                .values('article_id', 'author__first_name', 'author__middle_name', 'author__last_name')):
+        authors.setdefault(row['article_id'], []).append(
+            _full_name(row['author__first_name'], row['author__middle_name'], row['author__last_name'])
+        )
+
+    recent_articles = []
+    for row in articles:
+        names = authors.get(row['id'], [])
+        recent_articles.append({
+            'article': {
+                'id': row['id'],
+                'title': row['title'],
+                'year': row['date_published'].year,
+                'first_page': row['first_page'],
+                'last_page': row['last_page'],
+                'issue': {
+                    'volume': row['issue__volume'],
+                    'number': row['issue__number'],
+                    'journal': {'title': row['issue__journal__title']},
+                } if row['issue_id'] else None,
+            },
+            'first_author': {'full_name': names[0]} if names else None,
+            'author_count': len(names),
+        })
+
+    return {
+        'latest_journals': journals[:HOME_JOURNALS],
+        'trending_journals': sorted(journals, key=lambda j: -j['issues_count'])[:HOME_JOURNALS],
+        'journal_stats': {
+            'total_journals': len(journals),
+            'total_issues': sum(j['issues_count'] for j in journals),
+            'total_articles': sum(j['articles_count'] for j in journals),
+            'total_authors': Author.objects.filter(is_active=True).count(),
+        },
+        'recent_articles': recent_articles,
+    }
+
+
+def _serialize(snapshot):
+    return zlib.compress(json.dumps(snapshot, separators=(',', ':')).encode())
+
+
+def get_home_snapshot():
+    """Current snapshot; rebuilt by a single worker after content changes"""
+    blob = single_flight(
+        HOME_SNAPSHOT_KEY,
+        lambda: _serialize(build_home_snapshot()),
+        HOME_SNAPSHOT_TIMEOUT,
+        version=current_versions([SITE_SCOPE])[SITE_SCOPE],
+    )
+    return json.loads(zlib.decompress(blob))
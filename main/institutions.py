@@ -0,0 +1,157 @@
+"""
+Normalized institutions.
+
+Author.affiliation and JournalEditor.affiliation stay free text. Each save
+matches the text to an Institution through its script-folded key (see
+main.transliteration), so "Ўзбекистон Миллий университети" and
+"O'zbekiston milliy universiteti." land on the same row. Keys with no exact
+match are compared against the institutions sharing their first characters
+and joined to a near-identical one (typos, a missing word ending) before a
+new row is created; numbers must agree exactly, so "110-son maktab" never
+joins "115-son maktab". Institution counters are recomputed for the touched
+rows only.
+"""
+import re
+from difflib import SequenceMatcher
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.text import slugify
+
+from .models import Article, Author, Institution, JournalEditor
+from .transliteration import fold
+
+# Keys sharing this many leading characters are compared for near matches
+PREFIX_LENGTH = 6
+MATCH_RATIO = 0.94
+BATCH_SIZE = 500
+
+_NUMBER = re.compile(r'\d+')
+
+
+def institution_key(affiliation):
+    return fold(affiliation)[:500]
+
+
+def _similar(key, candidates):
+    """The candidate institution whose key is nearly identical to ``key`` (and has the same numbers), if any"""
+    numbers = _NUMBER.findall(key)
+    best, best_ratio = None, MATCH_RATIO
+    for institution in candidates:
+        if _NUMBER.findall(institution.key) != numbers:
+            continue
+        matcher = SequenceMatcher(None, key, institution.key)
+        if matcher.real_quick_ratio() >= best_ratio and matcher.quick_ratio() >= best_ratio:
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = institution, ratio
+    return best
+
+
+def get_institutions(affiliations):
+    """Institution rows for raw affiliation strings, creating the missing ones; keyed by matching key"""
+    names = {}
+    for affiliation in affiliations:
+        key = institution_key(affiliation)
+        if key:
+            names.setdefault(key, ' '.join(affiliation.split())[:500])
+    found = {institution.key: institution for institution in Institution.objects.filter(key__in=list(names))}
+
+    buckets, created = {}, []
+    for key in sorted(key for key in names if key not in found):
+        prefix = key[:PREFIX_LENGTH]
+        if prefix not in buckets:
+            buckets[prefix] = list(Institution.objects.filter(key__startswith=prefix))
+        institution = _similar(key, buckets[prefix])
+        if institution is None:
+            institution = Institution(name=names[key], key=key)
+            buckets[prefix].append(institution)
+            created.append(institution)
+        found[key] = institution
+
+    if created:
+        _assign_slugs(created)
+        Institution.objects.bulk_create(created)
+    return found
+
+
+def _assign_slugs(institutions):
+    bases = [(institution, slugify(institution.key)[:240] or 'tashkilot') for institution in institutions]
+    taken = set(Institution.objects.filter(slug__in={base for _, base in bases}).values_list('slug', flat=True))
+    for institution, base in bases:
+        slug, suffix = base, 2
+        while slug in taken or (slug != base and Institution.objects.filter(slug=slug).exists()):
+            slug, suffix = f"{base}-{suffix}", suffix + 1
+        taken.add(slug)
+        institution.slug = slug
+
+
+def match_institution(affiliation):
+    """The Institution for one affiliation string (created if new), or None for a blank one"""
+    return get_institutions([affiliation or '']).get(institution_key(affiliation))
+
+
+def assign_institution(member):
+    """
+    Point an author or editor at the institution matching its affiliation;
+    returns the ids of the institutions it left and joined.
+    """
+    institution = match_institution(member.affiliation)
+    institution_id = institution.id if institution else None
+    previous_id = member.institution_id
+    if institution_id != previous_id:
+        type(member).objects.filter(pk=member.pk).update(institution_id=institution_id)
+        member.institution_id = institution_id
+    return {previous_id, institution_id} - {None}
+
+
+def _member_count(model):
+    return Coalesce(Subquery(
+        model.objects.filter(institution=OuterRef('pk'), is_active=True)
+        .order_by().values('institution').annotate(n=Count('id')).values('n')
+    ), 0)
+
+
+def refresh_institution_counts(institution_ids=None):
+    """Recount active authors, editors and published articles; drop institutions nobody refers to"""
+    if institution_ids is not None:
+        institution_ids = {institution_id for institution_id in institution_ids if institution_id}
+        if not institution_ids:
+            return
+    institutions = (Institution.objects.all() if institution_ids is None
+                    else Institution.objects.filter(id__in=institution_ids))
+    institutions.update(
+        author_count=_member_count(Author),
+        editor_count=_member_count(JournalEditor),
+        article_count=Coalesce(Subquery(
+            Article.objects.filter(articleauthor__author__institution=OuterRef('pk'), is_published=True)
+            .order_by().values('articleauthor__author__institution')
+            .annotate(n=Count('id', distinct=True)).values('n')
+        ), 0),
+    )
+    institutions.filter(authors__isnull=True, editors__isnull=True).delete()
+
+
+def _link_members(model):
+    """Match every row of ``model`` to its institution; returns how many are linked"""
+    ids = list(model.objects.order_by('id').values_list('id', flat=True))
+    linked = 0
+    for start in range(0, len(ids), BATCH_SIZE):
+        members = list(model.objects.filter(id__in=ids[start:start + BATCH_SIZE]).only('id', 'affiliation', 'institution'))
+        institutions = get_institutions(member.affiliation or '' for member in members)
+        for member in members:
+            institution = institutions.get(institution_key(member.affiliation))
+            member.institution_id = institution.id if institution else None
+            linked += institution is not None
+        model.objects.bulk_update(members, ['institution'])
+    return linked
+
+
+def rebuild_institutions():
+    """Re-match every author and editor; returns (institutions, authors, editors) totals"""
+    with transaction.atomic():
+        authors = _link_members(Author)
+        editors = _link_members(JournalEditor)
+        refresh_institution_counts()
+    return Institution.objects.count(), authors, editors
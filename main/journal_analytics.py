@@ -0,0 +1,146 @@
+"""
+Per-journal publication analytics.
+
+One grouped query over a journal's published articles yields the article,
+view, download and citation totals per (year, language); they are laid out
+as year x language NumPy matrices over every year from the first to the
+latest, and the per-year series and derived metrics (year-on-year growth,
+language shares, views per article) are computed on whole arrays. Distinct
+author counts per year come from one query of distinct (year, author)
+pairs.
+
+The report is cached per journal content version (see main.page_cache), so
+editorial changes rebuild it while view counts refresh every
+ANALYTICS_TIMEOUT.
+"""
+import io
+
+import numpy as np
+import xlsxwriter
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractYear
+
+from .models import Article, ArticleAuthor
+from .page_cache import current_versions, journal_scope
+from .singleflight import single_flight
+
+ANALYTICS_TIMEOUT = 60 * 60
+MEASURES = ['articles', 'views', 'downloads', 'citations']
+
+
+def _growth(series):
+    """Year-on-year change as a fraction of the previous year (None where it was 0)"""
+    previous = series[:-1].astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = np.where(previous > 0, (series[1:] - previous) / previous, np.nan)
+    return [None] + [None if np.isnan(value) else round(float(value), 4) for value in change]
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(denominator > 0, numerator / np.maximum(denominator, 1), 0.0)
+    return np.round(values, 4).tolist()
+
+
+def build_journal_analytics(journal):
+    rows = list(
+        Article.objects.filter(issue__journal=journal, is_published=True)
+        .values('language', year=ExtractYear('date_published'))
+        .annotate(articles=Count('id'), views=Sum('views'), downloads=Sum('downloads'),
+                  citations=Sum('citation_count'))
+        .order_by('year', 'language')
+    )
+    author_pairs = np.array(list(
+        ArticleAuthor.objects.filter(article__issue__journal=journal, article__is_published=True)
+        .order_by().values_list(ExtractYear('article__date_published'), 'author_id').distinct()
+    ), dtype=np.int64).reshape(-1, 2)
+
+    report = {'journal': {'id': journal.id, 'title': journal.title}, 'years': [], 'languages': []}
+    if not rows:
+        return {**report, 'matrices': {}, 'series': {}, 'derived': {}}
+
+    first_year = min(row['year'] for row in rows)
+    years = np.arange(first_year, max(row['year'] for row in rows) + 1)
+    languages = sorted({row['language'] for row in rows})
+    year_index = np.array([row['year'] - first_year for row in rows])
+    language_index = np.array([languages.index(row['language']) for row in rows])
+
+    matrices = {}
+    for measure in MEASURES:
+        matrix = np.zeros((len(years), len(languages)), dtype=np.int64)
+        np.add.at(matrix, (year_index, language_index), [row[measure] or 0 for row in rows])
+        matrices[measure] = matrix
+    series = {measure: matrix.sum(axis=1) for measure, matrix in matrices.items()}
+
+    # Distinct authors per year, and authors publishing in the journal for the first time
+    in_range = author_pairs[(author_pairs[:, 0] >= first_year) & (author_pairs[:, 0] <= years[-1])]
+    series['authors'] = np.bincount(in_range[:, 0] - first_year, minlength=len(years))
+    order = np.lexsort((in_range[:, 0], in_range[:, 1]))
+    first_seen = in_range[order][np.r_[True, np.diff(in_range[order][:, 1]) != 0]]
+    series['new_authors'] = np.bincount(first_seen[:, 0] - first_year, minlength=len(years))
+
+    return {
+        **report,
+        'years': years.tolist(),
+        'languages': languages,
+        'matrices': {measure: matrix.tolist() for measure, matrix in matrices.items()},
+        'series': {name: values.tolist() for name, values in series.items()},
+        'derived': {
+            'articles_growth': _growth(series['articles']),
+            'views_growth': _growth(series['views']),
+            'authors_growth': _growth(series['authors']),
+            'language_share': _ratio(matrices['articles'], series['articles'][:, None]),
+            'views_per_article': _ratio(series['views'], series['articles']),
+            'citations_per_article': _ratio(series['citations'], series['articles']),
+        },
+    }
+
+
+def journal_analytics(journal):
+    """Cached analytics report of a journal, rebuilt after its content changes"""
+    scope = journal_scope(journal.id)
+    return single_flight(
+        f"journal-analytics:{journal.id}",
+        lambda: build_journal_analytics(journal),
+        ANALYTICS_TIMEOUT,
+        version=current_versions([scope])[scope],
+    )
+
+
+def analytics_workbook(report):
+    """The report as an XLSX workbook (bytes): a yearly summary sheet and one sheet per matrix"""
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    bold = workbook.add_format({'bold': True})
+    percent = workbook.add_format({'num_format': '0.0%'})
+
+    summary = workbook.add_worksheet('Yillar')
+    columns = [
+        ('Yil', report['years'], None),
+        ('Maqolalar', report['series'].get('articles', []), None),
+        ("Ko'rishlar", report['series'].get('views', []), None),
+        ('Yuklab olishlar', report['series'].get('downloads', []), None),
+        ('Iqtiboslar', report['series'].get('citations', []), None),
+        ('Mualliflar', report['series'].get('authors', []), None),
+        ('Yangi mualliflar', report['series'].get('new_authors', []), None),
+        ("Maqolalar o'sishi", report['derived'].get('articles_growth', []), percent),
+        ("Ko'rishlar o'sishi", report['derived'].get('views_growth', []), percent),
+        ("Maqola boshiga ko'rish", report['derived'].get('views_per_article', []), None),
+    ]
+    for column, (title, values, cell_format) in enumerate(columns):
+        summary.write(0, column, title, bold)
+        for row, value in enumerate(values, 1):
+            summary.write(row, column, value, cell_format)
+    summary.set_column(0, len(columns) - 1, 16)
+
+    for measure, matrix in report['matrices'].items():
+        sheet = workbook.add_worksheet(measure.capitalize())
+        sheet.write(0, 0, 'Yil', bold)
+        for column, language in enumerate(report['languages'], 1):
+            sheet.write(0, column, language, bold)
+        for row, (year, values) in enumerate(zip(report['years'], matrix), 1):
+            sheet.write(row, 0, year)
+            sheet.write_row(row, 1, values)
+
+    workbook.close()
+    return output.getvalue()
@@ -0,0 +1,115 @@
+"""
+Normalized article keywords.
+
+Article.keywords stays the editable comma-separated source. Every save
+re-links the article to Keyword rows keyed on the case- and
+whitespace-folded form, so "Machine  Learning" and "machine learning" share
+one /keywords/<slug>/ page that is found through the (keyword, article)
+index instead of a LIKE scan. Keyword.article_count holds the number of
+published articles per keyword for the keyword cloud.
+"""
+import math
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.text import slugify
+
+from .autocomplete import KEYWORD, record_changes
+from .models import Article, ArticleKeyword, Keyword
+
+CLOUD_SIZE = 60
+CLOUD_WEIGHTS = 5
+BATCH_SIZE = 500
+
+
+def split_keywords(text):
+    """Distinct (normalized, display) pairs of a comma-separated keyword string, in order"""
+    keywords = {}
+    for keyword in (text or '').split(','):
+        display = ' '.join(keyword.split()).strip(' .;')
+        normalized = display.casefold()
+        if normalized:
+            keywords.setdefault(normalized, display)
+    return list(keywords.items())
+
+
+def _slug_base(normalized):
+    return slugify(normalized, allow_unicode=True)[:240] or 'kalit-soz'
+
+
+def get_keywords(pairs):
+    """Keyword rows for (normalized, display) pairs, creating the missing ones; keyed by normalized form"""
+    pairs = dict(pairs)
+    found = {keyword.normalized: keyword for keyword in Keyword.objects.filter(normalized__in=list(pairs))}
+    missing = [normalized for normalized in pairs if normalized not in found]
+    taken = set(Keyword.objects.filter(
+        slug__in={_slug_base(normalized) for normalized in missing}
+    ).values_list('slug', flat=True))
+
+    keywords = []
+    for normalized in missing:
+        base = _slug_base(normalized)
+        slug, suffix = base, 2
+        while slug in taken or (slug != base and Keyword.objects.filter(slug=slug).exists()):
+            slug, suffix = f"{base}-{suffix}", suffix + 1
+        taken.add(slug)
+        keywords.append(Keyword(name=pairs[normalized], normalized=normalized, slug=slug))
+
+    for keyword in Keyword.objects.bulk_create(keywords):
+        found[keyword.normalized] = keyword
+    return found
+
+
+def refresh_keyword_counts(keyword_ids=None):
+    """Recount published articles per keyword and drop keywords no article uses any more"""
+    keywords = Keyword.objects.all() if keyword_ids is None else Keyword.objects.filter(id__in=keyword_ids)
+    keywords.update(article_count=Coalesce(Subquery(
+        ArticleKeyword.objects.filter(keyword=OuterRef('pk'), article__is_published=True)
+        .order_by().values('keyword').annotate(n=Count('id')).values('n')
+    ), 0))
+    keywords.filter(article_links__isnull=True).delete()
+    record_changes(KEYWORD, keyword_ids)
+
+
+def _link_articles(articles):
+    """Replace the keyword links of the given articles; returns the keyword ids used before and after"""
+    pairs = {article.id: split_keywords(article.keywords) for article in articles}
+    keywords = get_keywords([pair for article_pairs in pairs.values() for pair in article_pairs])
+    links = ArticleKeyword.objects.filter(article_id__in=list(pairs))
+    previous = set(links.values_list('keyword_id', flat=True))
+    links.delete()
+    ArticleKeyword.objects.bulk_create([
+        ArticleKeyword(article_id=article_id, keyword=keywords[normalized], order=order)
+        for article_id, article_pairs in pairs.items()
+        for order, (normalized, _) in enumerate(article_pairs)
+    ])
+    return previous | {keywords[normalized].id for article_pairs in pairs.values() for normalized, _ in article_pairs}
+
+
+def sync_article_keywords(article):
+    """Re-link one article after its keywords or publication state changed"""
+    with transaction.atomic():
+        refresh_keyword_counts(_link_articles([article]))
+
+
+def rebuild_keywords():
+    """Relink every article; returns (keywords, links) totals"""
+    with transaction.atomic():
+        article_ids = list(Article.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, len(article_ids), BATCH_SIZE):
+            _link_articles(Article.objects.filter(id__in=article_ids[start:start + BATCH_SIZE]).only('id', 'keywords'))
+        refresh_keyword_counts()
+    return Keyword.objects.count(), ArticleKeyword.objects.count()
+
+
+def keyword_cloud(limit=CLOUD_SIZE):
+    """Most used keywords in alphabetical order, each with a 1..CLOUD_WEIGHTS weight on a log scale"""
+    keywords = list(Keyword.objects.filter(article_count__gt=0).order_by('-article_count', 'normalized')[:limit])
+    if not keywords:
+        return []
+    low, high = math.log(keywords[-1].article_count), math.log(keywords[0].article_count)
+    for keyword in keywords:
+        position = (math.log(keyword.article_count) - low) / (high - low) if high > low else 1
+        keyword.weight = 1 + round(position * (CLOUD_WEIGHTS - 1))
+    return sorted(keywords, key=lambda keyword: keyword.normalized)
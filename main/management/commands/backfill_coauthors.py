@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.coauthors import rebuild_coauthorships
+
+
+class Command(BaseCommand):
+    help = "Rebuild the co-authorship table from every published article's author list"
+
+    def handle(self, *args, **options):
+        pairs = rebuild_coauthorships()
+        self.stdout.write(self.style.SUCCESS(f"{pairs} co-author pairs stored"))
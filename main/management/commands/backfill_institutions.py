@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from main.institutions import rebuild_institutions
+
+
+class Command(BaseCommand):
+    help = "Match every author and editor affiliation to a normalized institution and recount institutions"
+
+    def handle(self, *args, **options):
+        institutions, authors, editors = rebuild_institutions()
+        self.stdout.write(self.style.SUCCESS(
+            f"{institutions} institutions linked to {authors} authors and {editors} editors"
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.keywords import rebuild_keywords
+
+
+class Command(BaseCommand):
+    help = "Rebuild the normalized keyword table and article links from Article.keywords"
+
+    def handle(self, *args, **options):
+        keywords, links = rebuild_keywords()
+        self.stdout.write(self.style.SUCCESS(f"{keywords} keywords linked to articles {links} times"))
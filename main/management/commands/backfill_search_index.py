@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.search_index import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the script-folded search tokens of every article, author and journal"
+
+    def handle(self, *args, **options):
+        tokens = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt with {tokens} tokens"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from main.related import build_related, update_related
+
+
+class Command(BaseCommand):
+    help = "Compute TF-IDF related-article lists (use --incremental to add newly published articles only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true',
+                            help="Only add articles published since the last full build")
+
+    def handle(self, *args, **options):
+        if options['incremental']:
+            added = update_related()
+            if added is not None:
+                self.stdout.write(self.style.SUCCESS(f"{added} new articles added to the related-article index"))
+                return
+            self.stdout.write("No saved index yet, running a full build")
+        articles, terms = build_related()
+        self.stdout.write(self.style.SUCCESS(f"Related articles computed for {articles} articles over {terms} terms"))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from main.author_dedup import AUTO_MATCH_THRESHOLD, CANDIDATE_THRESHOLD, candidate_pairs, merge_authors, rebuild_author_keys
+from main.models import Author
+
+
+class Command(BaseCommand):
+    help = "Rebuild the author blocking keys and report (or merge) probable duplicate authors"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=CANDIDATE_THRESHOLD,
+                            help="Lowest similarity reported")
+        parser.add_argument('--merge', action='store_true',
+                            help="Merge the pairs scoring at least --merge-threshold")
+        parser.add_argument('--merge-threshold', type=float, default=AUTO_MATCH_THRESHOLD)
+
+    def handle(self, *args, **options):
+        keys = rebuild_author_keys()
+        self.stdout.write(f"{keys} blocking keys stored")
+
+        pairs = candidate_pairs(options['threshold'])
+        authors = Author.objects.in_bulk({author_id for _, first, second in pairs for author_id in (first, second)})
+        for score, first, second in pairs:
+            self.stdout.write(f"{score:.2f}  #{first} {authors[first].full_name}  #{second} {authors[second].full_name}")
+        self.stdout.write(self.style.SUCCESS(f"{len(pairs)} probable duplicate pairs"))
+
+        if options['merge']:
+            merged, moved = self._merge([pair for pair in pairs if pair[0] >= options['merge_threshold']])
+            self.stdout.write(self.style.SUCCESS(f"{merged} authors merged, {moved} article links moved"))
+
+    def _merge(self, pairs):
+        merged_into, merged, moved = {}, 0, 0
+        for _, first, second in pairs:
+            # An author merged earlier is represented by the author it went into
+            first, second = self._resolve(merged_into, first), self._resolve(merged_into, second)
+            if first == second:
+                continue
+            # Keep the author with more articles (the older one on a tie)
+            target, duplicate = sorted(Author.objects.filter(id__in=[first, second]),
+                                       key=lambda author: (-author.article_count, author.id))
+            moved += merge_authors(target, [duplicate])
+            merged_into[duplicate.id] = target.id
+            merged += 1
+        return merged, moved
+
+    @staticmethod
+    def _resolve(merged_into, author_id):
+        while author_id in merged_into:
+            author_id = merged_into[author_id]
+        return author_id
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from main.page_cache import flush_pending_views
+
+
+class Command(BaseCommand):
+    help = ("Add the buffered views of cached article pages to the counters and buffered activity to the trend "
+            "scores (run every few minutes from cron)")
+
+    def handle(self, *args, **options):
+        views = flush_pending_views()
+        self.stdout.write(self.style.SUCCESS(f"{views} buffered views counted"))
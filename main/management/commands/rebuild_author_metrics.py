@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.author_metrics import rebuild_author_metrics
+
+
+class Command(BaseCommand):
+    help = "Recompute citation totals, h-index, i10-index and citations per year of every author"
+
+    def handle(self, *args, **options):
+        authors = rebuild_author_metrics()
+        self.stdout.write(self.style.SUCCESS(f"Citation metrics recomputed for {authors} authors"))
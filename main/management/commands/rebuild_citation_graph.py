@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from main.references import rebuild_citation_graph
+
+
+class Command(BaseCommand):
+    help = "Parse every article's references and rebuild the internal citation graph and citation counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Parser processes (defaults to the number of CPUs)")
+
+    def handle(self, *args, **options):
+        articles, edges = rebuild_citation_graph(workers=options['workers'])
+        self.stdout.write(self.style.SUCCESS(f"{edges} citation edges found in the references of {articles} articles"))
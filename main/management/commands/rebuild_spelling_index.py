@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.spelling import rebuild_spelling_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the trigram index used for \"did you mean\" search suggestions"
+
+    def handle(self, *args, **options):
+        words, trigrams = rebuild_spelling_index()
+        self.stdout.write(self.style.SUCCESS(f"Spelling index rebuilt: {words} words, {trigrams} trigrams"))
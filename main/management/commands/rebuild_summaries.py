@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.summaries import refresh_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the ArticleSummary rows and facet counts that list pages render from"
+
+    def handle(self, *args, **options):
+        count = refresh_summaries()
+        self.stdout.write(self.style.SUCCESS(f"{count} article summaries rebuilt"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from main.counters import reconcile_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized journal, issue and author counters from the source tables"
+
+    def handle(self, *args, **options):
+        issues_fixed, journals_fixed, authors_fixed = reconcile_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f"Counters reconciled: {issues_fixed} issues, {journals_fixed} journals "
+            f"and {authors_fixed} authors corrected"
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.trending import refresh_trending_lists
+
+
+class Command(BaseCommand):
+    help = "Recompute the trending article lists (run every few minutes from cron)"
+
+    def handle(self, *args, **options):
+        changed = refresh_trending_lists()
+        self.stdout.write(self.style.SUCCESS(f"{changed} trending lists changed"))
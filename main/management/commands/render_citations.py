@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from main.citations import refresh_citations
+from main.models import Article
+
+
+class Command(BaseCommand):
+    help = "Render and store citations for all articles in every supported format"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        article_ids = list(Article.objects.order_by('id').values_list('id', flat=True))
+
+        for start in range(0, len(article_ids), batch_size):
+            refresh_citations(article_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f"Rendered citations for {len(article_ids)} articles"))
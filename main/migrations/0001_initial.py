@@ -0,0 +1,345 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:40
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Article',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(help_text='Article title', max_length=500)),
+                ('subtitle', models.CharField(blank=True, max_length=300, null=True)),
+                ('abstract', models.TextField(help_text='Article abstract')),
+                ('references', models.TextField(blank=True, help_text='Article references', null=True)),
+                ('diploma_sent', models.BooleanField(default=False, help_text='Diploma has been sent to authors')),
+                ('keywords', models.CharField(blank=True, help_text='Keywords separated by commas', max_length=255, null=True)),
+                ('date_published', models.DateField(default=django.utils.timezone.now, help_text='Date article was published')),
+                ('first_page', models.PositiveIntegerField(blank=True, null=True)),
+                ('last_page', models.PositiveIntegerField(blank=True, null=True)),
+                ('doi', models.CharField(blank=True, help_text='Digital Object Identifier (DOI)', max_length=100, null=True, unique=True)),
+                ('meta_description', models.TextField(blank=True, help_text='SEO meta description')),
+                ('slug', models.SlugField(blank=True, max_length=200, unique=True)),
+                ('open_access', models.BooleanField(default=True)),
+                ('featured', models.BooleanField(default=False)),
+                ('is_published', models.BooleanField(default=True)),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('downloads', models.PositiveIntegerField(default=0)),
+                ('language', models.CharField(default='en', help_text='Article language code (en, uz, ru)', max_length=10)),
+            ],
+            options={
+                'verbose_name': 'Article',
+                'verbose_name_plural': 'Articles',
+                'ordering': ['-date_published', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Author',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('first_name', models.CharField(max_length=100)),
+                ('middle_name', models.CharField(blank=True, max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('affiliation', models.CharField(blank=True, help_text='Institution/University affiliation', max_length=255, null=True)),
+                ('department', models.CharField(blank=True, max_length=200)),
+                ('position', models.CharField(blank=True, help_text='Academic position/title', max_length=100)),
+                ('academic_title', models.CharField(blank=True, help_text='Ilmiy unvon (masalan: Professor, Dotsent, Katta ilmiy xodim)', max_length=100)),
+                ('academic_degree', models.CharField(blank=True, help_text='Ilmiy daraja (masalan: Fan doktori (DSc), Falsafa doktori (PhD), Fan nomzodi)', max_length=100)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('website', models.URLField(blank=True)),
+                ('orcid', models.CharField(blank=True, help_text='ORCID ID (e.g., 0000-0000-0000-0000)', max_length=50)),
+                ('google_scholar_id', models.CharField(blank=True, help_text='Google Scholar profile ID', max_length=50)),
+                ('researchgate_profile', models.URLField(blank=True)),
+                ('bio', models.TextField(blank=True, help_text='Author biography')),
+                ('photo', models.ImageField(blank=True, help_text='Author photograph', null=True, upload_to='author_photos/')),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'verbose_name': 'Author',
+                'verbose_name_plural': 'Authors',
+                'ordering': ['last_name', 'first_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ContactMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('subject', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FanTarmoq',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Field Name')),
+                ('slug', models.SlugField(blank=True, max_length=120, unique=True)),
+                ('description', models.TextField(blank=True, help_text='Description of this scientific field')),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'verbose_name': 'Fan Tarmoq',
+                'verbose_name_plural': 'Fan Tarmoqlari',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='IlmiyNashr',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=150, unique=True, verbose_name='Publication Type')),
+                ('slug', models.SlugField(blank=True, max_length=170, unique=True)),
+                ('description', models.TextField(blank=True)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'verbose_name': 'Ilmiy Nashr',
+                'verbose_name_plural': 'Ilmiy Nashrlar',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Issue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('volume', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('number', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('year', models.IntegerField(default=2026, validators=[django.core.validators.MinValueValidator(1900), django.core.validators.MaxValueValidator(2100)])),
+                ('is_active', models.BooleanField(default=False, help_text='Whether this is the current active issue. Only one issue per journal may be active.')),
+                ('title', models.CharField(blank=True, help_text='Special issue title (optional)', max_length=255, null=True)),
+                ('description', models.TextField(blank=True, help_text='Issue description or editorial note')),
+                ('date_published', models.DateField(default=django.utils.timezone.now)),
+                ('is_published', models.BooleanField(default=False)),
+                ('meta_description', models.CharField(blank=True, help_text='SEO meta description for this issue', max_length=160)),
+                ('cover_image', models.ImageField(blank=True, help_text='Issue cover image', null=True, upload_to='issue_covers/%Y/')),
+            ],
+            options={
+                'verbose_name': 'Issue',
+                'verbose_name_plural': 'Issues',
+                'ordering': ['-year', '-volume', '-number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Journal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=255, unique=True)),
+                ('initials', models.CharField(help_text='Journal initials/acronym', max_length=20)),
+                ('abbreviation', models.CharField(blank=True, max_length=50)),
+                ('url_slug', models.SlugField(max_length=100, unique=True)),
+                ('description', models.TextField(help_text='Journal description and scope')),
+                ('meta_description', models.CharField(blank=True, help_text='SEO meta description (max 160 chars)', max_length=160)),
+                ('meta_keywords', models.CharField(blank=True, help_text='SEO keywords separated by commas', max_length=255)),
+                ('languages', models.JSONField(default=list, help_text="Supported languages ['en', 'uz', 'ru']")),
+                ('primary_locale', models.CharField(default='en', max_length=20)),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_open_access', models.BooleanField(default=True)),
+                ('publisher', models.CharField(blank=True, max_length=200)),
+                ('issn_print', models.CharField(blank=True, help_text='Print ISSN (format: XXXX-XXXX)', max_length=20)),
+                ('issn_online', models.CharField(blank=True, help_text='Online ISSN (format: XXXX-XXXX)', max_length=20)),
+                ('contact_email', models.EmailField(blank=True, max_length=254)),
+                ('website', models.URLField(blank=True)),
+                ('cover_image', models.ImageField(blank=True, help_text='Journal cover image', null=True, upload_to='journal_covers/')),
+            ],
+            options={
+                'verbose_name': 'Journal',
+                'verbose_name_plural': 'Journals',
+                'ordering': ['title'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Navigation_For_Publishers_Page',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SiteSEO',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('meta_title', models.CharField(blank=True, help_text='Site-wide meta title', max_length=200, null=True)),
+                ('meta_description', models.TextField(blank=True, help_text='Site-wide meta description', null=True)),
+                ('meta_keywords', models.TextField(blank=True, help_text='Site-wide keywords, comma-separated', null=True)),
+                ('publisher_name', models.CharField(blank=True, help_text='Publisher name for indexing', max_length=200, null=True)),
+                ('enable_google_scholar', models.BooleanField(default=False, help_text='Enable Google Scholar indexing')),
+                ('auto_sitemap', models.BooleanField(default=True, help_text='Auto-generate sitemap')),
+            ],
+            options={
+                'verbose_name': 'Site SEO Settings',
+                'verbose_name_plural': 'Site SEO Settings',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArticleAuthor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order', models.PositiveIntegerField(default=0, help_text='Author order in publication (0 = first author)')),
+                ('is_corresponding', models.BooleanField(default=False, help_text='Is this the corresponding author?')),
+                ('contribution', models.TextField(blank=True, help_text="Author's specific contribution to the work")),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.article')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.author')),
+            ],
+            options={
+                'verbose_name': 'Article Author',
+                'verbose_name_plural': 'Article Authors',
+                'ordering': ['order'],
+                'unique_together': {('article', 'author')},
+            },
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='authors',
+            field=models.ManyToManyField(through='main.ArticleAuthor', to='main.author'),
+        ),
+        migrations.CreateModel(
+            name='ArticleSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('author', models.CharField(max_length=100)),
+                ('email', models.EmailField(max_length=254)),
+                ('phone', models.CharField(blank=True, max_length=15)),
+                ('description', models.TextField(blank=True)),
+                ('submitted_at', models.DateTimeField(auto_now_add=True)),
+                ('fan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.fantarmoq')),
+                ('ilm', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.ilmiynashr')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='File',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file', models.FileField(upload_to='article_files/%Y/%m/')),
+                ('original_filename', models.CharField(max_length=255)),
+                ('file_size', models.BigIntegerField(help_text='File size in bytes')),
+                ('mime_type', models.CharField(max_length=100)),
+                ('file_type', models.CharField(choices=[('pdf', 'PDF Document'), ('supplement', 'Supplementary Material'), ('figure', 'Figure'), ('table', 'Table'), ('dataset', 'Dataset'), ('other', 'Other')], default='pdf', max_length=20)),
+                ('description', models.TextField(blank=True, help_text='File description')),
+                ('submission', models.ForeignKey(blank=True, help_text='Associated article submission', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='files', to='main.articlesubmission')),
+                ('uploaded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploaded_files', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'File',
+                'verbose_name_plural': 'Files',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='main_pdf',
+            field=models.ForeignKey(blank=True, help_text='Main article PDF file', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='article_pdf', to='main.file'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='supplementary_files',
+            field=models.ManyToManyField(blank=True, help_text='Additional files (figures, datasets, etc.)', related_name='supplementary_articles', to='main.file'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='issue',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='articles', to='main.issue'),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='journal',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='issues', to='main.journal'),
+        ),
+        migrations.CreateModel(
+            name='JournalEditor',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('journal_id', models.IntegerField(verbose_name='Jurnal ID')),
+                ('first_name', models.CharField(max_length=100, verbose_name='Ism')),
+                ('middle_name', models.CharField(blank=True, max_length=100, null=True, verbose_name='Sharif')),
+                ('last_name', models.CharField(max_length=100, verbose_name='Familiya')),
+                ('photo', models.ImageField(blank=True, help_text='Editor photograph', null=True, upload_to='editors_photos/')),
+                ('title', models.CharField(blank=True, max_length=200, null=True, verbose_name='Ilmiy daraja/unvon')),
+                ('affiliation', models.CharField(blank=True, max_length=500, null=True, verbose_name='Tashkilot')),
+                ('position', models.CharField(blank=True, max_length=200, null=True, verbose_name='Lavozim')),
+                ('editor_type', models.CharField(choices=[('chief', 'Bosh muharrir'), ('deputy', "Muharrir o'rinbosari"), ('section', "Bo'lim muharriri"), ('associate', 'Yordamchi muharrir'), ('technical', 'Texnik muharrir'), ('guest', 'Mehmon muharrir')], default='associate', max_length=20, verbose_name='Muharrir turi')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Faol')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqt')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Yangilangan vaqt')),
+            ],
+            options={
+                'verbose_name': 'Muharrir',
+                'verbose_name_plural': 'Muharrirlar',
+                'db_table': 'journal_editors',
+                'ordering': ['editor_type', 'last_name', 'first_name'],
+                'indexes': [models.Index(fields=['journal_id'], name='journal_edi_journal_d3ea0e_idx'), models.Index(fields=['editor_type'], name='journal_edi_editor__06f1ae_idx'), models.Index(fields=['is_active'], name='journal_edi_is_acti_a36f13_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Navigation_Item',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField()),
+                ('navigation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.navigation_for_publishers_page')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='issue',
+            unique_together={('journal', 'volume', 'number', 'year')},
+        ),
+        migrations.CreateModel(
+            name='JournalPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('policy_type', models.CharField(choices=[('submission', 'Maqola yuborish qoidalari'), ('review', "Ko'rib chiqish jarayoni"), ('publication', 'Nashr etish siyosati'), ('ethics', 'Axloqiy qoidalar'), ('copyright', 'Mualliflik huquqi'), ('open_access', 'Ochiq kirish siyosati'), ('plagiarism', 'Plagiat siyosati'), ('retraction', 'Maqola qaytarish siyosati'), ('editorial', 'Tahririyat siyosati'), ('author_guidelines', "Mualliflar uchun qo'llanma"), ('reviewer_guidelines', "Taqrizchilar uchun qo'llanma"), ('privacy', 'Maxfiylik siyosati'), ('conflict_of_interest', "Manfaatlar to'qnashuvi"), ('data_sharing', "Ma'lumotlarni baham ko'rish"), ('archiving', 'Arxivlash siyosati')], max_length=30, verbose_name='Siyosat turi')),
+                ('title', models.CharField(max_length=300, verbose_name='Sarlavha')),
+                ('content', models.TextField(verbose_name='Mazmun')),
+                ('short_description', models.TextField(blank=True, null=True, verbose_name='Qisqacha tavsif')),
+                ('requirements', models.TextField(blank=True, null=True, verbose_name='Talablar')),
+                ('examples', models.TextField(blank=True, null=True, verbose_name='Misollar')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Faol')),
+                ('is_public', models.BooleanField(default=True, verbose_name='Ommaviy')),
+                ('order', models.PositiveIntegerField(default=0, verbose_name='Tartib raqami')),
+                ('language', models.CharField(choices=[('uz', "O'zbek"), ('en', 'English'), ('ru', 'Русский')], default='uz', max_length=5, verbose_name='Til')),
+                ('meta_description', models.CharField(blank=True, max_length=160, null=True, verbose_name='Meta tavsif')),
+                ('keywords', models.CharField(blank=True, max_length=500, null=True, verbose_name="Kalit so'zlar")),
+                ('version', models.CharField(default='1.0', max_length=10, verbose_name='Versiya')),
+                ('effective_date', models.DateField(default=django.utils.timezone.now, verbose_name='Kuchga kirgan sana')),
+                ('last_updated', models.DateTimeField(auto_now=True, verbose_name='Oxirgi yangilanish')),
+                ('created_by', models.CharField(blank=True, max_length=100, null=True, verbose_name='Yaratuvchi')),
+                ('updated_by', models.CharField(blank=True, max_length=100, null=True, verbose_name='Yangilovchi')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('journal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='policies', to='main.journal')),
+            ],
+            options={
+                'verbose_name': 'Siyosat',
+                'verbose_name_plural': 'Siyosatlar',
+                'ordering': ['order', 'policy_type', 'title'],
+                'unique_together': {('journal', 'policy_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleCitation',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rendered_citation', serialize=False, to='main.article')),
+                ('plain', models.TextField()),
+                ('apa', models.TextField()),
+                ('mla', models.TextField()),
+                ('chicago', models.TextField()),
+                ('bibtex', models.TextField()),
+                ('ris', models.TextField()),
+                ('jats', models.TextField()),
+                ('rendered_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Article Citation',
+                'verbose_name_plural': 'Article Citations',
+            },
+        ),
+    ]
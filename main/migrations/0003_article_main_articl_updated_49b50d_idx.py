@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_articlecitation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['updated_at', 'id'], name='main_articl_updated_49b50d_idx'),
+        ),
+    ]
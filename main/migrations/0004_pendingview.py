@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_article_main_articl_updated_49b50d_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingView',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='pending_views', serialize=False, to='main.article')),
+                ('views', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Pending View',
+                'verbose_name_plural': 'Pending Views',
+            },
+        ),
+    ]
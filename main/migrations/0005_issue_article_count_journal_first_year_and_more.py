@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_pendingview'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='article_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='journal',
+            name='first_year',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='journal',
+            name='latest_year',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='journal',
+            name='published_article_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='journal',
+            name='published_issue_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
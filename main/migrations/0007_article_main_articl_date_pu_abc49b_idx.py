@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_author_article_count_author_first_year_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['date_published', 'id'], name='main_articl_date_pu_abc49b_idx'),
+        ),
+    ]
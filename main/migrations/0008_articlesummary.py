@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_article_main_articl_date_pu_abc49b_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleSummary',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='main.article')),
+                ('title', models.CharField(max_length=500)),
+                ('subtitle', models.CharField(blank=True, max_length=300)),
+                ('authors_display', models.TextField(blank=True, help_text='Author names joined with commas')),
+                ('author_list', models.JSONField(default=list, help_text="[{'id': ..., 'name': ...}] in author order")),
+                ('excerpt', models.TextField(blank=True, help_text='Plain-text start of the abstract')),
+                ('journal_id', models.IntegerField(db_index=True, null=True)),
+                ('journal_title', models.CharField(blank=True, max_length=255)),
+                ('journal_slug', models.CharField(blank=True, max_length=100)),
+                ('issue_id', models.IntegerField(db_index=True, null=True)),
+                ('issue_citation', models.CharField(blank=True, help_text='Jild 1, Son 2', max_length=100)),
+                ('date_published', models.DateField()),
+                ('first_page', models.PositiveIntegerField(null=True)),
+                ('last_page', models.PositiveIntegerField(null=True)),
+                ('doi', models.CharField(blank=True, max_length=100)),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('downloads', models.PositiveIntegerField(default=0)),
+                ('is_published', models.BooleanField(default=True)),
+                ('featured', models.BooleanField(default=False)),
+                ('open_access', models.BooleanField(default=True)),
+                ('has_pdf', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': 'Article Summary',
+                'verbose_name_plural': 'Article Summaries',
+                'indexes': [models.Index(fields=['date_published', 'article'], name='main_articl_date_pu_bcbb36_idx')],
+            },
+        ),
+    ]
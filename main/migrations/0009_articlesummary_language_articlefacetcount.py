@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_articlesummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlesummary',
+            name='language',
+            field=models.CharField(default='en', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='ArticleFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('language', models.CharField(max_length=10)),
+                ('open_access', models.BooleanField()),
+                ('featured', models.BooleanField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('journal', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='main.journal')),
+            ],
+            options={
+                'verbose_name': 'Article Facet Count',
+                'verbose_name_plural': 'Article Facet Counts',
+                'unique_together': {('journal', 'year', 'language', 'open_access', 'featured')},
+            },
+        ),
+    ]
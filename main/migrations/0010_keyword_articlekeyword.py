@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_articlesummary_language_articlefacetcount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Keyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Display form, as first entered', max_length=255)),
+                ('normalized', models.CharField(max_length=255, unique=True)),
+                ('slug', models.SlugField(allow_unicode=True, max_length=255, unique=True)),
+                ('article_count', models.PositiveIntegerField(db_index=True, default=0, editable=False)),
+            ],
+            options={
+                'verbose_name': 'Keyword',
+                'verbose_name_plural': 'Keywords',
+                'ordering': ['normalized'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArticleKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keyword_links', to='main.article')),
+                ('keyword', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_links', to='main.keyword')),
+            ],
+            options={
+                'verbose_name': 'Article Keyword',
+                'verbose_name_plural': 'Article Keywords',
+                'ordering': ['order'],
+                'indexes': [models.Index(fields=['keyword', 'article'], name='main_articl_keyword_381de1_idx')],
+                'unique_together': {('article', 'keyword')},
+            },
+        ),
+    ]
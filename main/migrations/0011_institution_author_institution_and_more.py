@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_keyword_articlekeyword'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Institution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Display form, as first entered', max_length=500)),
+                ('key', models.CharField(help_text='Script-folded matching key', max_length=500, unique=True)),
+                ('slug', models.SlugField(max_length=255, unique=True)),
+                ('author_count', models.PositiveIntegerField(db_index=True, default=0, editable=False)),
+                ('editor_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('article_count', models.PositiveIntegerField(default=0, editable=False)),
+            ],
+            options={
+                'verbose_name': 'Institution',
+                'verbose_name_plural': 'Institutions',
+                'ordering': ['key'],
+            },
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='institution',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='authors', to='main.institution'),
+        ),
+        migrations.AddField(
+            model_name='journaleditor',
+            name='institution',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='editors', to='main.institution', verbose_name='Tashkilot (normallashtirilgan)'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_institution_author_institution_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('article', 'Article'), ('author', 'Author'), ('journal', 'Journal')], max_length=10)),
+                ('token', models.CharField(max_length=64)),
+                ('object_id', models.PositiveIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Search Token',
+                'verbose_name_plural': 'Search Tokens',
+                'indexes': [models.Index(fields=['kind', 'token', 'object_id'], name='main_search_kind_d93f66_idx'), models.Index(fields=['kind', 'object_id'], name='main_search_kind_0f9ee0_idx')],
+            },
+        ),
+    ]
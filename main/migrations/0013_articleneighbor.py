@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_searchtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleNeighbor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='main.article')),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbor_of', to='main.article')),
+            ],
+            options={
+                'verbose_name': 'Article Neighbor',
+                'verbose_name_plural': 'Article Neighbors',
+                'ordering': ['article', 'rank'],
+                'unique_together': {('article', 'neighbor'), ('article', 'rank')},
+            },
+        ),
+    ]
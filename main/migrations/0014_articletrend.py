@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_articleneighbor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleTrend',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trend', serialize=False, to='main.article')),
+                ('log_score', models.FloatField(db_index=True)),
+                ('last_activity', models.DateTimeField(null=True)),
+            ],
+            options={
+                'verbose_name': 'Article Trend',
+                'verbose_name_plural': 'Article Trends',
+            },
+        ),
+    ]
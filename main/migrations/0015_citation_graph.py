@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0014_articletrend'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='citation_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Citations from published articles on the site (maintained by main.references)'),
+        ),
+        migrations.CreateModel(
+            name='CitationEdge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(choices=[('doi', 'DOI'), ('title', 'Title')], max_length=5)),
+                ('cited', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cited_by_edges', to='main.article')),
+                ('citing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='citation_edges', to='main.article')),
+            ],
+            options={
+                'verbose_name': 'Citation Edge',
+                'verbose_name_plural': 'Citation Edges',
+                'indexes': [models.Index(fields=['cited', 'citing'], name='main_citati_cited_i_1b6d09_idx')],
+                'unique_together': {('citing', 'cited')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0015_citation_graph'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='main.author')),
+                ('total_citations', models.PositiveIntegerField(default=0)),
+                ('h_index', models.PositiveIntegerField(default=0)),
+                ('i10_index', models.PositiveIntegerField(default=0)),
+                ('citations_per_year', models.JSONField(default=list, help_text='[[year, citations], ...] by citing year')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Author Stats',
+                'verbose_name_plural': 'Author Stats',
+            },
+        ),
+    ]
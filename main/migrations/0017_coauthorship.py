@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0016_authorstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoAuthorship',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('paper_count', models.PositiveIntegerField(default=0)),
+                ('last_year', models.PositiveIntegerField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='collaborations', to='main.author')),
+                ('coauthor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='main.author')),
+            ],
+            options={
+                'verbose_name': 'Co-authorship',
+                'verbose_name_plural': 'Co-authorships',
+                'indexes': [models.Index(fields=['author', '-paper_count', '-last_year'], name='main_coauth_author__ba8279_idx')],
+                'unique_together': {('author', 'coauthor')},
+            },
+        ),
+    ]
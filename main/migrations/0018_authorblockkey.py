@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0017_coauthorship'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorBlockKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=150)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='block_keys', to='main.author')),
+            ],
+            options={
+                'verbose_name': 'Author Block Key',
+                'verbose_name_plural': 'Author Block Keys',
+                'unique_together': {('key', 'author')},
+            },
+        ),
+    ]
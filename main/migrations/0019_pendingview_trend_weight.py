@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0018_authorblockkey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendingview',
+            name='trend_weight',
+            field=models.PositiveIntegerField(default=0, help_text='Weight of counted views and downloads not yet in the trend score'),
+        ),
+    ]
@@ -143,6 +143,12 @@ class Journal(TimeStampedModel):
         help_text="Journal cover image"
     )
 
+    # Denormalized counters over published issues, maintained by main.counters
+    published_issue_count = models.PositiveIntegerField(default=0, editable=False)
+    published_article_count = models.PositiveIntegerField(default=0, editable=False)
+    first_year = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    latest_year = models.PositiveIntegerField(blank=True, null=True, editable=False)
+
     class Meta:
         verbose_name = "Journal"
         verbose_name_plural = "Journals"
@@ -193,6 +199,10 @@ class JournalEditor(models.Model):
     # Professional Information (Essential details)
     title = models.CharField(max_length=200, blank=True, null=True, verbose_name="Ilmiy daraja/unvon")
     affiliation = models.CharField(max_length=500, blank=True, null=True, verbose_name="Tashkilot")
+    institution = models.ForeignKey(
+        'Institution', on_delete=models.SET_NULL, blank=True, null=True, editable=False,
+        related_name='editors', verbose_name="Tashkilot (normallashtirilgan)"
+    )
     position = models.CharField(max_length=200, blank=True, null=True, verbose_name="Lavozim")
 
     # Editor Type
@@ -365,6 +375,9 @@ class Issue(TimeStampedModel):
         help_text="Issue cover image"
     )
 
+    # Published articles in this issue, maintained by main.counters
+    article_count = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         verbose_name = "Issue"
         verbose_name_plural = "Issues"
@@ -379,10 +392,6 @@ class Issue(TimeStampedModel):
         """Full citation format for the issue"""
         return f"Vol.{self.volume}, No.{self.number} ({self.year})"
 
-    # @property
-    # def article_count(self) -> int:
-    #     return self.articles.count()
-
     @property
     def issue_identifier(self):
         """Unique identifier for the issue"""
@@ -397,6 +406,29 @@ class Issue(TimeStampedModel):
         })
 
 
+class Institution(models.Model):
+    """Normalized affiliation shared by authors and editors (maintained by main.institutions)"""
+    name = models.CharField(max_length=500, help_text="Display form, as first entered")
+    key = models.CharField(max_length=500, unique=True, help_text="Script-folded matching key")
+    slug = models.SlugField(max_length=255, unique=True)
+
+    # Counters maintained by main.institutions
+    author_count = models.PositiveIntegerField(default=0, db_index=True, editable=False)
+    editor_count = models.PositiveIntegerField(default=0, editable=False)
+    article_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        verbose_name = "Institution"
+        verbose_name_plural = "Institutions"
+        ordering = ['key']
+
+    def __str__(self):
+        return self.name
+
+    def get_absolute_url(self):
+        return reverse('institution_detail', kwargs={'slug': self.slug})
+
+
 class Author(TimeStampedModel):
     """Author model - optimized for scholarly indexing"""
     # Personal Information
@@ -411,6 +443,11 @@ class Author(TimeStampedModel):
         null=True,
         help_text="Institution/University affiliation"
     )
+    # Matched from affiliation by main.institutions
+    institution = models.ForeignKey(
+        'Institution', on_delete=models.SET_NULL, blank=True, null=True, editable=False,
+        related_name='authors'
+    )
     department = models.CharField(max_length=200, blank=True)
     position = models.CharField(max_length=100, blank=True, help_text="Academic position/title")
 
@@ -456,10 +493,20 @@ class Author(TimeStampedModel):
     # Settings
     is_active = models.BooleanField(default=True)
 
+    # Denormalized statistics over published articles, maintained by main.counters
+    article_count = models.PositiveIntegerField(default=0, editable=False)
+    total_views = models.PositiveIntegerField(default=0, editable=False)
+    total_downloads = models.PositiveIntegerField(default=0, editable=False)
+    first_year = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    last_year = models.PositiveIntegerField(blank=True, null=True, editable=False)
+
     class Meta:
         verbose_name = "Author"
         verbose_name_plural = "Authors"
         ordering = ['last_name', 'first_name']
+        indexes = [
+            models.Index(fields=['last_name', 'first_name']),
+        ]
 
     def __str__(self):
         if self.middle_name:
@@ -635,6 +682,11 @@ class Article(TimeStampedModel):
     # Metrics
     views = models.PositiveIntegerField(default=0)
     downloads = models.PositiveIntegerField(default=0)
+    citation_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Citations from published articles on the site (maintained by main.references)"
+    )
 
     # Language
     language = models.CharField(
@@ -647,6 +699,10 @@ class Article(TimeStampedModel):
         verbose_name = "Article"
         verbose_name_plural = "Articles"
         ordering = ['-date_published', '-created_at']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+            models.Index(fields=['date_published', 'id']),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -671,69 +727,39 @@ class Article(TimeStampedModel):
     @property
     def citation(self):
         """Generate citation in standard format"""
-        authors = []
-        for article_author in self.author_list[:6]:  # Limit to first 6 authors
-            authors.append(article_author.author.citation_name)
-
-        if self.author_list.count() > 6:
-            authors.append("et al.")
-
-        author_string = ", ".join(authors)
-        year = self.date_published.year
-
-        if self.issue:
-            journal_info = f"{self.issue.journal.title}, {self.issue.full_citation}"
-        else:
-            journal_info = "Unpublished"
-
-        page_info = f", pp. {self.page_range}" if self.page_range else ""
-        doi_info = f". DOI: {self.doi}" if self.doi else ""
-
-        return f"{author_string} ({year}). {self.title}. {journal_info}{page_info}{doi_info}"
+        return self.get_citations()['plain']
 
     @property
     def apa_citation(self):
         """Generate APA style citation"""
         # This is useful for Google Scholar
-        authors = []
-        for article_author in self.author_list:
-            author = article_author.author
-            if author.middle_name:
-                authors.append(f"{author.last_name}, {author.first_name[0]}. {author.middle_name[0]}.")
-            else:
-                authors.append(f"{author.last_name}, {author.first_name[0]}.")
-
-        if len(authors) > 1:
-            author_string = ", ".join(authors[:-1]) + f", & {authors[-1]}"
-        else:
-            author_string = authors[0] if authors else "Unknown Author"
+        return self.get_citations()['apa']
 
-        year = self.date_published.year
-
-        if self.issue:
-            journal_title = self.issue.journal.title
-            volume_issue = f"{self.issue.volume}({self.issue.number})"
-        else:
-            journal_title = "Unknown Journal"
-            volume_issue = ""
-
-        page_info = f", {self.page_range}" if self.page_range else ""
-        doi_info = f" https://doi.org/{self.doi}" if self.doi else ""
-
-        return f"{author_string} ({year}). {self.title}. {journal_title}, {volume_issue}{page_info}.{doi_info}"
+    def get_citations(self):
+        """Pre-rendered citations in every supported format"""
+        from .citations import get_citations
+        return get_citations(self)
 
     def get_absolute_url(self):
         return reverse('article_detail', kwargs={'slug': self.slug})
 
     def increment_views(self):
         """Increment view counter"""
+        from .counters import add_view_totals
+        from .trending import record_activity
         self.views += 1
         self.save(update_fields=['views'])
+        add_view_totals([self.id], views=1)
+        record_activity([self.id], views=1)
 
     def increment_downloads(self):
         """Increment download counter"""
+        from .counters import add_view_totals
+        from .trending import record_activity
         self.downloads += 1
         self.save(update_fields=['downloads'])
+        add_view_totals([self.id], downloads=1)
+        record_activity([self.id], downloads=1)
 
     def get_keywords_list(self):
         if self.keywords:
@@ -768,6 +794,295 @@ class ArticleAuthor(models.Model):
         return f"{self.author} - {self.article.title[:30]}..."
 
 
+class Keyword(models.Model):
+    """Case- and whitespace-folded article keyword (maintained by main.keywords)"""
+    name = models.CharField(max_length=255, help_text="Display form, as first entered")
+    normalized = models.CharField(max_length=255, unique=True)
+    slug = models.SlugField(max_length=255, unique=True, allow_unicode=True)
+    article_count = models.PositiveIntegerField(default=0, db_index=True, editable=False)
+
+    class Meta:
+        verbose_name = "Keyword"
+        verbose_name_plural = "Keywords"
+        ordering = ['normalized']
+
+    def __str__(self):
+        return self.name
+
+    def get_absolute_url(self):
+        return reverse('keyword_detail', kwargs={'slug': self.slug})
+
+
+class ArticleKeyword(models.Model):
+    """Link between an article and one of its normalized keywords"""
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='keyword_links')
+    keyword = models.ForeignKey(Keyword, on_delete=models.CASCADE, related_name='article_links')
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Article Keyword"
+        verbose_name_plural = "Article Keywords"
+        ordering = ['order']
+        unique_together = ['article', 'keyword']
+        indexes = [
+            models.Index(fields=['keyword', 'article']),
+        ]
+
+    def __str__(self):
+        return f"{self.keyword} - {self.article_id}"
+
+
+class SearchToken(models.Model):
+    """One script-folded word of a searchable record (maintained by main.search_index)"""
+    ARTICLE = 'article'
+    AUTHOR = 'author'
+    JOURNAL = 'journal'
+    KIND_CHOICES = [
+        (ARTICLE, 'Article'),
+        (AUTHOR, 'Author'),
+        (JOURNAL, 'Journal'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    token = models.CharField(max_length=64)
+    object_id = models.PositiveIntegerField()
+
+    class Meta:
+        verbose_name = "Search Token"
+        verbose_name_plural = "Search Tokens"
+        indexes = [
+            models.Index(fields=['kind', 'token', 'object_id']),
+            models.Index(fields=['kind', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.token}"
+
+
+class ArticleNeighbor(models.Model):
+    """One of an article's most similar articles by TF-IDF cosine (maintained by main.related)"""
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='neighbors')
+    neighbor = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='neighbor_of')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        verbose_name = "Article Neighbor"
+        verbose_name_plural = "Article Neighbors"
+        ordering = ['article', 'rank']
+        unique_together = [['article', 'rank'], ['article', 'neighbor']]
+
+    def __str__(self):
+        return f"{self.article_id} -> {self.neighbor_id} ({self.score:.3f})"
+
+
+class CitationEdge(models.Model):
+    """A reference of one article resolved to another article on the site (maintained by main.references)"""
+    DOI = 'doi'
+    TITLE = 'title'
+    METHOD_CHOICES = [
+        (DOI, 'DOI'),
+        (TITLE, 'Title'),
+    ]
+
+    citing = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='citation_edges')
+    cited = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='cited_by_edges')
+    method = models.CharField(max_length=5, choices=METHOD_CHOICES)
+
+    class Meta:
+        verbose_name = "Citation Edge"
+        verbose_name_plural = "Citation Edges"
+        unique_together = ['citing', 'cited']
+        indexes = [
+            models.Index(fields=['cited', 'citing']),
+        ]
+
+    def __str__(self):
+        return f"{self.citing_id} -> {self.cited_id} ({self.method})"
+
+
+class AuthorBlockKey(models.Model):
+    """Blocking key grouping possibly duplicate authors (maintained by main.author_dedup)"""
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='block_keys')
+    key = models.CharField(max_length=150)
+
+    class Meta:
+        verbose_name = "Author Block Key"
+        verbose_name_plural = "Author Block Keys"
+        unique_together = ['key', 'author']
+
+    def __str__(self):
+        return f"{self.key} -> {self.author_id}"
+
+
+class CoAuthorship(models.Model):
+    """Published papers two authors wrote together, stored once per direction (maintained by main.coauthors)"""
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='collaborations')
+    coauthor = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='+')
+    paper_count = models.PositiveIntegerField(default=0)
+    last_year = models.PositiveIntegerField()
+
+    class Meta:
+        verbose_name = "Co-authorship"
+        verbose_name_plural = "Co-authorships"
+        unique_together = ['author', 'coauthor']
+        indexes = [
+            models.Index(fields=['author', '-paper_count', '-last_year']),
+        ]
+
+    def __str__(self):
+        return f"{self.author_id} + {self.coauthor_id}: {self.paper_count}"
+
+
+class AuthorStats(models.Model):
+    """Citation metrics of an author's published articles (maintained by main.author_metrics)"""
+    author = models.OneToOneField(
+        Author,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    total_citations = models.PositiveIntegerField(default=0)
+    h_index = models.PositiveIntegerField(default=0)
+    i10_index = models.PositiveIntegerField(default=0)
+    citations_per_year = models.JSONField(default=list, help_text="[[year, citations], ...] by citing year")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Author Stats"
+        verbose_name_plural = "Author Stats"
+
+    def __str__(self):
+        return f"{self.author_id}: h={self.h_index}, citations={self.total_citations}"
+
+
+class ArticleTrend(models.Model):
+    """Time-decayed view/download score of an article, in log space (maintained by main.trending)"""
+    article = models.OneToOneField(
+        Article,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trend'
+    )
+    log_score = models.FloatField(db_index=True)
+    last_activity = models.DateTimeField(null=True)
+
+    class Meta:
+        verbose_name = "Article Trend"
+        verbose_name_plural = "Article Trends"
+
+    def __str__(self):
+        return f"{self.article_id}: {self.log_score:.3f}"
+
+
+class ArticleCitation(models.Model):
+    """Pre-rendered citation strings for an article, one column per format"""
+    article = models.OneToOneField(
+        Article,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rendered_citation'
+    )
+    plain = models.TextField()
+    apa = models.TextField()
+    mla = models.TextField()
+    chicago = models.TextField()
+    bibtex = models.TextField()
+    ris = models.TextField()
+    jats = models.TextField()
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Article Citation"
+        verbose_name_plural = "Article Citations"
+
+    def __str__(self):
+        return f"Citations for article {self.article_id}"
+
+
+class PendingView(models.Model):
+    """Article activity not yet added to its counters and trend score (see main.page_cache)"""
+    article = models.OneToOneField(
+        Article,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='pending_views'
+    )
+    views = models.PositiveIntegerField(default=0)
+    trend_weight = models.PositiveIntegerField(
+        default=0,
+        help_text="Weight of counted views and downloads not yet in the trend score"
+    )
+
+    class Meta:
+        verbose_name = "Pending View"
+        verbose_name_plural = "Pending Views"
+
+    def __str__(self):
+        return f"{self.article_id}: +{self.views}, trend +{self.trend_weight}"
+
+
+class ArticleSummary(models.Model):
+    """Narrow, preformatted copy of an article for list pages (maintained by main.summaries)"""
+    article = models.OneToOneField(
+        Article,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='summary'
+    )
+    title = models.CharField(max_length=500)
+    subtitle = models.CharField(max_length=300, blank=True)
+    authors_display = models.TextField(blank=True, help_text="Author names joined with commas")
+    author_list = models.JSONField(default=list, help_text="[{'id': ..., 'name': ...}] in author order")
+    excerpt = models.TextField(blank=True, help_text="Plain-text start of the abstract")
+
+    journal_id = models.IntegerField(null=True, db_index=True)
+    journal_title = models.CharField(max_length=255, blank=True)
+    journal_slug = models.CharField(max_length=100, blank=True)
+    issue_id = models.IntegerField(null=True, db_index=True)
+    issue_citation = models.CharField(max_length=100, blank=True, help_text="Jild 1, Son 2")
+
+    date_published = models.DateField()
+    first_page = models.PositiveIntegerField(null=True)
+    last_page = models.PositiveIntegerField(null=True)
+    doi = models.CharField(max_length=100, blank=True)
+    views = models.PositiveIntegerField(default=0)
+    downloads = models.PositiveIntegerField(default=0)
+    is_published = models.BooleanField(default=True)
+    featured = models.BooleanField(default=False)
+    open_access = models.BooleanField(default=True)
+    has_pdf = models.BooleanField(default=False)
+    language = models.CharField(max_length=10, default='en')
+
+    class Meta:
+        verbose_name = "Article Summary"
+        verbose_name_plural = "Article Summaries"
+        indexes = [
+            models.Index(fields=['date_published', 'article']),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class ArticleFacetCount(models.Model):
+    """Published article count for one facet combination (maintained by main.facets)"""
+    journal = models.ForeignKey(Journal, on_delete=models.CASCADE, null=True, related_name='+')
+    year = models.PositiveIntegerField()
+    language = models.CharField(max_length=10)
+    open_access = models.BooleanField()
+    featured = models.BooleanField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Article Facet Count"
+        verbose_name_plural = "Article Facet Counts"
+        unique_together = ['journal', 'year', 'language', 'open_access', 'featured']
+
+    def __str__(self):
+        return f"{self.journal_id}/{self.year}/{self.language}: {self.count}"
+
+
 class SiteSEO(models.Model):
     meta_title = models.CharField(max_length=200, blank=True, null=True, help_text="Site-wide meta title")
     meta_description = models.TextField(blank=True, null=True, help_text="Site-wide meta description")
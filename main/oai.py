@@ -0,0 +1,493 @@
+"""
+OAI-PMH 2.0 data provider.
+
+Harvesters get published articles as Dublin Core (oai_dc) or JATS front
+matter. List verbs page with keyset resumption tokens on (updated_at, id),
+so deep pages cost the same as the first one. A record's datestamp is the
+article's updated_at, which touch_oai_datestamps also advances when its
+authors, issue or journal change; record XML is cached under that stamp,
+so a changed record is rebuilt on any host without explicit invalidation.
+"""
+import base64
+import json
+import logging
+from datetime import datetime, time, timezone as dt_timezone
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min, Q
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from lxml import etree
+
+from .citations import with_citation_data
+from .config import SITE_DOMAIN
+from .crossref import article_resource_url
+from .models import Article, Journal, SiteSEO
+
+logger = logging.getLogger(__name__)
+
+OAI_NS = 'http://www.openarchives.org/OAI/2.0/'
+OAI_DC_NS = 'http://www.openarchives.org/OAI/2.0/oai_dc/'
+DC_NS = 'http://purl.org/dc/elements/1.1/'
+XSI_NS = 'http://www.w3.org/2001/XMLSchema-instance'
+XML_NS = 'http://www.w3.org/XML/1998/namespace'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+
+METADATA_FORMATS = {
+    'oai_dc': {
+        'schema': 'http://www.openarchives.org/OAI/2.0/oai_dc.xsd',
+        'namespace': OAI_DC_NS,
+    },
+    'jats': {
+        'schema': 'https://jats.nlm.nih.gov/publishing/1.2/xsd/JATS-journalpublishing1.xsd',
+        'namespace': 'http://jats.nlm.nih.gov',
+    },
+}
+
+PAGE_SIZE = 100
+RECORD_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+DATESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+VERB_ARGUMENTS = {
+    'Identify': (set(), set()),
+    'ListMetadataFormats': (set(), {'identifier'}),
+    'ListSets': (set(), {'resumptionToken'}),
+    'GetRecord': ({'identifier', 'metadataPrefix'}, set()),
+    'ListIdentifiers': ({'metadataPrefix'}, {'from', 'until', 'set', 'resumptionToken'}),
+    'ListRecords': ({'metadataPrefix'}, {'from', 'until', 'set', 'resumptionToken'}),
+}
+
+
+class OAIError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def _q(tag, ns=OAI_NS):
+    return f'{{{ns}}}{tag}'
+
+
+def _sub(parent, tag, text=None, ns=OAI_NS, **attrib):
+    el = etree.SubElement(parent, _q(tag, ns) if ns else tag, attrib)
+    if text not in (None, ''):
+        el.text = str(text)
+    return el
+
+
+def _datestamp(value):
+    return value.astimezone(dt_timezone.utc).strftime(DATESTAMP_FORMAT)
+
+
+def repository_id(request):
+    return urlparse(SITE_DOMAIN or '').netloc or request.get_host().split(':')[0]
+
+
+def oai_identifier(request, article_id):
+    return f"oai:{repository_id(request)}:article/{article_id}"
+
+
+def _parse_identifier(request, identifier):
+    prefix = f"oai:{repository_id(request)}:article/"
+    if not identifier.startswith(prefix) or not identifier[len(prefix):].isdigit():
+        raise OAIError('idDoesNotExist', f"Unknown identifier: {identifier}")
+    return int(identifier[len(prefix):])
+
+
+def _parse_datestamp(value, end_of_day=False):
+    """Parse a from/until argument; returns (aware datetime, granularity)"""
+    try:
+        if len(value) == 10:
+            day = datetime.strptime(value, '%Y-%m-%d').date()
+            parsed = datetime.combine(day, time.max if end_of_day else time.min)
+            return parsed.replace(tzinfo=dt_timezone.utc), 'day'
+        parsed = datetime.strptime(value, DATESTAMP_FORMAT)
+        if end_of_day:
+            # Datestamps are shown to the second: "until" covers the whole second
+            parsed = parsed.replace(microsecond=999999)
+        return parsed.replace(tzinfo=dt_timezone.utc), 'seconds'
+    except ValueError:
+        raise OAIError('badArgument', f"Invalid datestamp: {value}")
+
+
+def encode_token(state):
+    raw = json.dumps(state, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _token_datestamp(value):
+    if value is None:
+        return None
+    datetime.fromisoformat(value)
+    return value
+
+
+def decode_token(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(state['prefix'], str) or not isinstance(state['set'], (str, type(None))):
+            raise TypeError(state)
+        state['from'] = _token_datestamp(state['from'])
+        state['until'] = _token_datestamp(state['until'])
+        state['after'] = (datetime.fromisoformat(state['after'][0]), int(state['after'][1]))
+        return state
+    except (ValueError, KeyError, TypeError, IndexError, AttributeError):
+        raise OAIError('badResumptionToken', "Invalid resumption token")
+
+
+def record_cache_key(repo_id, prefix, article_id, updated_at):
+    return f"oai:record:{repo_id}:{prefix}:{article_id}:{updated_at.timestamp()}"
+
+
+def touch_oai_datestamps(article_ids):
+    """Advance the datestamps of the given articles so harvesters (and the record cache) see them as changed"""
+    Article.objects.filter(id__in=list(article_ids)).update(updated_at=timezone.now())
+
+
+# Metadata builders
+
+def _fill_header(header, request, article):
+    _sub(header, 'identifier', oai_identifier(request, article.id))
+    _sub(header, 'datestamp', _datestamp(article.updated_at))
+    if article.issue:
+        _sub(header, 'setSpec', f"journal:{article.issue.journal.url_slug}")
+    return header
+
+
+def _dublin_core(parent, article):
+    dc = etree.SubElement(parent, _q('dc', OAI_DC_NS), nsmap={'oai_dc': OAI_DC_NS, 'dc': DC_NS, 'xsi': XSI_NS})
+    dc.set(_q('schemaLocation', XSI_NS), f"{OAI_DC_NS} {METADATA_FORMATS['oai_dc']['schema']}")
+    issue = article.issue
+
+    _sub(dc, 'title', article.title, ns=DC_NS)
+    for aa in article.ordered_authors:
+        _sub(dc, 'creator', aa.author.reverse_name, ns=DC_NS)
+    for keyword in article.get_keywords_list():
+        if keyword:
+            _sub(dc, 'subject', keyword, ns=DC_NS)
+    _sub(dc, 'description', article.abstract, ns=DC_NS)
+    if issue:
+        _sub(dc, 'publisher', issue.journal.publisher or 'Imfaktor', ns=DC_NS)
+    _sub(dc, 'date', article.date_published.isoformat(), ns=DC_NS)
+    _sub(dc, 'type', 'info:eu-repo/semantics/article', ns=DC_NS)
+    _sub(dc, 'type', 'Text', ns=DC_NS)
+    if article.main_pdf_id:
+        _sub(dc, 'format', 'application/pdf', ns=DC_NS)
+    _sub(dc, 'identifier', article_resource_url(article), ns=DC_NS)
+    if article.doi:
+        _sub(dc, 'identifier', f"https://doi.org/{article.doi}", ns=DC_NS)
+    if issue:
+        source = f"{issue.journal.title}; {issue.full_citation}"
+        if article.page_range:
+            source += f"; {article.page_range}"
+        _sub(dc, 'source', source, ns=DC_NS)
+        for issn in (issue.journal.issn_print, issue.journal.issn_online):
+            if issn:
+                _sub(dc, 'source', issn, ns=DC_NS)
+    _sub(dc, 'language', article.language, ns=DC_NS)
+    if article.open_access:
+        _sub(dc, 'rights', 'info:eu-repo/semantics/openAccess', ns=DC_NS)
+
+
+def _jats(parent, article):
+    root = etree.SubElement(parent, 'article', {'article-type': 'research-article'},
+                            nsmap={'xsi': XSI_NS, 'xlink': XLINK_NS})
+    root.set(_q('lang', XML_NS), article.language)
+    root.set(_q('schemaLocation', XSI_NS),
+             f"{METADATA_FORMATS['jats']['namespace']} {METADATA_FORMATS['jats']['schema']}")
+    front = _sub(root, 'front', ns=None)
+    issue = article.issue
+
+    if issue:
+        journal = issue.journal
+        journal_meta = _sub(front, 'journal-meta', ns=None)
+        _sub(_sub(journal_meta, 'journal-title-group', ns=None), 'journal-title', journal.title, ns=None)
+        if journal.issn_print:
+            _sub(journal_meta, 'issn', journal.issn_print, ns=None, **{'pub-type': 'ppub'})
+        if journal.issn_online:
+            _sub(journal_meta, 'issn', journal.issn_online, ns=None, **{'pub-type': 'epub'})
+        _sub(_sub(journal_meta, 'publisher', ns=None), 'publisher-name', journal.publisher or 'Imfaktor', ns=None)
+
+    meta = _sub(front, 'article-meta', ns=None)
+    if article.doi:
+        _sub(meta, 'article-id', article.doi, ns=None, **{'pub-id-type': 'doi'})
+    title_group = _sub(meta, 'title-group', ns=None)
+    _sub(title_group, 'article-title', article.title, ns=None)
+    if article.subtitle:
+        _sub(title_group, 'subtitle', article.subtitle, ns=None)
+
+    if article.ordered_authors:
+        contrib_group = _sub(meta, 'contrib-group', ns=None)
+        for aa in article.ordered_authors:
+            author = aa.author
+            contrib = _sub(contrib_group, 'contrib', ns=None, **{'contrib-type': 'author'})
+            if aa.is_corresponding:
+                contrib.set('corresp', 'yes')
+            if author.orcid:
+                _sub(contrib, 'contrib-id', author.orcid, ns=None, **{'contrib-id-type': 'orcid'})
+            name = _sub(contrib, 'name', ns=None)
+            _sub(name, 'surname', author.last_name, ns=None)
+            _sub(name, 'given-names', ' '.join(p for p in [author.first_name, author.middle_name] if p), ns=None)
+            if author.affiliation:
+                _sub(contrib, 'aff', author.affiliation, ns=None)
+
+    pub_date = _sub(meta, 'pub-date', ns=None, **{'pub-type': 'epub'})
+    _sub(pub_date, 'day', f"{article.date_published.day:02d}", ns=None)
+    _sub(pub_date, 'month', f"{article.date_published.month:02d}", ns=None)
+    _sub(pub_date, 'year', article.date_published.year, ns=None)
+    if issue:
+        _sub(meta, 'volume', issue.volume, ns=None)
+        _sub(meta, 'issue', issue.number, ns=None)
+    if article.first_page:
+        _sub(meta, 'fpage', article.first_page, ns=None)
+    if article.last_page:
+        _sub(meta, 'lpage', article.last_page, ns=None)
+    _sub(meta, 'self-uri', ns=None, **{_q('href', XLINK_NS): article_resource_url(article)})
+    if article.abstract:
+        _sub(_sub(meta, 'abstract', ns=None), 'p', article.abstract, ns=None)
+    keywords = [k for k in article.get_keywords_list() if k]
+    if keywords:
+        kwd_group = _sub(meta, 'kwd-group', ns=None)
+        for keyword in keywords:
+            _sub(kwd_group, 'kwd', keyword, ns=None)
+
+
+METADATA_BUILDERS = {
+    'oai_dc': _dublin_core,
+    'jats': _jats,
+}
+
+
+def build_record(request, article, prefix, header_only=False):
+    """Serialize one <record> (or bare <header>) element as a string"""
+    if header_only:
+        root = _fill_header(etree.Element(_q('header'), nsmap={None: OAI_NS}), request, article)
+    else:
+        root = etree.Element(_q('record'), nsmap={None: OAI_NS})
+        _fill_header(_sub(root, 'header'), request, article)
+        METADATA_BUILDERS[prefix](_sub(root, 'metadata'), article)
+    return etree.tostring(root, encoding='unicode')
+
+
+def cached_records(request, stamps, prefix):
+    """Record XML for many [(article id, updated_at)]; misses are built in one prefetched batch"""
+    repo_id = repository_id(request)
+    keys = {article_id: record_cache_key(repo_id, prefix, article_id, updated_at) for article_id, updated_at in stamps}
+    found = cache.get_many(list(keys.values()))
+
+    records = {}
+    missing = []
+    for article_id, key in keys.items():
+        if key in found:
+            records[article_id] = found[key]
+        else:
+            missing.append(article_id)
+
+    if missing:
+        fresh = {}
+        for article in with_citation_data(Article.objects.filter(id__in=missing)):
+            records[article.id] = build_record(request, article, prefix)
+            fresh[keys[article.id]] = records[article.id]
+        cache.set_many(fresh, RECORD_CACHE_TIMEOUT)
+
+    return [records[article_id] for article_id in keys if article_id in records]
+
+
+# Verb handlers return (verb element children as XML strings, request args)
+
+def _published_articles():
+    return Article.objects.filter(is_published=True)
+
+
+def identify(request, args):
+    root = etree.Element(_q('Identify'), nsmap={None: OAI_NS})
+    seo = SiteSEO.objects.first()
+    earliest = _published_articles().aggregate(earliest=Min('updated_at'))['earliest']
+
+    _sub(root, 'repositoryName', (seo.meta_title if seo and seo.meta_title else 'Imfaktor'))
+    _sub(root, 'baseURL', request.build_absolute_uri(reverse('oai_pmh')))
+    _sub(root, 'protocolVersion', '2.0')
+    _sub(root, 'adminEmail', settings.DEFAULT_FROM_EMAIL)
+    _sub(root, 'earliestDatestamp', _datestamp(earliest) if earliest else '1970-01-01T00:00:00Z')
+    _sub(root, 'deletedRecord', 'no')
+    _sub(root, 'granularity', 'YYYY-MM-DDThh:mm:ssZ')
+    return etree.tostring(root, encoding='unicode')
+
+
+def list_metadata_formats(request, args):
+    if 'identifier' in args:
+        article_id = _parse_identifier(request, args['identifier'])
+        if not _published_articles().filter(id=article_id).exists():
+            raise OAIError('idDoesNotExist', f"Unknown identifier: {args['identifier']}")
+
+    root = etree.Element(_q('ListMetadataFormats'), nsmap={None: OAI_NS})
+    for prefix, fmt in METADATA_FORMATS.items():
+        el = _sub(root, 'metadataFormat')
+        _sub(el, 'metadataPrefix', prefix)
+        _sub(el, 'schema', fmt['schema'])
+        _sub(el, 'metadataNamespace', fmt['namespace'])
+    return etree.tostring(root, encoding='unicode')
+
+
+def list_sets(request, args):
+    if 'resumptionToken' in args:
+        raise OAIError('badResumptionToken', "ListSets is returned in full")
+
+    root = etree.Element(_q('ListSets'), nsmap={None: OAI_NS})
+    for journal in Journal.objects.filter(is_active=True).only('title', 'url_slug').order_by('title'):
+        el = _sub(root, 'set')
+        _sub(el, 'setSpec', f"journal:{journal.url_slug}")
+        _sub(el, 'setName', journal.title)
+    return etree.tostring(root, encoding='unicode')
+
+
+def get_record(request, args):
+    prefix = args['metadataPrefix']
+    if prefix not in METADATA_FORMATS:
+        raise OAIError('cannotDisseminateFormat', f"Unsupported metadataPrefix: {prefix}")
+
+    article_id = _parse_identifier(request, args['identifier'])
+    stamps = list(_published_articles().filter(id=article_id).values_list('id', 'updated_at'))
+    if not stamps:
+        raise OAIError('idDoesNotExist', f"Unknown identifier: {args['identifier']}")
+
+    return f'<GetRecord xmlns="{OAI_NS}">{"".join(cached_records(request, stamps, prefix))}</GetRecord>'
+
+
+def _list_state(args):
+    """Harvest state from either a resumption token or fresh arguments"""
+    if 'resumptionToken' in args:
+        return decode_token(args['resumptionToken'])
+
+    state = {'prefix': args['metadataPrefix'], 'set': args.get('set'), 'from': None, 'until': None, 'after': None}
+    granularities = set()
+    if 'from' in args:
+        parsed, granularity = _parse_datestamp(args['from'])
+        state['from'] = parsed.isoformat()
+        granularities.add(granularity)
+    if 'until' in args:
+        parsed, granularity = _parse_datestamp(args['until'], end_of_day=True)
+        state['until'] = parsed.isoformat()
+        granularities.add(granularity)
+    if len(granularities) > 1:
+        raise OAIError('badArgument', "from and until must have the same granularity")
+    return state
+
+
+def _list(request, args, verb):
+    state = _list_state(args)
+    prefix = state['prefix']
+    if prefix not in METADATA_FORMATS:
+        raise OAIError('cannotDisseminateFormat', f"Unsupported metadataPrefix: {prefix}")
+
+    articles = _published_articles()
+    if state['set']:
+        if not state['set'].startswith('journal:'):
+            raise OAIError('noRecordsMatch', f"Unknown set: {state['set']}")
+        articles = articles.filter(issue__journal__url_slug=state['set'][len('journal:'):])
+    if state['from']:
+        articles = articles.filter(updated_at__gte=datetime.fromisoformat(state['from']))
+    if state['until']:
+        articles = articles.filter(updated_at__lte=datetime.fromisoformat(state['until']))
+    if state['after']:
+        after_ts, after_id = state['after']
+        articles = articles.filter(Q(updated_at__gt=after_ts) | Q(updated_at=after_ts, id__gt=after_id))
+
+    page = list(articles.order_by('updated_at', 'id').values_list('id', 'updated_at')[:PAGE_SIZE + 1])
+    if not page:
+        raise OAIError('noRecordsMatch', "No records match the request")
+
+    has_more = len(page) > PAGE_SIZE
+    page = page[:PAGE_SIZE]
+    article_ids = [article_id for article_id, _ in page]
+
+    if verb == 'ListIdentifiers':
+        header_articles = (Article.objects.filter(id__in=article_ids)
+                           .select_related('issue__journal')
+                           .only('id', 'updated_at', 'issue__journal__url_slug'))
+        by_id = {article.id: article for article in header_articles}
+        items = [build_record(request, by_id[article_id], prefix, header_only=True)
+                 for article_id in article_ids if article_id in by_id]
+    else:
+        items = cached_records(request, page, prefix)
+
+    token = ''
+    if has_more:
+        last_id, last_ts = page[-1]
+        next_state = dict(state, after=[last_ts.isoformat(), last_id])
+        token = encode_token(next_state)
+    if has_more or 'resumptionToken' in args:
+        items.append(f'<resumptionToken xmlns="{OAI_NS}">{token}</resumptionToken>')
+
+    return f'<{verb} xmlns="{OAI_NS}">{"".join(items)}</{verb}>'
+
+
+VERBS = {
+    'Identify': identify,
+    'ListMetadataFormats': list_metadata_formats,
+    'ListSets': list_sets,
+    'GetRecord': get_record,
+    'ListIdentifiers': lambda request, args: _list(request, args, 'ListIdentifiers'),
+    'ListRecords': lambda request, args: _list(request, args, 'ListRecords'),
+}
+
+
+def _validate_arguments(params):
+    verb = params.get('verb')
+    if not verb or verb not in VERBS:
+        raise OAIError('badVerb', "Illegal or missing verb")
+    if any(len(values) > 1 for _, values in params.lists()):
+        raise OAIError('badArgument', "Repeated arguments are not allowed")
+
+    args = {key: value for key, value in params.items() if key != 'verb'}
+    required, optional = VERB_ARGUMENTS[verb]
+    if 'resumptionToken' in args and verb in ('ListIdentifiers', 'ListRecords'):
+        if set(args) != {'resumptionToken'}:
+            raise OAIError('badArgument', "resumptionToken is an exclusive argument")
+        return verb, args
+
+    unknown = set(args) - required - optional
+    if unknown:
+        raise OAIError('badArgument', f"Illegal arguments: {', '.join(sorted(unknown))}")
+    if required - set(args):
+        raise OAIError('badArgument', f"Missing arguments: {', '.join(sorted(required - set(args)))}")
+    return verb, args
+
+
+@csrf_exempt
+def oai_pmh(request):
+    """OAI-PMH 2.0 endpoint"""
+    params = request.POST if request.method == 'POST' else request.GET
+    base_url = request.build_absolute_uri(reverse('oai_pmh'))
+
+    request_el = etree.Element(_q('request'), nsmap={None: OAI_NS})
+    request_el.text = base_url
+    try:
+        verb, args = _validate_arguments(params)
+        for key, value in params.items():
+            request_el.set(key, value)
+        body = VERBS[verb](request, args)
+    except OAIError as e:
+        error = etree.Element(_q('error'), {'code': e.code}, nsmap={None: OAI_NS})
+        error.text = e.message
+        body = etree.tostring(error, encoding='unicode')
+    except Exception as e:
+        logger.error(f"Error in OAI-PMH request: {e}")
+        return HttpResponse("Error processing OAI-PMH request", status=500)
+
+    content = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<OAI-PMH xmlns="{OAI_NS}" xmlns:xsi="{XSI_NS}" '
+        f'xsi:schemaLocation="{OAI_NS} http://www.openarchives.org/OAI/2.0/OAI-PMH.xsd">'
+        f'<responseDate>{timezone.now().astimezone(dt_timezone.utc).strftime(DATESTAMP_FORMAT)}</responseDate>'
+        f'{etree.tostring(request_el, encoding="unicode")}'
+        f'{body}'
+        '</OAI-PMH>'
+    )
+    return HttpResponse(content, content_type='text/xml; charset=utf-8')
@@ -0,0 +1,209 @@
+"""
+Full-page cache for anonymous visitors.
+
+A rendered page is stored together with the content versions of the scopes
+it was built from ('site', 'journal:<id>', 'author:<id>'). Signals bump the
+versions on editorial changes, so a hit is served only while every scope
+it depends on is unchanged, and editing one journal leaves the other
+journals' pages cached.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.http import HttpResponse
+
+from .counters import add_view_totals
+from .models import Article, PendingView
+from .singleflight import LOCK_WAIT, flight_lock
+
+PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+VIEW_FLUSH_SECONDS = 60
+VIEW_FLUSH_KEY = 'views:flushed'
+
+SITE_SCOPE = 'site'
+
+
+def journal_scope(journal_id):
+    return f"journal:{journal_id}"
+
+
+def author_scope(author_id):
+    return f"author:{author_id}"
+
+
+def _version_key(scope):
+    return f"content-version:{scope}"
+
+
+def _page_key(request):
+    return f"page:{hashlib.md5(request.build_absolute_uri().encode()).hexdigest()}"
+
+
+def bump_content_version(journal_ids=(), author_ids=()):
+    """Invalidate cached pages built from the given journals/authors (and site-wide pages)"""
+    scopes = [SITE_SCOPE]
+    scopes += [journal_scope(journal_id) for journal_id in set(journal_ids) if journal_id]
+    scopes += [author_scope(author_id) for author_id in set(author_ids) if author_id]
+    bump_scopes(scopes)
+
+
+def bump_scopes(scopes):
+    """Invalidate cached pages built from any of the given scopes"""
+    version = time.time_ns()
+    cache.set_many({_version_key(scope): version for scope in scopes}, None)
+
+
+def current_versions(scopes):
+    keys = {scope: _version_key(scope) for scope in scopes}
+    found = cache.get_many(list(keys.values()))
+    missing = {key: time.time_ns() for key in keys.values() if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return {scope: found[key] for scope, key in keys.items()}
+
+
+def page_depends_on(request, *scopes):
+    """Record the scopes a page is built from; call before reading its data"""
+    versions = getattr(request, '_page_versions', None)
+    if versions is not None:
+        versions.update(current_versions(scopes))
+
+
+def _is_cacheable_request(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.session.get('is_admin') or request.user.is_authenticated:
+        return False
+    return not get_messages(request)
+
+
+def _is_current(entry):
+    versions = entry['versions']
+    current = cache.get_many([_version_key(scope) for scope in versions])
+    return all(current.get(_version_key(scope)) == version for scope, version in versions.items())
+
+
+def cache_public_page(on_hit=None, single_flight=False):
+    """
+    Serve anonymous GETs from the page cache while their content versions
+    are current. on_hit(request, **kwargs) runs instead of the view's own
+    side effects (such as view counters) when a cached copy is served.
+
+    With single_flight, only one worker re-renders an outdated page; the
+    others keep serving the previous copy until it is replaced.
+    """
+    def decorator(view_func):
+        def render_and_store(key, request, *args, **kwargs):
+            request._page_versions = {}
+            response = view_func(request, *args, **kwargs)
+            if (response.status_code == 200 and not response.streaming
+                    and not response.cookies and request._page_versions):
+                cache.set(key, {
+                    'versions': request._page_versions,
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                }, PAGE_CACHE_TIMEOUT)
+            return response
+
+        def serve(entry, request, *args, **kwargs):
+            if on_hit:
+                on_hit(request, *args, **kwargs)
+            return HttpResponse(entry['content'], content_type=entry['content_type'])
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_key(request)
+            entry = cache.get(key)
+            if entry is not None and _is_current(entry):
+                return serve(entry, request, *args, **kwargs)
+            if not single_flight:
+                return render_and_store(key, request, *args, **kwargs)
+
+            with flight_lock(key, wait=0 if entry is not None else LOCK_WAIT) as acquired:
+                if not acquired and entry is not None:
+                    return serve(entry, request, *args, **kwargs)
+                latest = cache.get(key)
+                if latest is not None and _is_current(latest):
+                    return serve(latest, request, *args, **kwargs)
+                return render_and_store(key, request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# View counts for pages served from cache are buffered in PendingView and
+# added to the counters in batches, together with the trend weight of the
+# views and downloads counted directly (main.trending.record_activity): by the
+# first event after VIEW_FLUSH_SECONDS, and by the flush_view_counts command
+# (run it from cron so quiet articles are counted too)
+
+def _add_pending(article_id, views=0, trend_weight=0):
+    pending = PendingView.objects.filter(article_id=article_id)
+    increments = {'views': F('views') + views, 'trend_weight': F('trend_weight') + trend_weight}
+    if pending.update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            PendingView.objects.create(article_id=article_id, views=views, trend_weight=trend_weight)
+    except IntegrityError:
+        # Another worker created the row first
+        pending.update(**increments)
+
+
+def _flush_when_due():
+    if cache.add(VIEW_FLUSH_KEY, True, VIEW_FLUSH_SECONDS):
+        flush_pending_views()
+
+
+def count_cached_view(request, article_id):
+    _add_pending(article_id, views=1)
+    _flush_when_due()
+
+
+def add_pending_trend_weight(article_ids, weight):
+    """Queue trend weight of already counted events for the next flush"""
+    for article_id in set(article_ids):
+        _add_pending(article_id, trend_weight=weight)
+    _flush_when_due()
+
+
+def flush_pending_views(article_ids=None):
+    """
+    Add buffered view counts to the articles without firing save signals and
+    buffered trend weights to the trend scores; returns the number of views
+    added. Only the amounts read are subtracted from the buffer, so events
+    counted meanwhile stay for the next flush.
+    """
+    from .trending import VIEW_WEIGHT, add_trend_weight, refresh_trending_lists
+
+    pending = PendingView.objects.filter(Q(views__gt=0) | Q(trend_weight__gt=0))
+    if article_ids is not None:
+        pending = pending.filter(article_id__in=list(article_ids))
+    with transaction.atomic():
+        by_amounts = {}
+        for article_id, views, trend_weight in (
+            pending.select_for_update().values_list('article_id', 'views', 'trend_weight')
+        ):
+            by_amounts.setdefault((views, trend_weight), []).append(article_id)
+        # Rows with equal amounts share one UPDATE per table
+        for (views, trend_weight), ids in by_amounts.items():
+            if views:
+                Article.objects.filter(id__in=ids).update(views=F('views') + views)
+                add_view_totals(ids, views=views)
+            add_trend_weight(ids, views * VIEW_WEIGHT + trend_weight)
+            PendingView.objects.filter(article_id__in=ids).update(
+                views=F('views') - views,
+                trend_weight=F('trend_weight') - trend_weight,
+            )
+        PendingView.objects.filter(views=0, trend_weight=0).delete()
+    if by_amounts:
+        refresh_trending_lists()
+    return sum(views * len(ids) for (views, _), ids in by_amounts.items())
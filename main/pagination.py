@@ -0,0 +1,163 @@
+"""
+Keyset (cursor) pagination.
+
+A page is addressed by an opaque token holding the sort key of the row next
+to the page boundary, so every page - the first or the thousandth - is an
+indexed range scan of ``per_page + 1`` rows with no OFFSET. Totals are
+optional: they come from a COUNT cached under the site content version,
+which is close enough for a "~N results" label and costs nothing on repeat.
+"""
+import base64
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from .page_cache import SITE_SCOPE, current_versions
+
+ARTICLE_ORDERING = ('-date_published', '-id')
+AUTHOR_ORDERING = ('last_name', 'first_name', 'id')
+ISSUE_ORDERING = ('-year', '-volume', '-number', '-id')
+INSTITUTION_ORDERING = ('key', 'id')
+COUNT_CACHE_TIMEOUT = 60 * 10
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class CursorPage:
+    """One page of a keyset-paginated queryset"""
+
+    def __init__(self, object_list, next_token=None, previous_token=None, approximate_count=None):
+        self.object_list = object_list
+        self.next_token = next_token
+        self.previous_token = previous_token
+        self.approximate_count = approximate_count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_token is not None
+
+    def has_previous(self):
+        return self.previous_token is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def pagination_data(self):
+        """Navigation block for JSON responses"""
+        return {
+            'has_next': self.has_next(),
+            'has_previous': self.has_previous(),
+            'next': self.next_token,
+            'previous': self.previous_token,
+            'total_count': self.approximate_count,
+        }
+
+
+def _key_fields(ordering):
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def _row_value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def encode_cursor(row, ordering, direction):
+    values = [_row_value(row, name) for name, _ in _key_fields(ordering)]
+    payload = json.dumps([direction, values], cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, model, ordering):
+    """Return (direction, key values) or None for a missing or malformed token"""
+    if not token:
+        return None
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, values = json.loads(payload)
+        fields = _key_fields(ordering)
+        if direction not in (NEXT, PREVIOUS) or len(values) != len(fields):
+            return None
+        return direction, [
+            model._meta.get_field(name).to_python(value) for (name, _), value in zip(fields, values)
+        ]
+    except (ValueError, TypeError, ValidationError, FieldDoesNotExist):
+        return None
+
+
+def _beyond(ordering, values, backward):
+    """Rows strictly after the given key in ``ordering`` (before it when ``backward``)"""
+    condition = Q()
+    equal = Q()
+    for (name, descending), value in zip(_key_fields(ordering), values):
+        lookup = 'lt' if descending != backward else 'gt'
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def _reversed(ordering):
+    return [name[1:] if name.startswith('-') else f"-{name}" for name in ordering]
+
+
+def approximate_count(queryset):
+    """Row count cached until the next content change (or a few minutes)"""
+    queryset = queryset.order_by()
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    version = current_versions([SITE_SCOPE])[SITE_SCOPE]
+    key = f"pagination:count:{hashlib.md5(f'{sql}|{params!r}|{version}'.encode()).hexdigest()}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def paginate(queryset, token, per_page, ordering=ARTICLE_ORDERING, with_count=False):
+    """
+    Return the CursorPage addressed by ``token`` (the first page when the
+    token is empty or stale). ``ordering`` must end in a unique column.
+    """
+    cursor = decode_cursor(token, queryset.model, ordering)
+    backward = bool(cursor) and cursor[0] == PREVIOUS
+    rows = queryset.order_by(*(_reversed(ordering) if backward else ordering))
+    if cursor:
+        rows = rows.filter(_beyond(ordering, cursor[1], backward))
+    rows = list(rows[:per_page + 1])
+
+    if cursor and not rows:
+        return paginate(queryset, None, per_page, ordering, with_count)
+
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backward:
+        rows.reverse()
+    has_next = backward or more
+    has_previous = more if backward else bool(cursor)
+
+    return CursorPage(
+        rows,
+        next_token=encode_cursor(rows[-1], ordering, NEXT) if has_next and rows else None,
+        previous_token=encode_cursor(rows[0], ordering, PREVIOUS) if has_previous and rows else None,
+        approximate_count=approximate_count(queryset) if with_count else None,
+    )
+
+
+def paginate_request(request, queryset, per_page, ordering=ARTICLE_ORDERING, with_count=False):
+    """paginate() driven by the ``cursor`` query parameter"""
+    return paginate(queryset, request.GET.get('cursor'), per_page, ordering, with_count)
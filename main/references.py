@@ -0,0 +1,204 @@
+"""
+Internal citation graph.
+
+Article.references is free text. It is split into entries (numbered "1.",
+"[1]", "1)" or bulleted lines, otherwise one entry per line), and every
+entry is resolved against the articles on the site: first by DOI, then by
+a fuzzy title key - the script-folded words of a title (see
+main.transliteration), looked up by their first TITLE_PREFIX_WORDS words
+and accepted at TITLE_SIMILARITY. Resolved references are stored as
+CitationEdge rows and Article.citation_count counts the edges coming from
+published articles, so a citation count is read straight off the article.
+
+Signals re-parse an article when its references change, against a shared
+copy of the index that a single worker rebuilds every INDEX_TIMEOUT, so a
+save never scans the corpus itself. The rebuild_citation_graph command
+re-parses the whole corpus with a pool of worker processes, which also picks
+up references to articles (or DOIs and titles) added after the citing
+article was saved.
+"""
+import html
+import multiprocessing
+import re
+from difflib import SequenceMatcher
+
+from django.db import connections, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.html import strip_tags
+
+from .author_metrics import rebuild_author_metrics, refresh_author_metrics
+from .models import Article, ArticleAuthor, CitationEdge
+from .page_cache import bump_content_version
+from .singleflight import single_flight
+from .transliteration import fold
+
+DOI_PATTERN = re.compile(r'\b10\.\d{4,9}/[^\s"<>]+', re.IGNORECASE)
+_ENTRY_MARKER = re.compile(r'^\s*(?:\[\d+\]|\d+[.)]|[-•*–])\s+')
+_DOI_TRAILING = '.,;:)]}>\'"'
+
+# Shorter titles ("Introduction") are too generic to match on
+MIN_TITLE_WORDS = 4
+TITLE_PREFIX_WORDS = 3
+TITLE_SIMILARITY = 0.9
+PARSE_CHUNK = 200
+INDEX_KEY = 'references:index'
+INDEX_TIMEOUT = 60 * 60
+BATCH_SIZE = 1000
+
+
+def split_references(text):
+    """Individual reference entries of a reference list"""
+    lines = [line.strip() for line in html.unescape(strip_tags(text or '')).splitlines()]
+    lines = [line for line in lines if line]
+    if not any(_ENTRY_MARKER.match(line) for line in lines):
+        return lines
+    entries = []
+    for line in lines:
+        if _ENTRY_MARKER.match(line) or not entries:
+            entries.append(_ENTRY_MARKER.sub('', line))
+        else:
+            # A wrapped line continues the previous entry
+            entries[-1] = f"{entries[-1]} {line}"
+    return entries
+
+
+def normalize_doi(doi):
+    return (doi or '').strip().rstrip(_DOI_TRAILING).lower()
+
+
+def extract_dois(entry):
+    return {normalize_doi(match) for match in DOI_PATTERN.findall(entry)}
+
+
+def title_key(title):
+    """Folded words of a title"""
+    return tuple(fold(title).split())
+
+
+class ReferenceIndex:
+    """DOIs and title keys of the site's articles"""
+
+    def __init__(self, articles):
+        self.dois = {}
+        self.titles = {}
+        for article_id, doi, title in articles:
+            if doi:
+                self.dois[normalize_doi(doi)] = article_id
+            words = title_key(title)
+            if len(words) >= MIN_TITLE_WORDS:
+                self.titles.setdefault(words[:TITLE_PREFIX_WORDS], []).append((' '.join(words), len(words), article_id))
+
+    @classmethod
+    def load(cls):
+        return cls(Article.objects.values_list('id', 'doi', 'title').iterator())
+
+    def match(self, entry):
+        """(article id, method) an entry refers to, or None"""
+        for doi in extract_dois(entry):
+            if doi in self.dois:
+                return self.dois[doi], CitationEdge.DOI
+        words = title_key(entry)
+        best = None
+        for start in range(len(words) - TITLE_PREFIX_WORDS + 1):
+            for key, length, article_id in self.titles.get(words[start:start + TITLE_PREFIX_WORDS], ()):
+                ratio = SequenceMatcher(None, ' '.join(words[start:start + length]), key).ratio()
+                if ratio >= TITLE_SIMILARITY and (best is None or ratio > best[0]):
+                    best = (ratio, article_id)
+        return (best[1], CitationEdge.TITLE) if best else None
+
+    def resolve(self, article_id, references):
+        """{cited article id: method} of one article's reference list, without self-citations"""
+        cited = {}
+        for entry in split_references(references):
+            found = self.match(entry)
+            if found and found[0] != article_id:
+                cited.setdefault(*found)
+        return cited
+
+
+def shared_index():
+    """The cached ReferenceIndex of the site's articles"""
+    return single_flight(INDEX_KEY, ReferenceIndex.load, INDEX_TIMEOUT)
+
+
+def refresh_citation_counts(article_ids=None):
+    articles = Article.objects.all() if article_ids is None else Article.objects.filter(id__in=article_ids)
+    articles.update(citation_count=Coalesce(Subquery(
+        CitationEdge.objects.filter(cited=OuterRef('pk'), citing__is_published=True)
+        .order_by().values('cited').annotate(n=Count('id')).values('n')
+    ), 0))
+
+
+def citations_changed(article_ids):
+    """Recount the given cited articles and their authors' metrics and invalidate the authors' pages"""
+    article_ids = set(article_ids)
+    if not article_ids:
+        return
+    refresh_citation_counts(article_ids)
+    author_ids = set(ArticleAuthor.objects.filter(article_id__in=article_ids).values_list('author_id', flat=True))
+    refresh_author_metrics(author_ids)
+    bump_content_version(author_ids=author_ids)
+
+
+def _edges(article_id, cited):
+    return [CitationEdge(citing_id=article_id, cited_id=cited_id, method=method) for cited_id, method in cited.items()]
+
+
+def reparse_articles(article_ids, index=None):
+    """Re-resolve the reference lists of the given articles; returns the number of edges stored"""
+    article_ids = list(article_ids)
+    if not article_ids:
+        return 0
+    index = index or shared_index()
+    edges = []
+    for article_id, references in Article.objects.filter(id__in=article_ids).values_list('id', 'references'):
+        edges += _edges(article_id, index.resolve(article_id, references))
+    with transaction.atomic():
+        previous = CitationEdge.objects.filter(citing_id__in=article_ids)
+        touched = set(previous.values_list('cited_id', flat=True))
+        previous.delete()
+        CitationEdge.objects.bulk_create(edges, batch_size=BATCH_SIZE)
+        citations_changed(touched | {edge.cited_id for edge in edges})
+    return len(edges)
+
+
+# Batch parsing: the index is handed to every worker process once
+
+_worker_index = None
+
+
+def _init_worker(index):
+    global _worker_index
+    _worker_index = index
+
+
+def _resolve_chunk(rows):
+    return [(article_id, _worker_index.resolve(article_id, references)) for article_id, references in rows]
+
+
+def rebuild_citation_graph(workers=None):
+    """Re-parse every reference list with ``workers`` processes; returns (articles parsed, edges)"""
+    index = ReferenceIndex.load()
+    rows = list(Article.objects.exclude(references__isnull=True).exclude(references='')
+                .order_by('id').values_list('id', 'references'))
+    chunks = [rows[start:start + PARSE_CHUNK] for start in range(0, len(rows), PARSE_CHUNK)]
+    workers = workers or multiprocessing.cpu_count()
+
+    if workers <= 1 or len(chunks) <= 1:
+        _init_worker(index)
+        results = [_resolve_chunk(chunk) for chunk in chunks]
+    else:
+        # Forked children must not share the parent's database connections
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(workers, _init_worker, (index,)) as pool:
+            results = pool.map(_resolve_chunk, chunks)
+
+    edges = [edge for chunk in results for article_id, cited in chunk for edge in _edges(article_id, cited)]
+    with transaction.atomic():
+        CitationEdge.objects.all().delete()
+        CitationEdge.objects.bulk_create(edges, batch_size=BATCH_SIZE)
+        refresh_citation_counts()
+        rebuild_author_metrics()
+    bump_content_version(author_ids=ArticleAuthor.objects.values_list('author_id', flat=True))
+    return len(rows), len(edges)
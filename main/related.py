@@ -0,0 +1,227 @@
+"""
+Related articles by TF-IDF similarity.
+
+An offline job (the build_related_articles command) turns the title,
+keywords and abstract of every published article into a sublinear TF-IDF
+vector over script-folded words, L2-normalized and stored as a sparse CSR
+matrix. Cosine similarities are computed a block of rows at a time through
+the matrix's column (term) postings, so only the block's similarity rows
+are ever held in memory. The RELATED_COUNT best neighbours per article go
+to ArticleNeighbor, which the article page reads with one indexed query.
+
+The vocabulary, IDF weights and matrix are saved to RELATED_INDEX_PATH.
+An incremental run vectorizes only the articles published since, scores
+them against the saved matrix, and also slots them into the neighbour lists
+of existing articles they now beat.
+"""
+import math
+import os
+import re
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils.html import strip_tags
+
+from .models import Article, ArticleNeighbor, Journal
+from .page_cache import bump_content_version
+from .transliteration import fold
+
+RELATED_COUNT = 5
+MIN_TERM_LENGTH = 3
+# Terms in more than this share of articles carry no signal
+MAX_DOCUMENT_FREQUENCY = 0.5
+# Similarity cells held in memory per block
+BLOCK_CELLS = 4_000_000
+TITLE_WEIGHT = 2
+
+_NUMBER = re.compile(r'^\d+$')
+
+
+def index_path():
+    return getattr(settings, 'RELATED_INDEX_PATH', os.path.join(settings.BASE_DIR, 'cache', 'related_index.npz'))
+
+
+def _terms(title, keywords, abstract):
+    words = fold(f"{title} {keywords}").split() * TITLE_WEIGHT + fold(strip_tags(abstract or '')).split()
+    return Counter(word for word in words if len(word) >= MIN_TERM_LENGTH and not _NUMBER.match(word))
+
+
+def _documents(queryset):
+    """(article ids, term counters) of published articles, in id order"""
+    ids, documents = [], []
+    for article_id, title, keywords, abstract in (queryset.filter(is_published=True).order_by('id')
+                                                  .values_list('id', 'title', 'keywords', 'abstract').iterator()):
+        ids.append(article_id)
+        documents.append(_terms(title, keywords, abstract))
+    return np.array(ids, dtype=np.int64), documents
+
+
+def _vectorize(documents, columns, idf):
+    """Normalized TF-IDF rows as CSR (indptr, indices, data); unknown terms are ignored"""
+    indptr, indices, data = [0], [], []
+    for counts in documents:
+        row = sorted((columns[term], (1 + math.log(count)) * idf[columns[term]])
+                     for term, count in counts.items() if term in columns)
+        norm = math.sqrt(sum(weight * weight for _, weight in row)) or 1.0
+        indices.extend(column for column, _ in row)
+        data.extend(weight / norm for _, weight in row)
+        indptr.append(len(indices))
+    return np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int32), np.array(data, dtype=np.float32)
+
+
+def _postings(indptr, indices, data, terms):
+    """Column-major (term_ptr, rows, weights) view of a CSR matrix"""
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+    order = np.argsort(indices, kind='stable')
+    term_ptr = np.zeros(terms + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=terms), out=term_ptr[1:])
+    return term_ptr, rows[order], data[order]
+
+
+def _top_neighbours(query, corpus, columns, k, exclude_self=False):
+    """
+    Yield (query row, neighbour rows, scores) with the ``k`` best cosine
+    matches of every query row among the corpus rows, best first.
+    """
+    q_indptr, q_indices, q_data = query
+    size = len(corpus[0]) - 1
+    term_ptr, term_rows, term_weights = _postings(*corpus, terms=len(columns))
+    block = max(1, BLOCK_CELLS // max(size, 1))
+    k = min(k, size - exclude_self)
+    if k <= 0:
+        return
+
+    for start in range(0, len(q_indptr) - 1, block):
+        stop = min(start + block, len(q_indptr) - 1)
+        first, last = q_indptr[start], q_indptr[stop]
+        terms, weights = q_indices[first:last], q_data[first:last]
+        rows = np.repeat(np.arange(stop - start), np.diff(q_indptr[start:stop + 1]))
+
+        # Every (query row, corpus row) pair sharing a term, through the term postings
+        lengths = term_ptr[terms + 1] - term_ptr[terms]
+        offsets = np.repeat(term_ptr[terms] - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        scores = np.bincount(
+            np.repeat(rows, lengths) * size + term_rows[offsets],
+            weights=np.repeat(weights, lengths) * term_weights[offsets],
+            minlength=(stop - start) * size,
+        ).reshape(stop - start, size)
+        if exclude_self:
+            scores[np.arange(stop - start), np.arange(start, stop)] = -1
+
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        best, best_scores = np.take_along_axis(best, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+        for offset in range(stop - start):
+            keep = best_scores[offset] > 0
+            yield start + offset, best[offset][keep], best_scores[offset][keep]
+
+
+def _save_index(terms, idf, ids, indptr, indices, data):
+    path = index_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(temporary, terms=np.array(terms, dtype=str), idf=idf, ids=ids,
+             indptr=indptr, indices=indices, data=data)
+    os.replace(temporary, path)
+
+
+def _neighbour_rows(article_id, neighbour_ids, scores):
+    return [
+        ArticleNeighbor(article_id=int(article_id), neighbor_id=int(neighbour_id), rank=rank, score=float(score))
+        for rank, (neighbour_id, score) in enumerate(zip(neighbour_ids, scores))
+    ]
+
+
+def _articles_changed(article_ids=None):
+    # Article pages are cached per journal (main.page_cache)
+    journals = Journal.objects.all() if article_ids is None else Journal.objects.filter(
+        issues__articles__id__in=list(article_ids)
+    )
+    bump_content_version(journals.values_list('id', flat=True).distinct())
+
+
+def build_related(k=RELATED_COUNT):
+    """Recompute every neighbour list from scratch; returns (articles, terms)"""
+    ids, documents = _documents(Article.objects.all())
+    frequencies = Counter(term for counts in documents for term in counts)
+    limit = max(2, MAX_DOCUMENT_FREQUENCY * len(ids))
+    terms = sorted(term for term, frequency in frequencies.items() if 2 <= frequency <= limit)
+    columns = {term: column for column, term in enumerate(terms)}
+    idf = np.array([math.log(len(ids) / frequencies[term]) + 1 for term in terms], dtype=np.float32)
+    matrix = _vectorize(documents, columns, idf)
+
+    neighbours = []
+    for row, found, scores in _top_neighbours(matrix, matrix, columns, k, exclude_self=True):
+        neighbours += _neighbour_rows(ids[row], ids[found], scores)
+    with transaction.atomic():
+        ArticleNeighbor.objects.all().delete()
+        ArticleNeighbor.objects.bulk_create(neighbours, batch_size=1000)
+    _save_index(terms, idf, ids, *matrix)
+    _articles_changed()
+    return len(ids), len(terms)
+
+
+def update_related(k=RELATED_COUNT):
+    """
+    Add articles published since the last build to the saved index and the
+    neighbour lists; returns how many were added (None without a saved index).
+    """
+    try:
+        saved = np.load(index_path())
+    except OSError:
+        return None
+    terms, idf, ids = saved['terms'].tolist(), saved['idf'], saved['ids']
+    corpus = (saved['indptr'], saved['indices'], saved['data'])
+    new_ids, documents = _documents(Article.objects.exclude(id__in=ids.tolist()))
+    if not len(new_ids):
+        return 0
+
+    columns = {term: column for column, term in enumerate(terms)}
+    fresh = _vectorize(documents, columns, idf)
+    # The grown corpus: old rows followed by the new ones
+    corpus = (
+        np.concatenate([corpus[0], fresh[0][1:] + corpus[0][-1]]),
+        np.concatenate([corpus[1], fresh[1]]),
+        np.concatenate([corpus[2], fresh[2]]),
+    )
+    all_ids = np.concatenate([ids, new_ids])
+
+    # Saved rows of since deleted or unpublished articles are skipped
+    live = np.array(sorted(Article.objects.filter(is_published=True).values_list('id', flat=True)), dtype=np.int64)
+    new_set = set(new_ids.tolist())
+    neighbours = []
+    challengers = {}
+    for row, found, scores in _top_neighbours(fresh, corpus, columns, 2 * k + 1):
+        article_id = int(new_ids[row])
+        keep = (all_ids[found] != article_id) & np.isin(all_ids[found], live)
+        found, scores = found[keep][:k], scores[keep][:k]
+        neighbours += _neighbour_rows(article_id, all_ids[found], scores)
+        for neighbour_id, score in zip(all_ids[found].tolist(), scores.tolist()):
+            # New articles already got their full lists above
+            if neighbour_id not in new_set:
+                challengers.setdefault(neighbour_id, []).append((score, article_id))
+
+    with transaction.atomic():
+        ArticleNeighbor.objects.filter(article_id__in=new_ids.tolist()).delete()
+        ArticleNeighbor.objects.bulk_create(neighbours, batch_size=1000)
+        # Similarity is symmetric: merge the new articles into the lists of the old ones they match
+        current = {}
+        for neighbour in ArticleNeighbor.objects.filter(article_id__in=list(challengers)):
+            current.setdefault(neighbour.article_id, []).append((neighbour.score, neighbour.neighbor_id))
+        merged = []
+        for article_id, candidates in challengers.items():
+            best = {}
+            for score, neighbour_id in current.get(article_id, []) + candidates:
+                best[neighbour_id] = max(score, best.get(neighbour_id, score))
+            ranked = sorted(((score, neighbour_id) for neighbour_id, score in best.items()),
+                            key=lambda pair: (-pair[0], pair[1]))[:k]
+            merged += _neighbour_rows(article_id, [pair[1] for pair in ranked], [pair[0] for pair in ranked])
+        ArticleNeighbor.objects.filter(article_id__in=list(challengers)).delete()
+        ArticleNeighbor.objects.bulk_create(merged, batch_size=1000)
+
+    _save_index(terms, idf, all_ids, *corpus)
+    _articles_changed(new_ids.tolist() + list(challengers))
+    return len(new_ids)
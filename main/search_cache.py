@@ -0,0 +1,110 @@
+"""
+Search result cache.
+
+global_search results are cached per worker as matching ids (not rendered
+HTML), keyed by the normalized query: its set of folded words plus the set
+of case-folded raw words still used for the abstract match. "Toshkent
+universiteti" and "universiteti  toshkent" share an entry. The cache keeps
+the SEARCH_CACHE_SIZE most recently used queries. Every entry belongs to
+the site content version and the spelling index (main.spelling) it was
+computed under, so any article, author or journal change (which bumps that
+version) or an index rebuild (which changes its "did you mean" suggestions)
+empties it. Hit and miss totals
+of all workers are kept in the shared cache for the admin stats endpoint.
+"""
+import threading
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from .page_cache import SITE_SCOPE, current_versions
+from .search_index import search_words
+from .spelling import index_stamp
+
+SEARCH_CACHE_SIZE = 500
+
+_HITS_KEY = 'search-cache:hits'
+_MISSES_KEY = 'search-cache:misses'
+
+
+def search_key(query):
+    """Order-, case- and script-insensitive key of a query"""
+    words = ' '.join(sorted(set(search_words(query))))
+    raw = ' '.join(sorted({word.casefold() for word in query.split()}))
+    return f"{words}|{raw}"
+
+
+class LRUCache:
+    """Thread-safe mapping that forgets the least recently used keys beyond ``size``"""
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+        self.version = None
+        self.lock = threading.Lock()
+
+    def get(self, key, version):
+        with self.lock:
+            if version != self.version:
+                self.entries.clear()
+                self.version = version
+                return None
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, version):
+        with self.lock:
+            if version != self.version:
+                self.entries.clear()
+                self.version = version
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+_results = LRUCache(SEARCH_CACHE_SIZE)
+
+
+def _count(key):
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass  # Evicted between add() and incr(); the stats are best effort
+
+
+def cached_search(query, compute):
+    """compute() - a dict of result ids - for ``query``, from the cache while the content is unchanged"""
+    key = search_key(query)
+    version = (current_versions([SITE_SCOPE])[SITE_SCOPE], index_stamp())
+    result = _results.get(key, version)
+    if result is not None:
+        _count(_HITS_KEY)
+        return result
+    _count(_MISSES_KEY)
+    result = compute()
+    _results.set(key, result, version)
+    return result
+
+
+def search_cache_stats():
+    """Hit/miss totals of all workers and the size of this worker's cache"""
+    totals = cache.get_many([_HITS_KEY, _MISSES_KEY])
+    hits, misses = totals.get(_HITS_KEY, 0), totals.get(_MISSES_KEY, 0)
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None,
+        'entries': len(_results),
+        'max_entries': SEARCH_CACHE_SIZE,
+    }
+
+
+def reset_search_cache_stats():
+    cache.delete_many([_HITS_KEY, _MISSES_KEY])
@@ -0,0 +1,99 @@
+"""
+Script-folded search index.
+
+Every article (title, subtitle, keywords, author names), author (name and
+affiliation) and journal (title, keywords, description) is stored as the
+set of its folded words in SearchToken (see main.transliteration). Queries
+are folded the same way, so "Тошкент" finds "Toshkent", and each query word
+becomes a range scan of the (kind, token) index - "tosh" is
+``'tosh' <= token < 'tosh\\U0010ffff'`` - instead of one LIKE per column and
+script.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Article, ArticleAuthor, Author, Journal, SearchToken
+from .transliteration import fold
+
+TOKEN_LENGTH = 64
+BATCH_SIZE = 500
+# Sorts after every real continuation of a prefix
+_PREFIX_END = '\U0010ffff'
+
+
+def fold_words(*texts):
+    """Distinct folded words of the given texts"""
+    return {word[:TOKEN_LENGTH] for text in texts for word in fold(text).split()}
+
+
+def search_words(query):
+    """Folded query words in order, without duplicates"""
+    return list(dict.fromkeys(word[:TOKEN_LENGTH] for word in fold(query).split()))
+
+
+def search_filter(kind, words, field='id'):
+    """Q matching records of ``kind`` having a token starting with every one of ``words``"""
+    condition = Q()
+    for word in words:
+        condition &= Q(**{f"{field}__in": SearchToken.objects.filter(
+            kind=kind, token__gte=word, token__lt=word + _PREFIX_END
+        ).values('object_id')})
+    return condition
+
+
+def _store(kind, words_by_id):
+    """Replace the tokens of the given records"""
+    SearchToken.objects.filter(kind=kind, object_id__in=list(words_by_id)).delete()
+    SearchToken.objects.bulk_create([
+        SearchToken(kind=kind, token=word, object_id=object_id)
+        for object_id, words in words_by_id.items()
+        for word in sorted(words)
+    ], batch_size=BATCH_SIZE)
+
+
+def _author_name(first_name, middle_name, last_name):
+    return ' '.join(part for part in [first_name, middle_name, last_name] if part)
+
+
+def index_articles(article_ids):
+    article_ids = list(article_ids)
+    names = {}
+    for row in (ArticleAuthor.objects.filter(article_id__in=article_ids)
+                .values_list('article_id', 'author__first_name', 'author__middle_name', 'author__last_name')):
+        names.setdefault(row[0], []).append(_author_name(*row[1:]))
+    _store(SearchToken.ARTICLE, {
+        article_id: fold_words(title, subtitle, keywords, *names.get(article_id, []))
+        for article_id, title, subtitle, keywords in Article.objects.filter(id__in=article_ids)
+        .values_list('id', 'title', 'subtitle', 'keywords')
+    })
+
+
+def index_authors(author_ids):
+    _store(SearchToken.AUTHOR, {
+        author_id: fold_words(_author_name(first_name, middle_name, last_name), affiliation)
+        for author_id, first_name, middle_name, last_name, affiliation in Author.objects.filter(id__in=author_ids)
+        .values_list('id', 'first_name', 'middle_name', 'last_name', 'affiliation')
+    })
+
+
+def index_journals(journal_ids):
+    _store(SearchToken.JOURNAL, {
+        journal_id: fold_words(title, meta_keywords, description)
+        for journal_id, title, meta_keywords, description in Journal.objects.filter(id__in=journal_ids)
+        .values_list('id', 'title', 'meta_keywords', 'description')
+    })
+
+
+def unindex(kind, object_ids):
+    SearchToken.objects.filter(kind=kind, object_id__in=list(object_ids)).delete()
+
+
+def rebuild_search_index():
+    """Re-tokenize every article, author and journal; returns the token count"""
+    with transaction.atomic():
+        SearchToken.objects.all().delete()
+        for model, index in [(Article, index_articles), (Author, index_authors), (Journal, index_journals)]:
+            ids = list(model.objects.order_by('id').values_list('id', flat=True))
+            for start in range(0, len(ids), BATCH_SIZE):
+                index(ids[start:start + BATCH_SIZE])
+    return SearchToken.objects.count()
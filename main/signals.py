@@ -0,0 +1,218 @@
+"""
+Model signal handlers that keep derived data (pre-rendered citations, cached
+OAI-PMH records, feeds, cached pages, article summaries, ...) in step with
+editorial changes.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .author_dedup import index_author_keys
+from .author_metrics import refresh_author_metrics
+from .autocomplete import ARTICLE, AUTHOR, JOURNAL, record_changes
+from .citations import invalidate_citations
+from .coauthors import refresh_coauthorships
+from .counters import refresh_counts
+from .facets import refresh_facets
+from .feeds import bump_feed_stamps
+from .institutions import assign_institution, refresh_institution_counts
+from .keywords import refresh_keyword_counts, sync_article_keywords
+from .models import (
+    Article, ArticleAuthor, ArticleKeyword, ArticleSummary, Author, CitationEdge, Issue, Journal, JournalEditor,
+    JournalPolicy, SearchToken,
+)
+from .oai import touch_oai_datestamps
+from .page_cache import bump_content_version
+from .references import citations_changed, reparse_articles
+from .search_index import index_articles, index_authors, index_journals, unindex
+from .summaries import refresh_summaries
+
+# Saves touching only these fields don't change any rendered content
+COUNTER_FIELDS = frozenset({'views', 'downloads', 'diploma_sent'})
+
+
+def is_counter_update(update_fields):
+    return bool(update_fields) and set(update_fields) <= COUNTER_FIELDS
+
+
+def journals_changed(journal_ids, author_ids=()):
+    """Invalidate journal-level caches (feeds and pages)"""
+    journal_ids = set(journal_ids)
+    bump_content_version(journal_ids, author_ids)
+    if journal_ids:
+        bump_feed_stamps(Journal.objects.filter(id__in=journal_ids).values_list('url_slug', flat=True))
+
+
+def articles_changed(article_ids):
+    """Drop everything derived from the given articles' metadata and advance their OAI datestamps"""
+    article_ids = list(article_ids)
+    if not article_ids:
+        return
+    refresh_summaries(article_ids)
+    index_articles(article_ids)
+    record_changes(ARTICLE, article_ids)
+    invalidate_citations(article_ids)
+    touch_oai_datestamps(article_ids)
+    journals_changed(
+        Issue.objects.filter(articles__id__in=article_ids).values_list('journal_id', flat=True),
+        ArticleAuthor.objects.filter(article_id__in=article_ids).values_list('author_id', flat=True),
+    )
+
+
+def author_links_changed(author_ids):
+    """Recompute the counters and tables built from the given authors' published articles"""
+    author_ids = {author_id for author_id in author_ids if author_id}
+    if not author_ids:
+        return
+    with transaction.atomic():
+        refresh_counts(author_ids=author_ids)
+        refresh_institution_counts(Author.objects.filter(id__in=author_ids).values_list('institution_id', flat=True))
+        refresh_author_metrics(author_ids)
+        refresh_coauthorships(author_ids)
+
+
+def _issue_journal_ids(issue_id):
+    return Issue.objects.filter(id=issue_id).values_list('journal_id', flat=True)
+
+
+@receiver(pre_save, sender=Article)
+def article_saving(sender, instance, update_fields=None, **kwargs):
+    # Remember the stored issue so a move can update the counters of both issues,
+    # and the references and status the citation graph was built from
+    if instance.pk and not is_counter_update(update_fields):
+        stored = Article.objects.filter(pk=instance.pk).values_list('issue_id', 'references', 'is_published').first()
+        if stored:
+            instance._stored_issue_id, instance._stored_references, instance._stored_is_published = stored
+
+
+def _sync_citations(instance, created):
+    if (instance.references or '') != (getattr(instance, '_stored_references', None) or ''):
+        reparse_articles([instance.id])
+    elif not created and instance.is_published != getattr(instance, '_stored_is_published', instance.is_published):
+        citations_changed(CitationEdge.objects.filter(citing=instance).values_list('cited_id', flat=True))
+
+
+@receiver(post_save, sender=Article)
+def article_saved(sender, instance, created, update_fields=None, **kwargs):
+    if is_counter_update(update_fields):
+        return
+    refresh_counts(issue_ids=[instance.issue_id, getattr(instance, '_stored_issue_id', None)])
+    author_links_changed(ArticleAuthor.objects.filter(article=instance).values_list('author_id', flat=True))
+    sync_article_keywords(instance)
+    _sync_citations(instance, created)
+    if created:
+        refresh_summaries([instance.id])
+        index_articles([instance.id])
+        record_changes(ARTICLE, [instance.id])
+        journals_changed(_issue_journal_ids(instance.issue_id) if instance.issue_id else [])
+        return
+    articles_changed([instance.id])
+
+
+@receiver(pre_delete, sender=Article)
+def article_deleting(sender, instance, **kwargs):
+    instance._keyword_ids = list(ArticleKeyword.objects.filter(article=instance).values_list('keyword_id', flat=True))
+    instance._cited_ids = list(CitationEdge.objects.filter(citing=instance).values_list('cited_id', flat=True))
+
+
+@receiver(post_delete, sender=Article)
+def article_deleted(sender, instance, **kwargs):
+    refresh_keyword_counts(getattr(instance, '_keyword_ids', []))
+    citations_changed(getattr(instance, '_cited_ids', []))
+    # The author links are deleted first and their handler re-creates the summary
+    ArticleSummary.objects.filter(article_id=instance.id).delete()
+    unindex(SearchToken.ARTICLE, [instance.id])
+    record_changes(ARTICLE, [instance.id])
+    journal_ids = list(_issue_journal_ids(instance.issue_id)) if instance.issue_id else [None]
+    refresh_facets({(journal_id, instance.date_published.year) for journal_id in journal_ids})
+    refresh_counts(issue_ids=[instance.issue_id])
+    journals_changed(_issue_journal_ids(instance.issue_id) if instance.issue_id else [])
+
+
+@receiver(post_save, sender=ArticleAuthor)
+@receiver(post_delete, sender=ArticleAuthor)
+def article_author_changed(sender, instance, **kwargs):
+    author_links_changed([instance.author_id])
+    articles_changed([instance.article_id])
+    bump_content_version(author_ids=[instance.author_id])
+
+
+@receiver(post_save, sender=Author)
+def author_changed(sender, instance, created=False, **kwargs):
+    index_authors([instance.id])
+    record_changes(AUTHOR, [instance.id])
+    if created:
+        bump_content_version(author_ids=[instance.id])
+        return
+    articles_changed(ArticleAuthor.objects.filter(author=instance).values_list('article_id', flat=True))
+    bump_content_version(author_ids=[instance.id])
+
+
+@receiver(post_delete, sender=Author)
+def author_deleted(sender, instance, **kwargs):
+    # The article links are deleted first and their handler refreshes the articles
+    unindex(SearchToken.AUTHOR, [instance.id])
+    record_changes(AUTHOR, [instance.id])
+    bump_content_version(author_ids=[instance.id])
+
+
+@receiver(post_save, sender=Author)
+def author_keys_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'first_name', 'last_name', 'orcid'} & set(update_fields):
+        return
+    index_author_keys([instance.id])
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=JournalEditor)
+def affiliation_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'affiliation', 'is_active'} & set(update_fields):
+        return
+    refresh_institution_counts(assign_institution(instance))
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=JournalEditor)
+def affiliation_deleted(sender, instance, **kwargs):
+    refresh_institution_counts([instance.institution_id])
+
+
+@receiver(post_save, sender=Issue)
+def issue_saved(sender, instance, created, **kwargs):
+    refresh_counts(issue_ids=[instance.id])
+    if not created:
+        articles_changed(Article.objects.filter(issue=instance).values_list('id', flat=True))
+    journals_changed([instance.journal_id])
+
+
+@receiver(post_delete, sender=Issue)
+def issue_deleted(sender, instance, **kwargs):
+    # The articles were detached with a bare UPDATE; their summaries still name the issue
+    refresh_summaries(ArticleSummary.objects.filter(issue_id=instance.id).values_list('article_id', flat=True))
+    refresh_counts(journal_ids=[instance.journal_id])
+    journals_changed([instance.journal_id])
+
+
+@receiver(post_save, sender=Journal)
+def journal_saved(sender, instance, created, **kwargs):
+    index_journals([instance.id])
+    record_changes(JOURNAL, [instance.id])
+    if not created:
+        articles_changed(Article.objects.filter(issue__journal=instance).values_list('id', flat=True))
+    journals_changed([instance.id])
+
+
+@receiver(post_delete, sender=Journal)
+def journal_deleted(sender, instance, **kwargs):
+    unindex(SearchToken.JOURNAL, [instance.id])
+    record_changes(JOURNAL, [instance.id])
+    bump_content_version([instance.id])
+    bump_feed_stamps([instance.url_slug])
+
+
+@receiver(post_save, sender=JournalEditor)
+@receiver(post_delete, sender=JournalEditor)
+@receiver(post_save, sender=JournalPolicy)
+@receiver(post_delete, sender=JournalPolicy)
+def journal_page_changed(sender, instance, **kwargs):
+    bump_content_version([instance.journal_id])
@@ -0,0 +1,120 @@
+"""
+Single-flight recomputation of expensive cache entries.
+
+When an entry expires, only the worker holding the per-key lock rebuilds
+it; the others keep serving the stale value (stale-while-revalidate), or
+wait briefly for the rebuild when there is nothing to serve yet. Locks are
+advisory file locks, so they coordinate every process on the host.
+"""
+import hashlib
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCK_WAIT = 10
+LOCK_POLL_INTERVAL = 0.05
+STALE_TIMEOUT = 60 * 60
+# Fallback lock files older than this are assumed to belong to a dead process
+ORPHAN_LOCK_AGE = 120
+
+
+def _lock_path(key):
+    lock_dir = getattr(settings, 'SINGLE_FLIGHT_LOCK_DIR', os.path.join(settings.BASE_DIR, 'cache', 'locks'))
+    os.makedirs(lock_dir, exist_ok=True)
+    return os.path.join(lock_dir, hashlib.md5(key.encode()).hexdigest() + '.lock')
+
+
+def _try_acquire(path):
+    """Returns a release callable, or None if someone else holds the lock"""
+    if fcntl:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+
+        def release():
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        return release
+
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+    except FileExistsError:
+        try:
+            if time.time() - os.path.getmtime(path) > ORPHAN_LOCK_AGE:
+                os.remove(path)
+        except OSError:
+            pass
+        return None
+    os.close(fd)
+    return lambda: os.remove(path)
+
+
+@contextmanager
+def flight_lock(key, wait=0):
+    """Hold the lock for key if it can be taken within `wait` seconds; yields whether it was"""
+    path = _lock_path(key)
+    deadline = time.monotonic() + wait
+    release = _try_acquire(path)
+    while release is None and time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        release = _try_acquire(path)
+    try:
+        yield release is not None
+    finally:
+        if release:
+            release()
+
+
+def _is_fresh(entry, version):
+    return entry['version'] == version and entry['fresh_until'] > time.time()
+
+
+def _store(key, compute, timeout, version, stale_timeout):
+    value = compute()
+    cache.set(key, {
+        'value': value,
+        'version': version,
+        'fresh_until': time.time() + timeout,
+    }, timeout + stale_timeout)
+    return value
+
+
+def single_flight(key, compute, timeout, version=None, stale_timeout=STALE_TIMEOUT):
+    """
+    Cached compute() with stale-while-revalidate: an entry is fresh for
+    `timeout` seconds while its version matches, then served stale for up to
+    `stale_timeout` more seconds while a single worker recomputes it.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        if _is_fresh(entry, version):
+            return entry['value']
+        with flight_lock(key) as acquired:
+            if not acquired:
+                return entry['value']
+            entry = cache.get(key)
+            if entry is not None and _is_fresh(entry, version):
+                return entry['value']
+            return _store(key, compute, timeout, version, stale_timeout)
+
+    with flight_lock(key, wait=LOCK_WAIT) as acquired:
+        if not acquired:
+            logger.warning(f"Single-flight lock wait timed out for {key}")
+        entry = cache.get(key)
+        if entry is not None and _is_fresh(entry, version):
+            return entry['value']
+        return _store(key, compute, timeout, version, stale_timeout)
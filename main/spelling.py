@@ -0,0 +1,172 @@
+"""
+"Did you mean" suggestions for zero-result searches.
+
+The vocabulary - script-folded words of published article titles, keywords
+and active author surnames, with their frequencies - is indexed by
+character trigram. Postings are kept compactly as one array of word numbers
+plus an offset array per sorted trigram list (CSR layout) and saved to
+SPELLING_INDEX_PATH by the rebuild_spelling_index command. Each worker
+loads the file once and reloads it when it is rebuilt.
+
+An unknown query word is corrected to the vocabulary word with the most
+shared trigrams, smallest edit distance and highest frequency, so a
+suggestion costs no database query.
+"""
+import bisect
+import os
+import pickle
+from array import array
+from collections import Counter
+
+from django.conf import settings
+
+from .models import Article, Author, Keyword
+from .transliteration import fold
+
+MIN_WORD_LENGTH = 3
+# Candidates (by shared trigrams) checked with the exact edit distance
+CANDIDATES = 40
+INDEX_VERSION = 1
+
+_loaded = {'mtime': None, 'index': None}
+
+
+def index_path():
+    return getattr(settings, 'SPELLING_INDEX_PATH', os.path.join(settings.BASE_DIR, 'cache', 'spelling_index.pickle'))
+
+
+def _trigrams(word):
+    padded = f" {word} "
+    return {padded[start:start + 3] for start in range(len(padded) - 2)}
+
+
+def _vocabulary():
+    """Frequencies of the folded words of titles, keywords and surnames"""
+    frequencies = Counter()
+    sources = [
+        Article.objects.filter(is_published=True).values_list('title', flat=True).iterator(),
+        Keyword.objects.filter(article_count__gt=0).values_list('name', flat=True).iterator(),
+        Author.objects.filter(is_active=True).values_list('last_name', flat=True).iterator(),
+    ]
+    for texts in sources:
+        for text in texts:
+            frequencies.update(word for word in fold(text).split() if len(word) >= MIN_WORD_LENGTH and word.isalpha())
+    return frequencies
+
+
+def build_index():
+    """Spelling index over the current vocabulary"""
+    frequencies = _vocabulary()
+    words = sorted(frequencies)
+    postings_by_gram = {}
+    for number, word in enumerate(words):
+        for gram in _trigrams(word):
+            postings_by_gram.setdefault(gram, []).append(number)
+
+    grams = sorted(postings_by_gram)
+    offsets, postings = array('I', [0]), array('I')
+    for gram in grams:
+        postings.extend(postings_by_gram[gram])
+        offsets.append(len(postings))
+    return {
+        'version': INDEX_VERSION,
+        'words': words,
+        'frequencies': array('I', (frequencies[word] for word in words)),
+        'grams': grams,
+        'offsets': offsets,
+        'postings': postings,
+    }
+
+
+def rebuild_spelling_index():
+    """Build and save the index; returns (words, trigrams)"""
+    index = build_index()
+    path = index_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as stream:
+        pickle.dump(index, stream, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+    return len(index['words']), len(index['grams'])
+
+
+def index_stamp():
+    """Modification time of the saved index (None when there is none); every rebuild changes it"""
+    try:
+        return os.stat(index_path()).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_index():
+    """The saved index (None when there is none), reloaded after a rebuild"""
+    mtime = index_stamp()
+    if mtime is None:
+        return None
+    if mtime != _loaded['mtime']:
+        with open(index_path(), 'rb') as stream:
+            index = pickle.load(stream)
+        if index.get('version') != INDEX_VERSION:
+            return None
+        index['gram_numbers'] = {gram: number for number, gram in enumerate(index['grams'])}
+        _loaded.update(mtime=mtime, index=index)
+    return _loaded['index']
+
+
+def edit_distance(first, second, limit):
+    """Levenshtein distance, or limit + 1 once it is certain to exceed ``limit``"""
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous = list(range(len(second) + 1))
+    for row, char in enumerate(first, 1):
+        current = [row]
+        for column, other in enumerate(second, 1):
+            current.append(min(previous[column] + 1, current[column - 1] + 1,
+                               previous[column - 1] + (char != other)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _is_known(index, word):
+    """True for vocabulary words and their prefixes (search matches word prefixes)"""
+    words = index['words']
+    position = bisect.bisect_left(words, word)
+    return position < len(words) and words[position].startswith(word)
+
+
+def correct_word(index, word):
+    """Best vocabulary replacement for an unknown word, or None"""
+    grams = _trigrams(word)
+    shared = Counter()
+    offsets, postings = index['offsets'], index['postings']
+    for gram in grams:
+        number = index['gram_numbers'].get(gram)
+        if number is not None:
+            shared.update(postings[offsets[number]:offsets[number + 1]])
+
+    limit = 1 if len(word) <= 4 else 2 if len(word) <= 8 else 3
+    best = None
+    for number, _ in shared.most_common(CANDIDATES):
+        candidate = index['words'][number]
+        distance = edit_distance(word, candidate, limit)
+        if distance <= limit:
+            rank = (distance, -index['frequencies'][number], candidate)
+            if best is None or rank < best:
+                best = rank
+    return best[2] if best else None
+
+
+def did_you_mean(query):
+    """Corrected (folded) query, or None when every word is known or nothing better is found"""
+    index = _load_index()
+    if not index:
+        return None
+    words = fold(query).split()
+    corrected = []
+    for word in words:
+        if len(word) >= MIN_WORD_LENGTH and word.isalpha() and not _is_known(index, word):
+            word = correct_word(index, word) or word
+        corrected.append(word)
+    return ' '.join(corrected) if corrected != words else None
@@ -0,0 +1,111 @@
+"""
+Article summary read model.
+
+List pages render from ArticleSummary - one narrow row per article with the
+author line, journal and issue labels already formatted - instead of loading
+full Article rows (abstract, references) and prefetching their authors.
+Signals rebuild the rows of the touched articles (and the facet counts
+derived from them); view and download deltas are added in place by
+main.counters. A database upgraded to this table gets its rows built right
+after migrate (backfill_summaries).
+"""
+import html
+
+from django.db import connections, transaction
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from .facets import facet_cells, refresh_facets
+from .models import Article, ArticleAuthor, ArticleSummary
+
+# Ordering for cursor pagination over summaries (see main.pagination)
+SUMMARY_ORDERING = ('-date_published', '-article_id')
+EXCERPT_LENGTH = 400
+BATCH_SIZE = 500
+
+_SUMMARY_FIELDS = [
+    'title', 'subtitle', 'authors_display', 'author_list', 'excerpt',
+    'journal_id', 'journal_title', 'journal_slug', 'issue_id', 'issue_citation',
+    'date_published', 'first_page', 'last_page', 'doi', 'views', 'downloads',
+    'is_published', 'featured', 'open_access', 'has_pdf', 'language',
+]
+
+
+def _full_name(first_name, middle_name, last_name):
+    return ' '.join(part for part in [first_name, middle_name, last_name] if part)
+
+
+def excerpt(abstract):
+    """Plain-text beginning of an abstract"""
+    return Truncator(html.unescape(strip_tags(abstract or '')).strip()).chars(EXCERPT_LENGTH)
+
+
+def build_summaries(article_ids):
+    """Unsaved ArticleSummary rows for the given articles, in two queries"""
+    authors = {}
+    for row in (ArticleAuthor.objects.filter(article_id__in=article_ids)
+                .order_by('article_id', 'order')
+                .values('article_id', 'author_id', 'author__first_name',
+                        'author__middle_name', 'author__last_name')):
+        authors.setdefault(row['article_id'], []).append({
+            'id': row['author_id'],
+            'name': _full_name(row['author__first_name'], row['author__middle_name'], row['author__last_name']),
+        })
+
+    summaries = []
+    for article in Article.objects.filter(id__in=article_ids).select_related('issue__journal').defer('references'):
+        issue = article.issue
+        author_list = authors.get(article.id, [])
+        summaries.append(ArticleSummary(
+            article_id=article.id,
+            title=article.title,
+            subtitle=article.subtitle or '',
+            authors_display=', '.join(author['name'] for author in author_list),
+            author_list=author_list,
+            excerpt=excerpt(article.abstract),
+            journal_id=issue.journal_id if issue else None,
+            journal_title=issue.journal.title if issue else '',
+            journal_slug=issue.journal.url_slug if issue else '',
+            issue_id=article.issue_id,
+            issue_citation=f"Jild {issue.volume}, Son {issue.number}" if issue else '',
+            date_published=article.date_published,
+            first_page=article.first_page,
+            last_page=article.last_page,
+            doi=article.doi or '',
+            views=article.views,
+            downloads=article.downloads,
+            is_published=article.is_published,
+            featured=article.featured,
+            open_access=article.open_access,
+            has_pdf=article.main_pdf_id is not None,
+            language=article.language,
+        ))
+    return summaries
+
+
+def refresh_summaries(article_ids=None):
+    """Rebuild the summaries of the given articles (all articles when None); returns the row count"""
+    rebuild_all = article_ids is None
+    if rebuild_all:
+        article_ids = Article.objects.values_list('id', flat=True)
+    article_ids = sorted(set(article_ids))
+    with transaction.atomic():
+        cells = set() if rebuild_all else facet_cells(article_ids)
+        for start in range(0, len(article_ids), BATCH_SIZE):
+            ArticleSummary.objects.bulk_create(
+                build_summaries(article_ids[start:start + BATCH_SIZE]),
+                update_conflicts=True,
+                unique_fields=['article'],
+                update_fields=_SUMMARY_FIELDS,
+            )
+        # Facet counts are derived from the summaries: recount the cells the articles left and entered
+        refresh_facets(None if rebuild_all else cells | facet_cells(article_ids))
+    return len(article_ids)
+
+
+def backfill_summaries(using='default', **kwargs):
+    """post_migrate handler: build every summary when the table is still empty but articles exist"""
+    if ArticleSummary._meta.db_table not in connections[using].introspection.table_names():
+        return
+    if not ArticleSummary.objects.using(using).exists() and Article.objects.using(using).exists():
+        refresh_summaries()
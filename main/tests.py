@@ -0,0 +1,1158 @@
+import io
+import os
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from lxml import etree
+
+from main import author_dedup, autocomplete, crossref, page_cache, search_cache, views
+from main.author_metrics import h_index, rebuild_author_metrics
+from main.citations import citations_for, get_citations
+from main.coauthors import rebuild_coauthorships, top_collaborators
+from main.counters import reconcile_counts
+from main.facets import article_facets
+from main.home_snapshot import build_home_snapshot
+from main.journal_analytics import build_journal_analytics, journal_analytics
+from main.keywords import keyword_cloud
+from main.models import (
+    Article, ArticleAuthor, ArticleCitation, ArticleNeighbor, ArticleSummary, ArticleTrend, Author, AuthorStats,
+    CitationEdge, CoAuthorship, Institution, Issue, Journal, Keyword, PendingView, SearchToken,
+)
+from main.oai import OAI_NS, encode_token
+from main.pagination import paginate
+from main.related import build_related, update_related
+from main.singleflight import flight_lock, single_flight
+from main.spelling import did_you_mean, rebuild_spelling_index
+from main.summaries import backfill_summaries
+from main.trending import trending_articles
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class CrossrefDepositTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test", issn_online="1234-5678")
+        cls.issue = Issue.objects.create(journal=journal, volume=2, number=3, year=2024, is_published=True)
+        cls.registered = Article.objects.create(title="Registered", abstract="Abstract", issue=cls.issue,
+                                                doi="10.1234/tj.registered", first_page=1, last_page=9,
+                                                slug="registered")
+        cls.new = Article.objects.create(title="New", abstract="Abstract", issue=cls.issue, first_page=10,
+                                         last_page=20, slug="new")
+        author = Author.objects.create(first_name="Alisher", last_name="Qodirov", email="a.qodirov@uni.uz",
+                                       orcid="0000-0002-1825-0097")
+        for article in [cls.registered, cls.new]:
+            ArticleAuthor.objects.create(article=article, author=author, order=0)
+
+    def _deposit(self):
+        output = io.BytesIO()
+        with self.assertNumQueries(3):
+            stats = crossref.write_deposit(output, crossref.deposit_issues(issue_ids=[self.issue.id]))
+        return stats, etree.fromstring(output.getvalue())
+
+    def _dois(self, document):
+        return document.xpath('//c:doi_data/c:doi/text()', namespaces={'c': crossref.CROSSREF_NS})
+
+    @mock.patch('main.crossref.SITE_DOMAIN', 'https://imfaktor.uz')
+    @mock.patch('main.crossref.CROSSREF_DEPOSITOR_EMAIL', 'doi@imfaktor.uz')
+    def test_deposit_generates_missing_dois_and_validates(self):
+        with mock.patch('main.crossref.CROSSREF_DOI_PREFIX', '10.1234'):
+            stats, document = self._deposit()
+
+        generated = f"10.1234/tj.2024.2.3.{self.new.id}"
+        self.assertEqual(stats['articles'], 2)
+        self.assertEqual(stats['generated'], [(self.new.id, generated)])
+        self.assertEqual(self._dois(document), ["10.1234/tj.registered", generated])
+        self.assertTrue(crossref.get_schema().validate(document), crossref.get_schema().error_log)
+        resources = document.xpath('//c:resource/text()', namespaces={'c': crossref.CROSSREF_NS})
+        self.assertEqual(resources[0], f"https://imfaktor.uz/articles/{self.registered.id}/")
+
+    def test_articles_without_doi_are_skipped_without_prefix(self):
+        with mock.patch('main.crossref.CROSSREF_DOI_PREFIX', None):
+            stats, document = self._deposit()
+
+        self.assertEqual(stats['skipped'], 1)
+        self.assertEqual(stats['generated'], [])
+        self.assertEqual(self._dois(document), ["10.1234/tj.registered"])
+
+    @mock.patch('main.crossref.SITE_DOMAIN', 'https://imfaktor.uz')
+    @mock.patch('main.crossref.CROSSREF_DEPOSITOR_EMAIL', '')
+    def test_command_refuses_to_run_without_required_settings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'deposit.xml')
+            with self.assertRaisesMessage(CommandError, "CROSSREF_DEPOSITOR_EMAIL"):
+                call_command('crossref_deposit', issue=[self.issue.id], output=output)
+            self.assertFalse(os.path.exists(output))
+
+
+class CitationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=2, number=3, year=2024, is_published=True)
+        cls.article = Article.objects.create(title="Cotton irrigation", abstract="Abstract", issue=issue,
+                                             date_published=date(2024, 5, 1), doi="10.1234/tj.1",
+                                             first_page=5, last_page=12, slug="cotton")
+        cls.author = Author.objects.create(first_name="Alisher", last_name="Qodirov", email="a.qodirov@uni.uz")
+        cls.coauthor = Author.objects.create(first_name="Bobur", last_name="Saidov", email="b.saidov@uni.uz")
+        ArticleAuthor.objects.create(article=cls.article, author=cls.author, order=0)
+        ArticleAuthor.objects.create(article=cls.article, author=cls.coauthor, order=1)
+
+    def test_formats_are_rendered_once_and_stored(self):
+        citations = citations_for([self.article.id])[self.article.id]
+
+        self.assertEqual(citations['apa'], "Qodirov, A., & Saidov, B. (2024). Cotton irrigation. Test Journal, "
+                                           "2(3), 5-12. https://doi.org/10.1234/tj.1")
+        self.assertIn("pages = {5--12}", citations['bibtex'])
+        self.assertIn("AU  - Saidov, Bobur", citations['ris'])
+        with self.assertNumQueries(1):
+            self.assertEqual(citations_for([self.article.id])[self.article.id]['apa'], citations['apa'])
+
+    def test_author_rename_drops_stored_citations(self):
+        citations_for([self.article.id])
+        self.author.last_name = "Qodiriy"
+        self.author.save()
+
+        self.assertFalse(ArticleCitation.objects.filter(article=self.article).exists())
+        self.assertTrue(get_citations(Article.objects.get(id=self.article.id))['apa'].startswith("Qodiriy, A."))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class OAIProviderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        cls.articles = [Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=issue,
+                                               slug=f"article-{i}") for i in range(5)]
+        cls.author = Author.objects.create(first_name="Alisher", last_name="Qodirov", email="a.qodirov@uni.uz")
+        ArticleAuthor.objects.create(article=cls.articles[0], author=cls.author, order=0)
+
+    def setUp(self):
+        cache.clear()
+
+    def _get(self, **params):
+        response = Client().get('/oai/', params)
+        self.assertEqual(response.status_code, 200)
+        return etree.fromstring(response.content)
+
+    def _xpath(self, document, path):
+        return document.xpath(path, namespaces={'o': OAI_NS, 'dc': 'http://purl.org/dc/elements/1.1/'})
+
+    def _error_code(self, document):
+        codes = self._xpath(document, '//o:error/@code')
+        return codes[0] if codes else None
+
+    def _harvest(self, **params):
+        identifiers, document = [], self._get(verb='ListIdentifiers', metadataPrefix='oai_dc', **params)
+        while True:
+            identifiers += self._xpath(document, '//o:header/o:identifier/text()')
+            token = self._xpath(document, '//o:resumptionToken/text()')
+            if not token:
+                return identifiers
+            document = self._get(verb='ListIdentifiers', resumptionToken=token[0])
+
+    def test_resumption_tokens_page_through_every_record_once(self):
+        with mock.patch('main.oai.PAGE_SIZE', 2):
+            identifiers = self._harvest()
+
+        self.assertEqual(len(identifiers), 5)
+        self.assertEqual({int(identifier.rsplit('/', 1)[1]) for identifier in identifiers},
+                         {article.id for article in self.articles})
+
+    def test_author_change_advances_datestamp_and_record(self):
+        identifier = next(identifier for identifier in self._harvest()
+                          if identifier.endswith(f"/{self.articles[0].id}"))
+        record = self._get(verb='GetRecord', metadataPrefix='oai_dc', identifier=identifier)
+        self.assertEqual(self._xpath(record, '//dc:creator/text()'), ["Qodirov, Alisher"])
+        stamp = self._xpath(record, '//o:header/o:datestamp/text()')[0]
+
+        Article.objects.update(updated_at=date(2020, 1, 1))
+        self.author.last_name = "Qodiriy"
+        self.author.save()
+
+        self.assertEqual(self._harvest(**{'from': '2021-01-01'}), [identifier])
+        record = self._get(verb='GetRecord', metadataPrefix='oai_dc', identifier=identifier)
+        self.assertEqual(self._xpath(record, '//dc:creator/text()'), ["Qodiriy, Alisher"])
+        self.assertGreaterEqual(self._xpath(record, '//o:header/o:datestamp/text()')[0], stamp)
+
+    def test_until_seconds_covers_the_whole_second(self):
+        stamped = datetime(2024, 5, 1, 12, 0, 0, 500000, tzinfo=dt_timezone.utc)
+        Article.objects.filter(id=self.articles[0].id).update(updated_at=stamped)
+
+        self.assertEqual(len(self._harvest(until='2024-05-01T12:00:00Z')), 1)
+        self.assertEqual(self._harvest(until='2024-05-01T11:59:59Z'), [])
+
+    def test_malformed_tokens_are_rejected(self):
+        after = ['2025-01-01T00:00:00+00:00', 1]
+        for token in [
+            "not-base64!",
+            encode_token([1, 2]),
+            encode_token({'set': None, 'from': None, 'until': None, 'after': after}),
+            encode_token({'prefix': 'oai_dc', 'set': None, 'from': 'yesterday', 'until': None, 'after': after}),
+            encode_token({'prefix': 'oai_dc', 'set': None, 'from': None, 'until': None, 'after': ['soon', 1]}),
+        ]:
+            document = self._get(verb='ListRecords', resumptionToken=token)
+            self.assertEqual(self._error_code(document), 'badResumptionToken', token)
+
+    def test_valid_token_is_accepted(self):
+        token = encode_token({'prefix': 'oai_dc', 'set': None, 'from': None, 'until': None,
+                              'after': ['2100-01-01T00:00:00+00:00', 1]})
+        self.assertEqual(self._error_code(self._get(verb='ListRecords', resumptionToken=token)), 'noRecordsMatch')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class FeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        cls.issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        Article.objects.create(title="First article", abstract="Abstract", issue=cls.issue, slug="first")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_unchanged_feed_answers_304(self):
+        response = Client().get('/journals/test-journal/feed/atom/')
+        self.assertContains(response, "First article")
+
+        response = Client().get('/journals/test-journal/feed/atom/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_publishing_changes_the_etag(self):
+        etag = Client().get('/journals/test-journal/feed/rss/')['ETag']
+        Article.objects.create(title="Second article", abstract="Abstract", issue=self.issue, slug="second")
+
+        response = Client().get('/journals/test-journal/feed/rss/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Second article")
+
+    def test_unknown_issue_and_format_are_404(self):
+        self.assertEqual(Client().get('/journals/test-journal/2024/1/9/feed/atom/').status_code, 404)
+        self.assertEqual(Client().get('/journals/test-journal/feed/json/').status_code, 404)
+
+    def test_unknown_journal_stores_no_stamp(self):
+        self.assertEqual(Client().get('/journals/no-such-journal/feed/atom/').status_code, 404)
+        self.assertIsNone(cache.get('feeds:stamp:no-such-journal'))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class PageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                             description="Test")
+        issue = Issue.objects.create(journal=cls.journal, volume=1, number=1, year=2024, is_published=True)
+        cls.article = Article.objects.create(title="Cached article", abstract="Abstract", issue=issue,
+                                             slug="cached")
+
+    def setUp(self):
+        cache.clear()
+        self.url = f"/articles/{self.article.id}/"
+
+    def _views(self):
+        return Article.objects.get(id=self.article.id).views
+
+    def test_cached_hits_are_buffered_and_flushed(self):
+        Client().get(self.url)
+        self.assertEqual(self._views(), 1)
+
+        cache.add(page_cache.VIEW_FLUSH_KEY, True)
+        for _ in range(3):
+            self.assertContains(Client().get(self.url), "Cached article")
+        self.assertEqual(self._views(), 1)
+        self.assertEqual(PendingView.objects.get(article=self.article).views, 3)
+
+        self.assertEqual(page_cache.flush_pending_views(), 3)
+        self.assertEqual(self._views(), 4)
+        self.assertFalse(PendingView.objects.exists())
+
+    def test_editing_the_journal_invalidates_its_pages(self):
+        url = f"/journals/{self.journal.url_slug}/"
+        self.assertContains(Client().get(url), "Test Journal")
+
+        self.journal.title = "Renamed Journal"
+        self.journal.save()
+
+        self.assertContains(Client().get(url), "Renamed Journal")
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(SINGLE_FLIGHT_LOCK_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.compute = mock.Mock(side_effect=["first", "second"])
+
+    def test_fresh_entry_is_computed_once_per_version(self):
+        self.assertEqual(single_flight('key', self.compute, 60, version=1), "first")
+        self.assertEqual(single_flight('key', self.compute, 60, version=1), "first")
+        self.assertEqual(single_flight('key', self.compute, 60, version=2), "second")
+        self.assertEqual(self.compute.call_count, 2)
+
+    def test_stale_entry_is_served_while_another_worker_rebuilds(self):
+        single_flight('key', self.compute, 60, version=1)
+
+        with flight_lock('key') as acquired:
+            self.assertTrue(acquired)
+            self.assertEqual(single_flight('key', self.compute, 60, version=2), "first")
+        self.assertEqual(self.compute.call_count, 1)
+
+        self.assertEqual(single_flight('key', self.compute, 60, version=2), "second")
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class HomeSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        authors = [
+            Author.objects.create(first_name=f"Ali{i}", last_name=f"Valiyev{i}", email=f"ali{i}@example.com")
+            for i in range(3)
+        ]
+        for i in range(8):
+            article = Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=issue,
+                                             date_published=date(2024, 1, i + 1), slug=f"article-{i}")
+            for order, author in enumerate(authors[:i % 3 + 1]):
+                ArticleAuthor.objects.create(article=article, author=author, order=order)
+
+    def setUp(self):
+        cache.clear()
+
+    def _home_request(self):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        return request
+
+    def test_snapshot_is_built_in_one_batch(self):
+        with self.assertNumQueries(4):
+            snapshot = build_home_snapshot()
+
+        self.assertEqual(snapshot['journal_stats']['total_articles'], 8)
+        self.assertEqual(len(snapshot['recent_articles']), 6)
+        newest = snapshot['recent_articles'][0]
+        self.assertEqual(newest['article']['title'], "Article 7")
+        self.assertEqual(newest['first_author']['full_name'], "Ali0 Valiyev0")
+        self.assertEqual(newest['author_count'], 2)
+
+    def test_home_view_renders_from_snapshot_without_queries(self):
+        home_view = views.home_view.__wrapped__
+        home_view(self._home_request())
+
+        with self.assertNumQueries(0):
+            response = home_view(self._home_request())
+        self.assertContains(response, "Article 7")
+
+    def test_snapshot_is_rebuilt_after_content_change(self):
+        home_view = views.home_view.__wrapped__
+        home_view(self._home_request())
+
+        article = Article.objects.get(title="Article 7")
+        article.title = "Renamed article"
+        article.save()
+
+        self.assertContains(home_view(self._home_request()), "Renamed article")
+
+
+class PublicationCounterTests(TestCase):
+    def setUp(self):
+        self.journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                              description="Test")
+        self.first = Issue.objects.create(journal=self.journal, volume=1, number=1, year=2023, is_published=True)
+        self.second = Issue.objects.create(journal=self.journal, volume=2, number=1, year=2024, is_published=True)
+        self.articles = [Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=self.first,
+                                                slug=f"article-{i}") for i in range(3)]
+
+    def _counts(self):
+        self.journal.refresh_from_db()
+        return (Issue.objects.get(id=self.first.id).article_count, Issue.objects.get(id=self.second.id).article_count,
+                self.journal.published_issue_count, self.journal.published_article_count,
+                self.journal.first_year, self.journal.latest_year)
+
+    def test_counters_follow_article_and_issue_changes(self):
+        self.assertEqual(self._counts(), (3, 0, 2, 3, 2023, 2024))
+
+        moved = self.articles[0]
+        moved.issue = self.second
+        moved.save()
+        self.assertEqual(self._counts(), (2, 1, 2, 3, 2023, 2024))
+
+        self.articles[1].is_published = False
+        self.articles[1].save()
+        self.articles[2].delete()
+        self.assertEqual(self._counts(), (0, 1, 2, 1, 2023, 2024))
+
+        self.first.is_published = False
+        self.first.save()
+        self.assertEqual(self._counts(), (0, 1, 1, 1, 2024, 2024))
+
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_journals_page_queries_do_not_grow_with_journals(self):
+        def journals_page_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(Client().get("/journals").status_code, 200)
+            return len(queries)
+
+        queries = journals_page_queries()
+        for i in range(3):
+            journal = Journal.objects.create(title=f"Journal {i}", initials=f"J{i}", url_slug=f"journal-{i}",
+                                             description="Test")
+            Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.assertEqual(journals_page_queries(), queries)
+
+    def test_reconcile_fixes_drifted_counters(self):
+        Issue.objects.filter(id=self.first.id).update(article_count=7)
+
+        self.assertEqual(reconcile_counts(), (1, 0, 0))
+        self.assertEqual(self._counts(), (3, 0, 2, 3, 2023, 2024))
+        self.assertEqual(reconcile_counts(), (0, 0, 0))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class AuthorStatisticsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.author = Author.objects.create(first_name="Alisher", last_name="Qodirov", email="a.qodirov@uni.uz")
+        self.articles = []
+        for i, year in enumerate([2021, 2023]):
+            article = Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=issue, views=10,
+                                             date_published=date(year, 1, 1), slug=f"article-{i}")
+            ArticleAuthor.objects.create(article=article, author=self.author, order=0)
+            self.articles.append(article)
+
+    def _stats(self):
+        self.author.refresh_from_db()
+        return self.author.article_count, self.author.total_views, self.author.first_year, self.author.last_year
+
+    def test_statistics_follow_links_and_publication(self):
+        self.assertEqual(self._stats(), (2, 20, 2021, 2023))
+
+        self.articles[1].is_published = False
+        self.articles[1].save()
+        self.assertEqual(self._stats(), (1, 10, 2021, 2021))
+
+        ArticleAuthor.objects.filter(article=self.articles[0]).delete()
+        self.assertEqual(self._stats(), (0, 0, None, None))
+
+    def test_flushed_views_count_for_every_article_of_an_author(self):
+        cache.add(page_cache.VIEW_FLUSH_KEY, True)
+        for article in self.articles:
+            page_cache.count_cached_view(None, article.id)
+
+        self.assertEqual(page_cache.flush_pending_views(), 2)
+        self.assertEqual(self._stats()[1], 22)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        # Shared dates make the id tiebreaker part of the cursor
+        for i in range(7):
+            Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=issue,
+                                   date_published=date(2024, 1, i // 3 + 1), slug=f"article-{i}")
+
+    def setUp(self):
+        cache.clear()
+        self.articles = Article.objects.filter(is_published=True)
+        self.expected = list(self.articles.order_by('-date_published', '-id').values_list('id', flat=True))
+
+    def _ids(self, page):
+        return [article.id for article in page]
+
+    def test_next_and_previous_tokens_round_trip(self):
+        pages, token = [], None
+        while True:
+            page = paginate(self.articles, token, 3)
+            pages.append(page)
+            if not page.has_next():
+                break
+            token = page.next_token
+
+        self.assertEqual([article_id for page in pages for article_id in self._ids(page)], self.expected)
+        self.assertFalse(pages[0].has_previous())
+        self.assertEqual(self._ids(paginate(self.articles, pages[2].previous_token, 3)), self._ids(pages[1]))
+        self.assertEqual(self._ids(paginate(self.articles, pages[1].previous_token, 3)), self._ids(pages[0]))
+
+    def test_malformed_token_serves_first_page(self):
+        for token in ["garbage", "WyJ4IiwgW11d", encode_token({'n': 1})]:
+            self.assertEqual(self._ids(paginate(self.articles, token, 3)), self.expected[:3])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ArticleSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        self.issue = Issue.objects.create(journal=journal, volume=3, number=2, year=2024, is_published=True)
+        self.article = Article.objects.create(title="Listed article", abstract="<p>Plain &amp; simple</p>",
+                                              issue=self.issue, slug="listed")
+        self.author = Author.objects.create(first_name="Alisher", last_name="Qodirov", email="a.qodirov@uni.uz")
+        ArticleAuthor.objects.create(article=self.article, author=self.author, order=0)
+
+    def _summary(self):
+        return ArticleSummary.objects.get(article=self.article)
+
+    def test_summary_follows_article_and_author_changes(self):
+        summary = self._summary()
+        self.assertEqual((summary.authors_display, summary.excerpt, summary.issue_citation),
+                         ("Alisher Qodirov", "Plain & simple", "Jild 3, Son 2"))
+
+        self.author.last_name = "Qodiriy"
+        self.author.save()
+        self.article.title = "Renamed article"
+        self.article.save()
+
+        summary = self._summary()
+        self.assertEqual((summary.title, summary.authors_display), ("Renamed article", "Alisher Qodiriy"))
+        self.assertContains(Client().get('/articles/'), "Alisher Qodiriy")
+
+    def test_cached_views_reach_the_summary(self):
+        cache.add(page_cache.VIEW_FLUSH_KEY, True)
+        page_cache.count_cached_view(None, self.article.id)
+        page_cache.flush_pending_views()
+
+        self.assertEqual(self._summary().views, 1)
+
+    def test_backfill_after_migrate_fills_only_an_empty_table(self):
+        ArticleSummary.objects.all().delete()
+        backfill_summaries()
+        self.assertEqual(self._summary().title, "Listed article")
+
+        Article.objects.filter(id=self.article.id).update(title="Changed quietly")
+        # Table introspection plus one EXISTS query
+        with self.assertNumQueries(2):
+            backfill_summaries()
+        self.assertEqual(self._summary().title, "Listed article")
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.journals, issues = [], []
+        for i, active in enumerate([True, False]):
+            journal = Journal.objects.create(title=f"Journal {i}", initials=f"J{i}", url_slug=f"journal-{i}",
+                                             description="Test", is_active=active)
+            self.journals.append(journal)
+            issues.append(Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True))
+        # (issue, year, language)
+        for i, (issue, year, language) in enumerate([(0, 2023, 'uz'), (0, 2024, 'uz'), (0, 2024, 'en'),
+                                                      (1, 2024, 'uz')]):
+            Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=issues[issue],
+                                   date_published=date(year, 1, 1), language=language, slug=f"article-{i}")
+
+    def _counts(self, items, key):
+        return {item[key]: item['count'] for item in items}
+
+    def test_each_facet_is_counted_under_the_other_filters(self):
+        facets = article_facets({'year': 2024, 'language': 'uz'})
+
+        self.assertEqual(facets['total'], 2)
+        self.assertEqual(self._counts(facets['years'], 'year'), {2023: 1, 2024: 2})
+        self.assertEqual(self._counts(facets['languages'], 'code'), {'uz': 2, 'en': 1})
+
+    def test_counts_follow_edits(self):
+        article = Article.objects.get(title="Article 0")
+        article.date_published = date(2024, 6, 1)
+        article.save()
+
+        self.assertEqual(self._counts(article_facets({})['years'], 'year'), {2024: 4})
+
+    def test_inactive_journals_are_not_offered(self):
+        facets = article_facets({})
+
+        self.assertEqual(facets['total'], 4)
+        self.assertEqual(self._counts(facets['journals'], 'id'), {self.journals[0].id: 3})
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class KeywordIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        self.issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.first = self._article("Machine  Learning, Cotton")
+        self.second = self._article("machine learning; , soil")
+
+    def _article(self, keywords):
+        count = Article.objects.count()
+        return Article.objects.create(title=f"Article {count}", abstract="Abstract", issue=self.issue,
+                                      keywords=keywords, slug=f"article-{count}")
+
+    def _counts(self):
+        return dict(Keyword.objects.values_list('normalized', 'article_count'))
+
+    def test_spellings_share_one_keyword(self):
+        self.assertEqual(self._counts(), {'machine learning': 2, 'cotton': 1, 'soil': 1})
+        keyword = Keyword.objects.get(normalized='machine learning')
+        self.assertEqual(keyword.name, "Machine Learning")
+        response = Client().get(f"/keywords/{keyword.slug}/")
+        self.assertContains(response, "Article 0")
+        self.assertContains(response, "Article 1")
+
+    def test_counts_follow_edits_and_unused_keywords_are_dropped(self):
+        self.first.keywords = "Soil"
+        self.first.save()
+        self.second.is_published = False
+        self.second.save()
+
+        self.assertEqual(self._counts(), {'machine learning': 0, 'soil': 1})
+        self.assertEqual([keyword.normalized for keyword in keyword_cloud()], ['soil'])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class InstitutionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        self.issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+
+    def _author(self, affiliation, i):
+        author = Author.objects.create(first_name=f"Ali{i}", last_name="Valiyev", email=f"ali{i}@uni.uz",
+                                       affiliation=affiliation)
+        article = Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=self.issue,
+                                         slug=f"article-{i}")
+        ArticleAuthor.objects.create(article=article, author=author, order=0)
+        return author
+
+    def test_spellings_across_scripts_share_one_institution(self):
+        for i, affiliation in enumerate(["O'zbekiston milliy universiteti.", "Ўзбекистон Миллий университети",
+                                         "O‘zbekiston milliy universitet"]):
+            self._author(affiliation, i)
+
+        institution = Institution.objects.get()
+        self.assertEqual((institution.author_count, institution.article_count), (3, 3))
+        self.assertContains(Client().get(f"/institutions/{institution.slug}/"), "Ali2 Valiyev")
+
+    def test_near_matches_need_the_same_numbers(self):
+        self._author("Toshkent shahar Chilonzor tumani 110-son maktab", 0)
+        self._author("Toshkent shahar Chilonzor tumani 115-son maktab", 1)
+        self._author("Toshkent shahar Chilonzor tumani 110-son maktabi", 2)
+
+        self.assertEqual(sorted(Institution.objects.values_list('author_count', flat=True)), [1, 2])
+
+    def test_moving_the_last_member_drops_the_institution(self):
+        author = self._author("Buxoro davlat universiteti", 0)
+        author.affiliation = "Samarqand davlat universiteti"
+        author.save()
+
+        institution = Institution.objects.get()
+        self.assertEqual(institution.name, "Samarqand davlat universiteti")
+        self.assertEqual((institution.author_count, institution.article_count), (1, 1))
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.article = Article.objects.create(title="Тошкент шаҳри тарихи", abstract="Abstract", issue=issue,
+                                              slug="toshkent")
+        self.author = Author.objects.create(first_name="Dilshod", last_name="Ergashev", email="d@uni.uz")
+
+    def _search(self, query):
+        return Client().get("/search/", {'q': query}).context
+
+    def test_latin_query_finds_cyrillic_title(self):
+        context = self._search("toshkent tarix")
+        self.assertEqual([article.id for article in context['article_results']], [self.article.id])
+        self.assertEqual(context['journal_count'], 0)
+
+    def test_deleted_author_leaves_no_tokens(self):
+        self.assertEqual([author.id for author in self._search("Эргашев")['author_results']], [self.author.id])
+
+        self.author.delete()
+
+        self.assertFalse(SearchToken.objects.filter(kind=SearchToken.AUTHOR, object_id=self.author.id).exists())
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('main.autocomplete._index', autocomplete.PrefixIndex())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.article = Article.objects.create(title="Тошкент тарихи", abstract="Abstract", issue=issue,
+                                              slug="toshkent")
+
+    def _labels(self, query):
+        return [suggestion['label'] for suggestion in autocomplete.suggest(query)]
+
+    def test_prefix_of_any_word_matches_without_queries(self):
+        autocomplete.warm_up()
+        with self.assertNumQueries(0):
+            response = Client().get("/search/autocomplete/", {'q': "tari"})
+        self.assertEqual([result['label'] for result in response.json()['results']], ["Тошкент тарихи"])
+
+    def test_committed_changes_reach_a_built_index(self):
+        self.assertEqual(self._labels("tosh"), ["Тошкент тарихи"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.title = "Samarqand tarixi"
+            self.article.save()
+
+        self.assertEqual(self._labels("tosh"), [])
+        self.assertEqual(self._labels("samar"), ["Samarqand tarixi"])
+
+    def test_change_is_logged_when_the_sequence_is_evicted_before_incr(self):
+        with mock.patch.object(cache, 'incr', side_effect=[ValueError("evicted"), 1]) as incr:
+            with self.captureOnCommitCallbacks(execute=True):
+                autocomplete.record_changes(autocomplete.ARTICLE, [self.article.id])
+
+        self.assertEqual(incr.call_count, 2)
+        self.assertEqual(cache.get("autocomplete:change:1"), (autocomplete.ARTICLE, [self.article.id]))
+
+
+class SpellingTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_patcher = override_settings(SPELLING_INDEX_PATH=f"{directory.name}/spelling_index.pickle")
+        settings_patcher.enable()
+        self.addCleanup(settings_patcher.disable)
+        loaded_patcher = mock.patch.dict('main.spelling._loaded', {'mtime': None, 'index': None})
+        loaded_patcher.start()
+        self.addCleanup(loaded_patcher.stop)
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        Article.objects.create(title="Samarqand tarixi", abstract="Abstract", issue=issue, slug="samarqand")
+
+    def test_unknown_words_are_corrected_from_the_saved_index(self):
+        self.assertIsNone(did_you_mean("samrqand"))
+
+        rebuild_spelling_index()
+
+        self.assertEqual(did_you_mean("Самрқанд tarix"), "samarqand tarix")
+        self.assertIsNone(did_you_mean("samarqand"))
+
+    def test_zero_result_search_shows_the_suggestion(self):
+        rebuild_spelling_index()
+
+        response = Client().get("/search/", {'q': "samrqand"})
+        self.assertEqual(response.context['total_results'], 0)
+        self.assertEqual(response.context['suggestion'], "samarqand")
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SearchCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('main.search_cache._results', search_cache.LRUCache(search_cache.SEARCH_CACHE_SIZE))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.article = Article.objects.create(title="Toshkent universiteti", abstract="Abstract", issue=issue,
+                                              slug="toshkent")
+
+    def test_equivalent_queries_share_an_entry_until_content_changes(self):
+        compute = mock.Mock(return_value={'article_ids': [self.article.id]})
+        search_cache.cached_search("Toshkent universiteti", compute)
+        search_cache.cached_search("universiteti  TOSHKENT", compute)
+        self.assertEqual(compute.call_count, 1)
+        self.assertEqual(search_cache.search_cache_stats()['hits'], 1)
+
+        self.article.title = "Samarqand universiteti"
+        self.article.save()
+
+        search_cache.cached_search("Toshkent universiteti", compute)
+        self.assertEqual(compute.call_count, 2)
+
+    def test_spelling_index_rebuild_refreshes_suggestions(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(SPELLING_INDEX_PATH=os.path.join(directory, 'spelling_index.pickle')), \
+                mock.patch.dict('main.spelling._loaded', {'mtime': None, 'index': None}):
+            self.assertIsNone(Client().get("/search/", {'q': "toshknt"}).context['suggestion'])
+
+            rebuild_spelling_index()
+
+            self.assertEqual(Client().get("/search/", {'q': "toshknt"}).context['suggestion'], "toshkent")
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class RelatedArticlesTests(TestCase):
+    TOPICS = ["cotton irrigation water soil", "neural network learning model"]
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(RELATED_INDEX_PATH=os.path.join(directory.name, 'related.npz'))
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        self.issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        for i in range(6):
+            self._article(f"{self.TOPICS[i % 2]} study {i}")
+
+    def _article(self, title):
+        return Article.objects.create(title=title, abstract=title, issue=self.issue, slug=f"article-{title[-1]}")
+
+    def _neighbours(self, article):
+        return list(ArticleNeighbor.objects.filter(article=article).values_list('neighbor_id', flat=True))
+
+    def test_incremental_update_lists_each_neighbour_once(self):
+        build_related()
+        first, second = self._article("cotton irrigation water 7"), self._article("cotton irrigation soil 8")
+
+        self.assertEqual(update_related(), 2)
+
+        for article in [first, second, *Article.objects.filter(title__startswith="cotton")]:
+            neighbours = self._neighbours(article)
+            self.assertEqual(len(neighbours), len(set(neighbours)))
+            self.assertNotIn(article.id, neighbours)
+        self.assertIn(second.id, self._neighbours(first))
+        self.assertIn(first.id, self._neighbours(second))
+        self.assertIn(first.id, self._neighbours(Article.objects.get(title="cotton irrigation water soil study 0")))
+
+    def test_article_without_neighbours_lists_latest_of_its_journal(self):
+        other_journal = Journal.objects.create(title="Other Journal", initials="OJ", url_slug="other-journal",
+                                               description="Test")
+        other_issue = Issue.objects.create(journal=other_journal, volume=1, number=1, year=2024, is_published=True)
+        Article.objects.create(title="Elsewhere", abstract="Abstract", issue=other_issue, slug="elsewhere",
+                               date_published=date(2030, 1, 1))
+        article = self._article("cotton irrigation water 7")
+
+        response = Client().get(reverse('article_detail', kwargs={'article_id': article.id}))
+
+        expected = list(Article.objects.filter(issue=self.issue).exclude(id=article.id)
+                        .order_by('-date_published', '-id').values_list('id', flat=True)[:5])
+        self.assertEqual([summary.article_id for summary in response.context['related_articles']], expected)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TrendingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # A flush just ran, so new events wait in the buffer
+        cache.add(page_cache.VIEW_FLUSH_KEY, True, page_cache.VIEW_FLUSH_SECONDS)
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.journal_id = journal.id
+        self.viewed, self.downloaded = [
+            Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=issue, slug=f"article-{i}")
+            for i in range(2)
+        ]
+        Article.objects.create(title="Quiet", abstract="Abstract", issue=issue, slug="quiet")
+
+    def _trending_ids(self, journal_id=None):
+        return [row['article_id'] for row in trending_articles(journal_id)]
+
+    def test_events_are_applied_in_batches_by_the_flush(self):
+        self.viewed.increment_views()
+        page_cache.count_cached_view(None, self.viewed.id)
+        self.downloaded.increment_downloads()
+
+        self.assertFalse(ArticleTrend.objects.exists())
+        self.assertEqual(dict(PendingView.objects.values_list('article_id', 'trend_weight')),
+                         {self.viewed.id: 1, self.downloaded.id: 3})
+
+        self.assertEqual(page_cache.flush_pending_views(), 1)
+        self.assertFalse(PendingView.objects.exists())
+        self.assertEqual(self._trending_ids(), [self.downloaded.id, self.viewed.id])
+        self.assertEqual(self._trending_ids(self.journal_id), [self.downloaded.id, self.viewed.id])
+
+    def test_scores_decay_with_age(self):
+        self.viewed.increment_views()
+        page_cache.flush_pending_views()
+        later = timezone.now() + timedelta(days=14)
+        with mock.patch('main.trending.timezone.now', return_value=later):
+            self.downloaded.increment_views()
+            page_cache.flush_pending_views()
+            self.assertEqual(self._trending_ids(), [self.downloaded.id])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CitationGraphTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        self.issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.by_doi = self._article("Suv resurslarini boshqarish", doi="10.1234/tj.1")
+        self.by_title = self._article("Paxta hosildorligini oshirish usullari")
+
+    def _article(self, title, **fields):
+        return Article.objects.create(title=title, abstract="Abstract", issue=self.issue,
+                                      slug=f"article-{Article.objects.count()}", **fields)
+
+    def _counts(self):
+        return [Article.objects.get(pk=article.pk).citation_count for article in [self.by_doi, self.by_title]]
+
+    def test_references_resolve_by_doi_and_fuzzy_title(self):
+        citing = self._article("Citing", references=(
+            "1. Karimov A. Water management. Test Journal, 2024. https://doi.org/10.1234/TJ.1.\n"
+            "2. Valiyev B. Пахта ҳосилдорлигини ошириш усуллари // Test Journal. 2024.\n"
+            "3. Unrelated book, Tashkent, 1999."
+        ))
+
+        self.assertEqual(dict(CitationEdge.objects.filter(citing=citing).values_list('cited_id', 'method')),
+                         {self.by_doi.id: CitationEdge.DOI, self.by_title.id: CitationEdge.TITLE})
+        self.assertEqual(self._counts(), [1, 1])
+
+        citing.is_published = False
+        citing.save()
+        self.assertEqual(self._counts(), [0, 0])
+
+    def test_deleting_the_citing_article_recounts(self):
+        citing = self._article("Citing", references="[1] https://doi.org/10.1234/tj.1")
+        self.assertEqual(self._counts(), [1, 0])
+
+        citing.delete()
+        self.assertEqual(self._counts(), [0, 0])
+
+
+class HIndexTests(SimpleTestCase):
+    def test_h_index(self):
+        self.assertEqual(h_index([]), 0)
+        self.assertEqual(h_index([0, 0]), 0)
+        self.assertEqual(h_index([1]), 1)
+        self.assertEqual(h_index([10, 8, 5, 4, 3]), 4)
+        self.assertEqual(h_index([3, 25, 0, 6, 5, 3]), 3)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class AuthorMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        self.issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.author = Author.objects.create(first_name="Alisher", last_name="Qodirov", email="a.qodirov@uni.uz")
+        for i in range(3):
+            article = self._article(f"Article {i}", doi=f"10.1234/tj.{i}")
+            ArticleAuthor.objects.create(article=article, author=self.author, order=0)
+
+    def _article(self, title, **fields):
+        return Article.objects.create(title=title, abstract="Abstract", issue=self.issue,
+                                      slug=f"article-{Article.objects.count()}", **fields)
+
+    def _stats(self):
+        stats = AuthorStats.objects.get(author=self.author)
+        return stats.total_citations, stats.h_index, stats.citations_per_year
+
+    def test_citing_articles_update_the_metrics(self):
+        self._article("Citing 2023", date_published=date(2023, 5, 1),
+                      references="1. 10.1234/tj.0\n2. 10.1234/tj.1")
+        self._article("Citing 2024", date_published=date(2024, 5, 1),
+                      references="1. 10.1234/tj.0\n2. 10.1234/tj.1\n3. 10.1234/tj.2")
+
+        self.assertEqual(self._stats(), (5, 2, [[2023, 2], [2024, 3]]))
+
+        AuthorStats.objects.all().delete()
+        self.assertEqual(rebuild_author_metrics(), 1)
+        self.assertEqual(self._stats(), (5, 2, [[2023, 2], [2024, 3]]))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CoAuthorshipTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.first, self.second, self.third = [
+            Author.objects.create(first_name=name, last_name="Valiyev", email=f"{name.lower()}@uni.uz")
+            for name in ["Ali", "Bobur", "Dilshod"]
+        ]
+        self.articles = [
+            Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=issue, slug=f"article-{i}",
+                                   date_published=date(2022 + i, 1, 1))
+            for i in range(2)
+        ]
+        for article in self.articles:
+            ArticleAuthor.objects.create(article=article, author=self.first, order=0)
+            ArticleAuthor.objects.create(article=article, author=self.second, order=1)
+        ArticleAuthor.objects.create(article=self.articles[0], author=self.third, order=2)
+
+    def _collaborators(self, author):
+        return [(row.coauthor_id, row.paper_count, row.last_year) for row in top_collaborators(author.id)]
+
+    def test_pairs_follow_article_links_and_status(self):
+        self.assertEqual(self._collaborators(self.first), [(self.second.id, 2, 2023), (self.third.id, 1, 2022)])
+        self.assertEqual(self._collaborators(self.third), [(self.first.id, 1, 2022), (self.second.id, 1, 2022)])
+
+        self.articles[0].is_published = False
+        self.articles[0].save()
+
+        self.assertEqual(self._collaborators(self.first), [(self.second.id, 1, 2023)])
+        self.assertEqual(self._collaborators(self.third), [])
+        self.assertEqual(rebuild_coauthorships(), 1)
+
+    def test_graph_lists_each_pair_once(self):
+        graph = Client().get("/authors/graph.json").json()
+
+        self.assertEqual({node['id'] for node in graph['nodes']}, {self.first.id, self.second.id, self.third.id})
+        self.assertEqual(len(graph['links']), 3)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class JournalAnalyticsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                              description="Test")
+        issue = Issue.objects.create(journal=self.journal, volume=1, number=1, year=2024, is_published=True)
+        first = Author.objects.create(first_name="Ali", last_name="Valiyev", email="ali@uni.uz")
+        second = Author.objects.create(first_name="Bobur", last_name="Saidov", email="bobur@uni.uz")
+        for i, (year, language, views, authors) in enumerate([
+            (2022, 'uz', 10, [first]),
+            (2024, 'uz', 30, [first, second]),
+            (2024, 'en', 20, [second]),
+        ]):
+            article = Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=issue,
+                                             slug=f"article-{i}", date_published=date(year, 3, 1),
+                                             language=language, views=views)
+            for order, author in enumerate(authors):
+                ArticleAuthor.objects.create(article=article, author=author, order=order)
+
+    def test_yearly_series_and_language_matrix(self):
+        report = build_journal_analytics(self.journal)
+
+        self.assertEqual(report['years'], [2022, 2023, 2024])
+        self.assertEqual(report['languages'], ['en', 'uz'])
+        self.assertEqual(report['matrices']['articles'], [[0, 1], [0, 0], [1, 1]])
+        self.assertEqual(report['series']['views'], [10, 0, 50])
+        self.assertEqual(report['series']['authors'], [1, 0, 2])
+        self.assertEqual(report['series']['new_authors'], [1, 0, 1])
+        self.assertEqual(report['derived']['views_per_article'], [10.0, 0.0, 25.0])
+        self.assertEqual(report['derived']['articles_growth'], [None, -1.0, None])
+
+    def test_report_is_cached_until_the_journal_changes(self):
+        journal_analytics(self.journal)
+        with self.assertNumQueries(0):
+            journal_analytics(self.journal)
+
+        Article.objects.get(slug="article-0").delete()
+        self.assertEqual(journal_analytics(self.journal)['years'], [2024])
+
+
+class AuthorSimilarityTests(SimpleTestCase):
+    def _score(self, first, second):
+        return author_dedup.similarity(author_dedup._profile(**first), author_dedup._profile(**second))
+
+    def test_same_person_across_scripts(self):
+        latin = {'first_name': 'Alisher', 'last_name': "G'ulomov", 'affiliation': 'Toshkent davlat universiteti'}
+        cyrillic = {'first_name': 'Алишер', 'last_name': 'Ғуломов', 'affiliation': 'Тошкент давлат университети'}
+        self.assertEqual(self._score(latin, cyrillic), 1.0)
+
+    def test_orcid_decides(self):
+        first = {'first_name': 'Alisher', 'last_name': 'Qodirov', 'orcid': '0000-0002-1825-0097'}
+        self.assertEqual(self._score(first, {**first, 'orcid': 'https://orcid.org/0000-0002-1825-0097'}), 1.0)
+        self.assertEqual(self._score(first, {**first, 'orcid': '0000-0001-5109-3700'}), 0.0)
+
+    def test_initial_is_a_candidate_but_not_an_automatic_match(self):
+        score = self._score({'first_name': 'A.', 'last_name': 'Qodirov'},
+                            {'first_name': 'Alisher', 'last_name': 'Qodirov'})
+        self.assertGreaterEqual(score, author_dedup.CANDIDATE_THRESHOLD)
+        self.assertLess(score, author_dedup.AUTO_MATCH_THRESHOLD)
+
+    def test_similar_given_names_are_not_merged_automatically(self):
+        affiliation = 'Buxoro davlat universiteti'
+        score = self._score({'first_name': 'Aziz', 'last_name': 'Karimov', 'affiliation': affiliation},
+                            {'first_name': 'Aziza', 'last_name': 'Karimov', 'affiliation': affiliation})
+        self.assertLess(score, author_dedup.AUTO_MATCH_THRESHOLD)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class MergeAuthorsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        journal = Journal.objects.create(title="Test Journal", initials="TJ", url_slug="test-journal",
+                                         description="Test")
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2024, is_published=True)
+        self.shared, self.moved = [
+            Article.objects.create(title=f"Article {i}", abstract="Abstract", issue=issue, slug=f"article-{i}")
+            for i in range(2)
+        ]
+        self.target = Author.objects.create(first_name="Alisher", last_name="Qodirov",
+                                            email=author_dedup.placeholder_email("Alisher", "Qodirov"))
+        self.duplicate = Author.objects.create(first_name="Алишер", last_name="Қодиров",
+                                               email="a.qodirov@uni.uz", affiliation="Toshkent davlat universiteti")
+        self.coauthor = Author.objects.create(first_name="Bobur", last_name="Saidov", email="b.saidov@uni.uz")
+        ArticleAuthor.objects.create(article=self.shared, author=self.target, order=0)
+        ArticleAuthor.objects.create(article=self.shared, author=self.duplicate, order=1)
+        ArticleAuthor.objects.create(article=self.moved, author=self.duplicate, order=0)
+        ArticleAuthor.objects.create(article=self.moved, author=self.coauthor, order=1)
+
+    def test_merge_moves_links_and_fills_profile(self):
+        self.assertEqual(author_dedup.merge_authors(self.target, [self.duplicate]), 1)
+
+        self.assertFalse(Author.objects.filter(id=self.duplicate.id).exists())
+        links = ArticleAuthor.objects.filter(author=self.target).values_list('article_id', flat=True)
+        self.assertEqual(sorted(links), [self.shared.id, self.moved.id])
+        self.assertEqual(ArticleAuthor.objects.filter(article=self.shared).count(), 1)
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.email, "a.qodirov@uni.uz")
+        self.assertEqual(self.target.affiliation, "Toshkent davlat universiteti")
+        self.assertEqual(self.target.article_count, 2)
+        self.assertEqual(CoAuthorship.objects.get(author=self.coauthor, coauthor=self.target).paper_count, 1)
+        self.assertFalse(CoAuthorship.objects.filter(coauthor_id=self.duplicate.id).exists())
+
+    def test_failed_merge_changes_nothing(self):
+        with mock.patch('main.signals.author_links_changed', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                author_dedup.merge_authors(self.target, [self.duplicate])
+
+        self.assertTrue(Author.objects.filter(id=self.duplicate.id).exists())
+        self.assertEqual(ArticleAuthor.objects.filter(author=self.duplicate).count(), 2)
+        self.assertEqual(ArticleAuthor.objects.filter(author=self.target).count(), 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class DuplicateCandidateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.latin = Author.objects.create(first_name="Alisher", last_name="Qodirov", email="a.qodirov@uni.uz",
+                                           affiliation="Toshkent davlat universiteti")
+        self.cyrillic = Author.objects.create(first_name="Алишер", last_name="Қодиров", email="alisher@uni.uz",
+                                              affiliation="Тошкент давлат университети")
+        Author.objects.create(first_name="Bobur", last_name="Qodirov", email="b.qodirov@uni.uz")
+
+    def test_pairs_come_from_shared_blocking_keys(self):
+        self.assertEqual([(first, second) for _, first, second in author_dedup.candidate_pairs()],
+                         [(self.latin.id, self.cyrillic.id)])
+
+    def test_entry_finds_the_author_across_scripts(self):
+        found = author_dedup.find_candidates("Алишер", "Қодиров", email="a.qodirov@uni.uz")
+        self.assertEqual(found[0][1], self.latin)
@@ -0,0 +1,40 @@
+"""
+Script folding for matching user-entered text.
+
+Names, titles and affiliations arrive in Uzbek Latin, Uzbek Cyrillic and
+Russian, with any of half a dozen apostrophe characters in o'/g'. fold()
+maps all of them onto one lower-case Latin form, so "Ўзбекистон",
+"O‘zbekiston" and "OZBEKISTON" compare equal.
+"""
+import re
+import unicodedata
+
+_CYRILLIC = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'j',
+    'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o',
+    'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '', 'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu',
+    'я': 'ya', 'ў': 'o', 'қ': 'q', 'ғ': 'g', 'ҳ': 'h', 'і': 'i', 'є': 'e',
+}
+_TRANSLATION = str.maketrans({
+    **_CYRILLIC,
+    # o'/g' apostrophe variants and the tutuq belgisi are dropped
+    **{mark: '' for mark in "'`´ʻʼ‘’′"},
+})
+# Russian-style romanization of х and word-initial е
+_LATIN_VARIANTS = [(re.compile(r'kh'), 'x'), (re.compile(r'\bye'), 'e')]
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def to_latin(text):
+    """Lower-case text with Cyrillic letters transliterated to Uzbek Latin and accents removed"""
+    text = (text or '').casefold().translate(_TRANSLATION)
+    return ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+
+
+def fold(text):
+    """Script-, case- and punctuation-insensitive matching key: words joined by single spaces"""
+    text = _NON_WORD.sub(' ', to_latin(text))
+    for pattern, replacement in _LATIN_VARIANTS:
+        text = pattern.sub(replacement, text)
+    return ' '.join(text.split())
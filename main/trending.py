@@ -0,0 +1,158 @@
+"""
+Trending articles.
+
+Each article's trend score is the sum of its view and download events, each
+weighted by e^(-age / TAU) so it halves every HALF_LIFE. ArticleTrend
+stores it in log space relative to a fixed epoch,
+``log_score = ln Σ w·e^((t - EPOCH) / TAU)``, which decays every score by
+the same factor as time passes - the ranking never needs rewriting, and a
+new event only adds ``w·e^((now - EPOCH) / TAU)`` to its own article.
+
+Events are not applied one by one: record_activity queues their weight in
+PendingView next to the buffered views of cached pages, and
+main.page_cache.flush_pending_views adds each batch with one UPDATE per
+distinct weight, then recomputes the top lists of the site and of the
+journals with activity since the previous refresh (the refresh_trending
+command does the same for quiet periods). Pages depending on a list are
+invalidated only when its articles change. The lists are kept in the shared
+cache under the site content version, so a page reads one with a cache
+lookup.
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+from .models import Article, ArticleSummary, ArticleTrend
+from .page_cache import SITE_SCOPE, add_pending_trend_weight, bump_scopes, current_versions
+
+HALF_LIFE = timedelta(days=3)
+TAU = HALF_LIFE.total_seconds() / math.log(2)
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+VIEW_WEIGHT = 1
+DOWNLOAD_WEIGHT = 3
+# Articles whose decayed score fell below this are no longer trending
+MIN_SCORE = 0.1
+# Score of a row before its first event (e^-1e9 is zero)
+EMPTY_LOG_SCORE = -1e9
+
+# A refresh looks back this much before the previous one
+REFRESH_OVERLAP_SECONDS = 60
+REFRESHED_AT_KEY = 'trending:refreshed-at'
+TRENDING_COUNT = 5
+TRENDING_TIMEOUT = 60 * 60 * 6
+
+TRENDING_SCOPE = 'trending'
+
+
+def journal_trending_scope(journal_id):
+    return f"trending:{journal_id}"
+
+
+def _list_key(journal_id=None):
+    return f"trending:top:{journal_id or 'site'}"
+
+
+def _now_offset():
+    """Log-space weight of an event happening now"""
+    return (timezone.now() - EPOCH).total_seconds() / TAU
+
+
+def add_trend_weight(article_ids, weight):
+    """Add an event weight to the trend scores of the given articles"""
+    article_ids = set(article_ids)
+    # log_score = ln(e^log_score + e^added), evaluated in SQL so concurrent events add up
+    added = Value(_now_offset() + math.log(weight))
+    values = {
+        'log_score': Greatest(F('log_score'), added) + Ln(1 + Exp(-Abs(F('log_score') - added))),
+        'last_activity': timezone.now(),
+    }
+    if ArticleTrend.objects.filter(article_id__in=article_ids).update(**values) == len(article_ids):
+        return
+    with transaction.atomic():
+        missing = set(Article.objects.filter(id__in=article_ids).exclude(trend__isnull=False)
+                      .values_list('id', flat=True))
+        ArticleTrend.objects.bulk_create(
+            [ArticleTrend(article_id=article_id, log_score=EMPTY_LOG_SCORE) for article_id in missing],
+            ignore_conflicts=True,
+        )
+        ArticleTrend.objects.filter(article_id__in=missing).update(**values)
+
+
+def record_activity(article_ids, views=0, downloads=0):
+    """Queue view/download events of the given articles for their trend scores"""
+    weight = views * VIEW_WEIGHT + downloads * DOWNLOAD_WEIGHT
+    if weight > 0 and article_ids:
+        add_pending_trend_weight(article_ids, weight)
+
+
+def refresh_trending_lists():
+    """
+    Recompute the site list and the lists of journals with activity since the
+    previous refresh; returns the number of lists whose articles changed.
+    """
+    now = timezone.now()
+    since = cache.get(REFRESHED_AT_KEY)
+    cache.set(REFRESHED_AT_KEY, now, None)
+    active = ArticleTrend.objects.all()
+    if since is not None:
+        # Overlap the previous window so events committed late are not missed
+        active = active.filter(last_activity__gte=since - timedelta(seconds=REFRESH_OVERLAP_SECONDS))
+    journal_ids = set(ArticleSummary.objects.filter(article_id__in=active.values('article_id'))
+                      .exclude(journal_id=None).values_list('journal_id', flat=True).distinct())
+
+    changed = refresh_trending([None, *journal_ids])
+    if changed:
+        bump_scopes([TRENDING_SCOPE if journal_id is None else journal_trending_scope(journal_id)
+                     for journal_id in changed])
+    return len(changed)
+
+
+def _top(journal_id=None, count=TRENDING_COUNT):
+    """Best published articles by current trend score, as plain dicts"""
+    offset = _now_offset()
+    summaries = ArticleSummary.objects.filter(
+        is_published=True,
+        article__trend__log_score__gte=offset + math.log(MIN_SCORE),
+    )
+    if journal_id:
+        summaries = summaries.filter(journal_id=journal_id)
+    rows = summaries.order_by('-article__trend__log_score', 'article_id').values(
+        'article_id', 'title', 'authors_display', 'journal_title', 'journal_slug', 'views',
+        log_score=F('article__trend__log_score'),
+    )[:count]
+    articles = []
+    for row in rows:
+        row['score'] = round(math.exp(row.pop('log_score') - offset), 2)
+        articles.append(row)
+    return articles
+
+
+def refresh_trending(journal_ids):
+    """Recompute the cached top lists (None for the site-wide one); returns those whose articles changed"""
+    version = current_versions([SITE_SCOPE])[SITE_SCOPE]
+    keys = {journal_id: _list_key(journal_id) for journal_id in set(journal_ids)}
+    previous = cache.get_many(list(keys.values()))
+    lists = {journal_id: _top(journal_id) for journal_id in keys}
+    cache.set_many({keys[journal_id]: (version, articles) for journal_id, articles in lists.items()}, TRENDING_TIMEOUT)
+    return [
+        journal_id for journal_id, articles in lists.items()
+        if [row['article_id'] for row in previous.get(keys[journal_id], (None, []))[1]]
+        != [row['article_id'] for row in articles]
+    ]
+
+
+def trending_articles(journal_id=None):
+    """Cached top list of the site (or of one journal); recomputed after content changes"""
+    version = current_versions([SITE_SCOPE])[SITE_SCOPE]
+    entry = cache.get(_list_key(journal_id))
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    articles = _top(journal_id)
+    cache.set(_list_key(journal_id), (version, articles), TRENDING_TIMEOUT)
+    return articles
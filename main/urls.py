@@ -1,7 +1,7 @@
 from django.urls import path
 from django.views.generic import RedirectView
 
-from . import views, admin_views
+from . import views, admin_views, oai
 
 urlpatterns = [
     path('', views.home_view, name='home'),
@@ -12,11 +12,13 @@ urlpatterns = [
     path('accounts/login/', views.contact_view, name='login'),
     path('journals', views.journals_list, name='journals'),
     path('search/', views.global_search, name='global_search'),
+    path('search/autocomplete/', views.search_autocomplete, name='search_autocomplete'),
     path('allauthors', views.authors_list, name='allauthors'),
     path('tt', views.test_diploma_view, name='testing'),
 
     # SEO URLs - Using advanced versions with Issues support and SiteSEO integration
     path('sitemap.xml', admin_views.generate_sitemap, name='sitemap'),
     path('robots.txt', admin_views.robots_txt, name='robots'),
+    path('oai/', oai.oai_pmh, name='oai_pmh'),
 path("favicon.ico", RedirectView.as_view(url="/static/images/favicon.ico", permanent=True)),
 ]
@@ -3,87 +3,77 @@ from datetime import datetime
 
 from django.contrib import messages
 from django.core.mail import send_mail
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import redirect
 import mimetypes
 from main.forms import ContactForm
 from main.models import *
 from main.utils import send_to_telegram, send_diploma_email
-
-from django.db.models import Q, Value, F, Exists, OuterRef, Count, Max, Min
-from django.db.models.functions import Concat
+from main.page_cache import SITE_SCOPE, cache_public_page, page_depends_on
+from main.trending import TRENDING_SCOPE, trending_articles
+from main.home_snapshot import get_home_snapshot
+from main.search_index import search_filter, search_words
+from main.autocomplete import suggest
+from main.spelling import did_you_mean
+from main.search_cache import cached_search
+
+from django.db.models import Q, Prefetch
 from django.shortcuts import render
+from django.core.paginator import Paginator
+
+AUTHORS_PER_PAGE = 24
+
+
+def _search_ids(q, words):
+    """Ids of the journals, authors and articles matching a query, with a spelling suggestion when none do"""
+    # Titles, names and keywords match through the script-folded token index (main.search_index)
+    journal_ids = list(Journal.objects.filter(search_filter(SearchToken.JOURNAL, words)).values_list('id', flat=True))
+    author_ids = list(Author.objects.filter(search_filter(SearchToken.AUTHOR, words)).values_list('id', flat=True))
+
+    # Abstracts are not tokenized: they still match the raw query words
+    abstract_q = Q()
+    for t in q.split():
+        abstract_q &= Q(abstract__icontains=t)
+    article_ids = list(Article.objects.filter(
+        search_filter(SearchToken.ARTICLE, words) | abstract_q
+    ).values_list('id', flat=True))
+
+    found = journal_ids or author_ids or article_ids
+    return {
+        'journal_ids': journal_ids,
+        'author_ids': author_ids,
+        'article_ids': article_ids,
+        'suggestion': None if found else did_you_mean(q),
+    }
 
 
 def global_search(request):
     q = (request.GET.get('q') or '').strip()
     journal_results = article_results = author_results = []
     journal_count = article_count = author_count = total_results = 0
+    suggestion = None
 
-    if len(q) >= 2:
-        tokens = [t for t in q.split() if t]
-
-        # Journals
-        j_q = Q()
-        for t in tokens:
-            j_q &= (Q(title__icontains=t) | Q(description__icontains=t) | Q(meta_keywords__icontains=t))
-        journal_results = Journal.objects.only('id', 'title', 'url_slug').filter(j_q)
-
-        # Authors — rename annotations to avoid 'full_name' clash
-        authors_qs = Author.objects.annotate(
-            full_name_text=Concat(F('first_name'), Value(' '), F('middle_name'), Value(' '), F('last_name')),
-            full_name_rev_text=Concat(F('last_name'), Value(' '), F('first_name')),
-        )
-
-        a_q = Q()
-        for t in tokens:
-            a_q &= (
-                    Q(first_name__icontains=t) |
-                    Q(middle_name__icontains=t) |
-                    Q(last_name__icontains=t) |
-                    Q(full_name_text__icontains=t) |
-                    Q(full_name_rev_text__icontains=t) |
-                    Q(affiliation__icontains=t)
-            )
-
-        author_results = (authors_qs
-                          .filter(a_q)
-                          .only('id', 'first_name', 'middle_name', 'last_name', 'affiliation', 'photo')
-                          .distinct())
-
-        # Articles — use EXISTS for matching authors; no annotation-name clashes here
-        author_sub_q = Q()
-        for t in tokens:
-            author_sub_q &= (
-                    Q(first_name__icontains=t) |
-                    Q(middle_name__icontains=t) |
-                    Q(last_name__icontains=t)
-            )
-
-        matching_authors = Author.objects.filter(
-            articleauthor__article=OuterRef('pk')
-        ).filter(author_sub_q)
-
-        art_q = Q()
-        for t in tokens:
-            art_q &= (
-                    Q(title__icontains=t) |
-                    Q(abstract__icontains=t) |
-                    Q(keywords__icontains=t)
-            )
+    words = search_words(q)
+    if len(q) >= 2 and words:
+        # Result ids are cached per normalized query (main.search_cache)
+        found = cached_search(q, lambda: _search_ids(q, words))
 
+        journal_results = Journal.objects.only('id', 'title', 'url_slug').filter(id__in=found['journal_ids'])
+        author_results = (Author.objects
+                          .filter(id__in=found['author_ids'])
+                          .only('id', 'first_name', 'middle_name', 'last_name', 'affiliation', 'photo'))
         article_results = (Article.objects
                            .select_related('issue__journal')
                            .prefetch_related('authors')
-                           .filter(art_q | Exists(matching_authors))
-                           .only('id', 'slug', 'title', 'abstract', 'created_at', 'issue')
-                           .distinct())
+                           .filter(id__in=found['article_ids'])
+                           .only('id', 'slug', 'title', 'abstract', 'created_at', 'issue'))
 
         # counts
-        journal_count = journal_results.count()
-        author_count = author_results.count()
-        article_count = article_results.count()
+        journal_count = len(found['journal_ids'])
+        author_count = len(found['author_ids'])
+        article_count = len(found['article_ids'])
         total_results = journal_count + author_count + article_count
+        suggestion = found['suggestion']
 
     return render(request, 'global_search.html', {
         'q': q,
@@ -94,33 +84,46 @@ def global_search(request):
         'article_count': article_count,
         'author_count': author_count,
         'total_results': total_results,
+        'suggestion': suggestion,
         'page_title': 'Qidiruv natijalari',
     })
 
 
+def search_autocomplete(request):
+    """Search-as-you-type suggestions from the in-process prefix index (main.autocomplete)"""
+    q = (request.GET.get('q') or '').strip()
+    return JsonResponse({'q': q, 'results': suggest(q) if q else []})
+
+
 def authors_list(request):
-    authors = Author.objects.filter(is_active=True).annotate(
-        article_count=Count('article')
-    ).order_by('last_name', 'first_name')
+    authors = Author.objects.filter(is_active=True).select_related('institution').order_by(
+        'last_name', 'first_name', 'id'
+    )
 
     # Handle search query
     search_query = request.GET.get('q', '').strip()
     if search_query:
         authors = authors.filter(
-            first_name__icontains=search_query
-        ) | authors.filter(last_name__icontains=search_query)
+            Q(first_name__icontains=search_query) | Q(last_name__icontains=search_query)
+        )
+
+    # Maqolalar soni Author.article_count hisoblagichidan olinadi (main.counters)
+    paginator = Paginator(authors, AUTHORS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
 
     context = {
-        'authors': authors,
-        'unique_affiliations': Author.objects.filter(
-            is_active=True
-        ).values('affiliation').distinct().count(),
-        'total_articles': Article.objects.filter(is_published=True).count(),
+        'authors': page_obj,
+        'search_query': search_query,
+        # Normalized institutions instead of a DISTINCT over the free-text affiliations
+        'institution_count': Institution.objects.filter(author_count__gt=0).count(),
     }
     return render(request, 'authors_list.html', context)
 
 
+@cache_public_page(single_flight=True)
 def journals_list(request):
+    page_depends_on(request, SITE_SCOPE)
+
     # Boshlang'ich queryset
     journals = Journal.objects.filter(is_active=True)
 
@@ -131,24 +134,20 @@ def journals_list(request):
     if search_query:
         journals = journals.filter(title__icontains=search_query)
 
-    # Annotatsiya orqali statistikani hisoblaymiz
-    # Har bir jurnal uchun kerakli ma'lumotlarni olish uchun annotate dan foydalanamiz
-    journals = journals.annotate(
-        total_issues=Count('issues', distinct=True, filter=models.Q(issues__is_published=True)),
-        total_articles=Count('issues__articles', distinct=True, filter=models.Q(issues__articles__is_published=True)),
-        first_issue_year=Min('issues__year', filter=models.Q(issues__is_published=True))  # Birinchi chiqqan yil
-    ).prefetch_related(
-        'issues__articles__authors'  # Kerakli related obyektlarni oldindan yuklash
-    ).order_by('-created_at', 'title')
+    # Statistika jurnal jadvalidagi tayyor hisoblagichlardan olinadi (main.counters)
+    journals = list(journals.prefetch_related(
+        Prefetch('issues', queryset=Issue.objects.filter(is_active=True, is_published=True),
+                 to_attr='current_issues')
+    ).order_by('-created_at', 'title'))
 
     # Umumiy statistika (barcha jurnallar bo'yicha, filtrdan keyin)
-    total_issues = Issue.objects.filter(is_published=True, journal__in=journals).count()
-    total_articles = Article.objects.filter(is_published=True, issue__journal__in=journals).count()
-    active_journals = journals.count()
+    total_issues = sum(journal.published_issue_count for journal in journals)
+    total_articles = sum(journal.published_article_count for journal in journals)
+    active_journals = len(journals)
 
     context = {
         'journals': journals,  # Filtrlangan jurnallar
-        'journal_stats': journals,  # Annotatsiya qilingan jurnallar (statistikalar bilan)
+        'journal_stats': journals,
         'total_issues': total_issues,
         'total_articles': total_articles,
         'active_journals': active_journals,
@@ -158,54 +157,10 @@ def journals_list(request):
     return render(request, 'journals.html', context)
 
 
+@cache_public_page(single_flight=True)
 def home_view(request):
-    latest_journals = Journal.objects.select_related().filter(
-        is_active=True
-    ).annotate(
-        issues_count=Count('issues', filter=Q(issues__is_published=True), distinct=True),
-        articles_count=Count('issues__articles', filter=Q(issues__is_published=True), distinct=True),
-        latest_year=Max('issues__year', filter=Q(issues__is_published=True))
-    ).order_by('-created_at')[:6]
-
-    journal_stats = {
-        'total_journals': Journal.objects.filter(is_active=True).count(),
-        'total_issues': 0,
-        'total_articles': 0,
-        'total_authors': 0,
-    }
-    aggregated_stats = Journal.objects.filter(is_active=True).aggregate(
-        total_issues=Count('issues', filter=Q(issues__is_published=True), distinct=True),
-        total_articles=Count('issues__articles', filter=Q(issues__is_published=True), distinct=True),
-    )
-    journal_stats.update({
-        'total_issues': aggregated_stats['total_issues'] or 0,
-        'total_articles': aggregated_stats['total_articles'] or 0,
-        'total_authors': Author.objects.filter(is_active=True).count(),  # Added author count
-    })
-
-    # Fetch recent articles with first author
-    recent_articles = Article.objects.filter(is_published=True).order_by('-date_published')[:6]
-    recent_articles_with_authors = []
-    for article in recent_articles:
-        first_author = article.author_list.first().author if article.author_list.exists() else None
-        recent_articles_with_authors.append({
-            'article': article,
-            'first_author': first_author,
-        })
-    trending_journals = Journal.objects.select_related().filter(
-        is_active=True
-    ).annotate(
-        issues_count=Count('issues', filter=Q(issues__is_published=True), distinct=True),
-        articles_count=Count('issues__articles', filter=Q(issues__is_published=True), distinct=True),
-    ).order_by('-issues_count', '-created_at')[:6]
-
-    context = {
-        'latest_journals': latest_journals,
-        'trending_journals': trending_journals,  # Add this
-        'journal_stats': journal_stats,
-        'recent_articles': recent_articles_with_authors,
-    }
-    return render(request, 'index.html', context)
+    page_depends_on(request, SITE_SCOPE, TRENDING_SCOPE)
+    return render(request, 'index.html', {**get_home_snapshot(), 'trending_articles': trending_articles()})
 
 
 def about_view(request):
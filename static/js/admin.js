@@ -1,6 +1,7 @@
 // admin.js - Imfaktor Admin Panel JavaScript (100% Fixed & Enhanced Version)
 // Global variables
 let currentPage = 1;
+let authorsCursor = "";
 let currentSection = "dashboard";
 let deleteCallback = null;
 const quillEditors = {};
@@ -175,7 +176,7 @@ function setupAuthorFormHandlers() {
                             setQuillContent("#author-bio-editor", "");
                             const modal = bootstrap.Modal.getInstance(document.getElementById("addAuthorModal"));
                             modal.hide();
-                            loadAuthors(currentPage);
+                            loadAuthors(authorsCursor);
                         } else {
                             showAlert("Xatolik: " + (data.error || "Noma'lum xatolik"), "error");
                         }
@@ -213,7 +214,7 @@ function setupAuthorFormHandlers() {
                             showAlert("Muallif ma'lumotlari yangilandi!", "success");
                             const modal = bootstrap.Modal.getInstance(document.getElementById("editAuthorModal"));
                             modal.hide();
-                            loadAuthors(currentPage);
+                            loadAuthors(authorsCursor);
                         } else {
                             showAlert("Xatolik: " + (data.error || "Noma'lum xatolik"), "error");
                         }
@@ -232,7 +233,7 @@ function setupAuthorFormHandlers() {
         authorSearch.addEventListener(
             "input",
             debounce(function () {
-                loadAuthors(1, this.value);
+                loadAuthors("", this.value);
             }, 300)
         );
     }
@@ -244,7 +245,7 @@ function setupAuthorFormHandlers() {
             const searchInput = document.getElementById("author-search");
             if (searchInput) {
                 searchInput.value = "";
-                loadAuthors(1);
+                loadAuthors("");
             }
         });
     }
@@ -268,9 +269,9 @@ function hideLoadingIndicator(formId) {
     }
 }
 
-function loadAuthors(page = 1, search = "") {
-    currentPage = page;
-    let url = `/admin/authors/list/?page=${page}`;
+function loadAuthors(cursor = "", search = document.getElementById("author-search")?.value || "") {
+    authorsCursor = cursor;
+    let url = `/admin/authors/list/?cursor=${encodeURIComponent(cursor)}`;
     if (search) {
         url += `&search=${encodeURIComponent(search)}`;
     }
@@ -376,11 +377,7 @@ function updateAuthorsPaginationInfo(pagination) {
     } else {
         if (noResultsMsg) noResultsMsg.style.display = "none";
         if (paginationContainer) paginationContainer.style.display = "block";
-        if (resultsInfo) {
-            const start = (pagination.current - 1) * 20 + 1;
-            const end = Math.min(pagination.current * 20, pagination.total_count);
-            resultsInfo.textContent = `${start}-${end} / ${pagination.total_count} natija`;
-        }
+        if (resultsInfo) resultsInfo.textContent = `Jami: ~${pagination.total_count} natija`;
     }
 }
 
@@ -496,7 +493,7 @@ function deleteAuthor(authorId) {
         `/admin/authors/delete/${authorId}/`,
         () => {
             const search = document.getElementById("author-search") ? document.getElementById("author-search").value : "";
-            loadAuthors(currentPage, search);
+            loadAuthors(authorsCursor, search);
         }
     );
 }
@@ -1672,23 +1669,10 @@ function updatePagination(type, pagination) {
     if (!paginationEl || !pagination) return;
     let html = "";
     if (pagination.has_previous) {
-        html += `<li class="page-item"><a class="page-link" href="#" onclick="load${capitalize(type)}(${pagination.current - 1}); return false;"><i class="fas fa-chevron-left"></i></a></li>`;
-    }
-    for (let i = 1; i <= pagination.total_pages; i++) {
-        if (i === pagination.current) {
-            html += `<li class="page-item active"><span class="page-link">${i}</span></li>`;
-        } else if (
-            i === 1 ||
-            i === pagination.total_pages ||
-            (i >= pagination.current - 2 && i <= pagination.current + 2)
-        ) {
-            html += `<li class="page-item"><a class="page-link" href="#" onclick="load${capitalize(type)}(${i}); return false;">${i}</a></li>`;
-        } else if (i === pagination.current - 3 || i === pagination.current + 3) {
-            html += `<li class="page-item disabled"><span class="page-link">...</span></li>`;
-        }
+        html += `<li class="page-item"><a class="page-link" href="#" onclick="load${capitalize(type)}('${pagination.previous}'); return false;"><i class="fas fa-chevron-left"></i> Oldingi</a></li>`;
     }
     if (pagination.has_next) {
-        html += `<li class="page-item"><a class="page-link" href="#" onclick="load${capitalize(type)}(${pagination.current + 1}); return false;"><i class="fas fa-chevron-right"></i></a></li>`;
+        html += `<li class="page-item"><a class="page-link" href="#" onclick="load${capitalize(type)}('${pagination.next}'); return false;">Keyingi <i class="fas fa-chevron-right"></i></a></li>`;
     }
     paginationEl.innerHTML = html;
 }
@@ -1770,7 +1754,7 @@ function setupFilters() {
     if (statusFilter) {
         statusFilter.addEventListener("change", () => {
             const search = document.getElementById("author-search") ? document.getElementById("author-search").value : "";
-            loadAuthors(1, search);
+            loadAuthors("", search);
         });
     }
 }
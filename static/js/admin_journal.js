@@ -1,6 +1,6 @@
 // Global variables - wait for DOM to be ready
 let JOURNAL_ID
-let currentPage = 1
+let issuesCursor = ""
 let deleteCallback
 
 // Quill editors storage
@@ -392,7 +392,7 @@ function toggleActive(issueId, currentlyActive) {
         .then((r) => r.json())
         .then((data) => {
             if (data.success) {
-                loadIssues(currentPage)
+                loadIssues(issuesCursor)
             } else {
                 showAlert("Xatolik: " + data.error, "error")
             }
@@ -973,12 +973,12 @@ function hideFileInfo() {
 }
 
 // Load issues for this journal
-function loadIssues(page = 1) {
-    currentPage = page
+function loadIssues(cursor = "") {
+    issuesCursor = cursor
     const loadingDiv = document.getElementById("issues-loading")
     if (loadingDiv) loadingDiv.style.display = "flex"
 
-    fetch(`/admin/journals/${JOURNAL_ID}/issues/?page=${page}`)
+    fetch(`/admin/journals/${JOURNAL_ID}/issues/?cursor=${encodeURIComponent(cursor)}`)
         .then((response) => response.json())
         .then((data) => {
             if (loadingDiv) loadingDiv.style.display = "none"
@@ -997,7 +997,7 @@ function loadIssues(page = 1) {
 }
 
 // Load articles for this journal
-function loadArticles(page = 1) {
+function loadArticles(cursor = "") {
     const search = document.getElementById("article-search")?.value || ""
     const issueFilter = document.getElementById("article-issue-filter")?.value || ""
     const statusFilter = document.getElementById("article-status-filter")?.value || ""
@@ -1005,7 +1005,7 @@ function loadArticles(page = 1) {
     const loadingDiv = document.getElementById("articles-loading")
     if (loadingDiv) loadingDiv.style.display = "flex"
 
-    let url = `/admin/journals/${JOURNAL_ID}/articles/?page=${page}`
+    let url = `/admin/journals/${JOURNAL_ID}/articles/?cursor=${encodeURIComponent(cursor)}`
     if (search) url += `&search=${encodeURIComponent(search)}`
     if (issueFilter) url += `&issue=${issueFilter}`
     if (statusFilter) url += `&status=${statusFilter}`
@@ -1752,7 +1752,7 @@ function setupEventListeners() {
     if (articleSearch) {
         articleSearch.addEventListener(
             "input",
-            debounce(() => loadArticles(1), 300),
+            debounce(() => loadArticles(), 300),
         )
     }
 
@@ -1760,19 +1760,19 @@ function setupEventListeners() {
     if (clearSearch) {
         clearSearch.addEventListener("click", () => {
             articleSearch.value = ""
-            loadArticles(1)
+            loadArticles()
         })
     }
 
     // Filter functionality
     const issueFilter = document.getElementById("article-issue-filter")
     if (issueFilter) {
-        issueFilter.addEventListener("change", () => loadArticles(1))
+        issueFilter.addEventListener("change", () => loadArticles())
     }
 
     const statusFilter = document.getElementById("article-status-filter")
     if (statusFilter) {
-        statusFilter.addEventListener("change", () => loadArticles(1))
+        statusFilter.addEventListener("change", () => loadArticles())
     }
 
     // Delete confirmation
@@ -2166,25 +2166,11 @@ function updatePagination(type, pagination) {
     let html = ""
 
     if (pagination.has_previous) {
-        html += `<li class="page-item"><a class="page-link" href="#" onclick="load${capitalize(type)}(${pagination.current - 1}); return false;"><i class="fas fa-chevron-left"></i></a></li>`
-    }
-
-    for (let i = 1; i <= pagination.total_pages; i++) {
-        if (i === pagination.current) {
-            html += `<li class="page-item active"><span class="page-link">${i}</span></li>`
-        } else if (
-            i === 1 ||
-            i === pagination.total_pages ||
-            (i >= pagination.current - 2 && i <= pagination.current + 2)
-        ) {
-            html += `<li class="page-item"><a class="page-link" href="#" onclick="load${capitalize(type)}(${i}); return false;">${i}</a></li>`
-        } else if (i === pagination.current - 3 || i === pagination.current + 3) {
-            html += `<li class="page-item disabled"><span class="page-link">...</span></li>`
-        }
+        html += `<li class="page-item"><a class="page-link" href="#" onclick="load${capitalize(type)}('${pagination.previous}'); return false;"><i class="fas fa-chevron-left"></i> Oldingi</a></li>`
     }
 
     if (pagination.has_next) {
-        html += `<li class="page-item"><a class="page-link" href="#" onclick="load${capitalize(type)}(${pagination.current + 1}); return false;"><i class="fas fa-chevron-right"></i></a></li>`
+        html += `<li class="page-item"><a class="page-link" href="#" onclick="load${capitalize(type)}('${pagination.next}'); return false;">Keyingi <i class="fas fa-chevron-right"></i></a></li>`
     }
 
     paginationEl.innerHTML = html
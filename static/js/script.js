@@ -14,6 +14,7 @@ document.addEventListener('DOMContentLoaded', function () {
         initCardHoverEffects();
         initAuthorSearch();
         initJournalSearch();
+        initSearchAutocomplete();
         initJournalNavigation();
         initArticleNavigation();
         initJournalDetailNavigation();
@@ -87,6 +88,52 @@ document.addEventListener('DOMContentLoaded', function () {
     }
 
 
+    // Umumiy qidiruv maydonlari uchun yozish davomida takliflar (/search/autocomplete/)
+    function initSearchAutocomplete() {
+        const inputs = document.querySelectorAll('form[action$="/search/"] input[name="q"]');
+
+        inputs.forEach((input, index) => {
+            const list = document.createElement('datalist');
+            list.id = `search-suggestions-${index}`;
+            input.setAttribute('list', list.id);
+            input.setAttribute('autocomplete', 'off');
+            input.after(list);
+
+            let urls = {};
+            let timer = null;
+            let lastQuery = '';
+
+            input.addEventListener('input', () => {
+                const query = input.value.trim();
+
+                // Taklif tanlanganda to'g'ridan-to'g'ri uning sahifasiga o'tish
+                if (urls[input.value]) {
+                    window.location.href = urls[input.value];
+                    return;
+                }
+                clearTimeout(timer);
+                if (query.length < 2 || query === lastQuery) return;
+
+                timer = setTimeout(() => {
+                    lastQuery = query;
+                    fetch(`/search/autocomplete/?q=${encodeURIComponent(query)}`)
+                        .then(response => response.json())
+                        .then(data => {
+                            urls = {};
+                            list.innerHTML = '';
+                            data.results.forEach(result => {
+                                const option = document.createElement('option');
+                                option.value = result.label;
+                                urls[result.label] = result.url;
+                                list.appendChild(option);
+                            });
+                        })
+                        .catch(() => {});
+                }, 150);
+            });
+        });
+    }
+
     // Initialize smooth scrolling for anchor links
     function initSmoothScrolling() {
         document.querySelectorAll('a[href^="#"]').forEach(anchor => {